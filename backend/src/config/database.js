@@ -69,6 +69,23 @@ const initializeDatabase = async () => {
       );
     `);
 
+    // Create per-site daily metrics table (multi-site forecasting)
+    await client.query(`
+      CREATE TABLE IF NOT EXISTS site_daily_metrics (
+        id SERIAL PRIMARY KEY,
+        site_id VARCHAR(100) NOT NULL,
+        date DATE NOT NULL,
+        page_visits INTEGER DEFAULT 0,
+        page_views INTEGER DEFAULT 0,
+        avg_time_on_page FLOAT DEFAULT 0,
+        bounce_rate FLOAT DEFAULT 0,
+        unique_visitors INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (site_id, date)
+      );
+    `);
+
     // Create predictions table
     await client.query(`
       CREATE TABLE IF NOT EXISTS predictions (
@@ -92,6 +109,7 @@ const initializeDatabase = async () => {
       CREATE INDEX IF NOT EXISTS idx_page_visits_browser ON page_visits(browser);
       CREATE INDEX IF NOT EXISTS idx_page_visits_os ON page_visits(operating_system);
       CREATE INDEX IF NOT EXISTS idx_daily_metrics_date ON daily_metrics(date);
+      CREATE INDEX IF NOT EXISTS idx_site_daily_metrics_date ON site_daily_metrics(date);
       CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions(predicted_date);
     `);
 
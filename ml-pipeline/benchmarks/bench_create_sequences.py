@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.data_processor import DataProcessor
+
+def create_sequences_loop(data, sequence_length, prediction_horizon):
+    """Previous list-append implementation of DataProcessor._create_sequences"""
+    X, y = [], []
+
+    for i in range(len(data) - sequence_length - prediction_horizon + 1):
+        X.append(data[i:(i + sequence_length)])
+        y.append(data[(i + sequence_length):(i + sequence_length + prediction_horizon)])
+
+    return np.array(X), np.array(y)
+
+def best_of(func, repeats):
+    """Return the fastest of several timed runs in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sliding-window sequence creation')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                       default=[1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+                       help='Number of rows to benchmark')
+    parser.add_argument('--sequence-length', type=int, default=7,
+                       help='Input sequence length')
+    parser.add_argument('--prediction-horizon', type=int, default=7,
+                       help='Prediction horizon')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Timed runs per measurement (best is reported)')
+    parser.add_argument('--max-loop-rows', type=int, default=1_000_000,
+                       help='Skip the loop implementation above this many rows')
+
+    args = parser.parse_args()
+
+    processor = DataProcessor(args.sequence_length, args.prediction_horizon)
+
+    print(f"{'rows':>12} {'loop (s)':>12} {'view (s)':>12} {'contiguous (s)':>15} {'speedup':>9}")
+
+    for size in args.sizes:
+        data = np.random.rand(size, 1)
+
+        view_time = best_of(lambda: processor._create_sequences(data), args.repeats)
+        copy_time = best_of(lambda: processor._create_sequences(data, contiguous=True), args.repeats)
+
+        if size <= args.max_loop_rows:
+            loop_time = best_of(
+                lambda: create_sequences_loop(data, args.sequence_length, args.prediction_horizon),
+                args.repeats
+            )
+            loop_label = f"{loop_time:12.6f}"
+            speedup = f"{loop_time / view_time:8.0f}x"
+        else:
+            loop_label = f"{'skipped':>12}"
+            speedup = f"{'-':>9}"
+
+        print(f"{size:>12} {loop_label} {view_time:12.6f} {copy_time:15.6f} {speedup}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_create_sequences import best_of
+from synthetic_data import SyntheticDataLoader, synthetic_daily_metrics
+from api.prediction_service import PredictionService
+from models.numpy_lstm import weights_path
+from preprocessing.data_processor import DataProcessor
+from preprocessing.features import metric_model_version
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_VERSION = 'bench'
+
+def write_model(model_dir, df, sequence_length, prediction_horizon, units=32, seed=0, metric='page_visits'):
+    """
+    Write a model for one metric, servable by the NumPy runtime, with random weights
+
+    The .h5 file is an empty placeholder: the service only checks it exists
+    and loads the exported weights instead.
+    """
+    rng = np.random.default_rng(seed)
+    version = metric_model_version(MODEL_VERSION, metric)
+    layers = [
+        {'kind': 'lstm', 'units': units, 'activation': 'tanh', 'recurrent_activation': 'sigmoid',
+         'return_sequences': False, 'go_backwards': False},
+        {'kind': 'dense', 'activation': 'linear'}
+    ]
+    arrays = {
+        '0_kernel': rng.normal(0, 0.1, (1, 4 * units)),
+        '0_recurrent_kernel': rng.normal(0, 0.1, (units, 4 * units)),
+        '0_bias': np.zeros(4 * units),
+        '1_kernel': rng.normal(0, 0.1, (units, prediction_horizon)),
+        '1_bias': np.zeros(prediction_horizon)
+    }
+    with open(weights_path(model_dir, version), 'wb') as f:
+        np.savez(f, spec=np.array(json.dumps(layers)),
+                 **{name: value.astype(np.float32) for name, value in arrays.items()})
+
+    open(os.path.join(model_dir, f'lstm_model_{version}.h5'), 'wb').close()
+
+    processor = DataProcessor(sequence_length, prediction_horizon)
+    processor.prepare_series(df, metric)
+    joblib.dump({
+        'sequence_length': sequence_length,
+        'prediction_horizon': prediction_horizon,
+        'scaler': processor.scaler
+    }, os.path.join(model_dir, f'metadata_{version}.pkl'))
+
+def create_service(model_dir, engine):
+    """Service with the forecast cache off, so every call runs the full path"""
+    return PredictionService(
+        model_dir=model_dir,
+        model_version=MODEL_VERSION,
+        cache_size=0,
+        batch_max_wait_ms=0,
+        warmup_batch_sizes=(1,),
+        runtime='numpy',
+        engine=engine
+    )
+
+def run_benchmarks(sizes, repeats, sequence_length, prediction_horizon, selected=None):
+    """
+    Time the preprocessing and prediction hot paths at each history size
+
+    Returns:
+        list: {'benchmark', 'rows', 'seconds'} per measurement (best of repeats)
+    """
+    results = []
+    model_dir = tempfile.mkdtemp(prefix='bench_models_')
+    services = {}
+
+    try:
+        write_model(model_dir, synthetic_daily_metrics(max(sizes)), sequence_length, prediction_horizon)
+        for engine in ('lstm', 'seasonal_naive'):
+            services[engine] = create_service(model_dir, engine)
+
+        for size in sizes:
+            df = synthetic_daily_metrics(size)
+            processor = DataProcessor(sequence_length, prediction_horizon)
+            features = processor.add_features(df)
+            sorted_df = df.sort_values('date').reset_index(drop=True)
+            series = processor.prepare_series(df)
+
+            benchmarks = {
+                'add_features': lambda: processor.add_features(df),
+                '_fill_missing_dates': lambda: processor._fill_missing_dates(sorted_df, 'page_visits'),
+                '_create_sequences': lambda: processor._create_sequences(series),
+                'prepare_data': lambda: DataProcessor(sequence_length, prediction_horizon).prepare_data(features)
+            }
+            for engine, service in services.items():
+                service.data_loader = SyntheticDataLoader(df)
+                benchmarks[f'predict_page_visits[{engine}]'] = (
+                    lambda service=service: service.predict_page_visits(days_ahead=prediction_horizon)
+                )
+
+            for name, func in benchmarks.items():
+                if selected and name not in selected:
+                    continue
+                func()  # Warm caches and lazy imports outside the timed runs
+                results.append({'benchmark': name, 'rows': len(df), 'seconds': best_of(func, repeats)})
+    finally:
+        for service in services.values():
+            service.close()
+        shutil.rmtree(model_dir, ignore_errors=True)
+
+    return results
+
+def compare(results, baseline, tolerance, min_delta):
+    """
+    Compare results with a baseline run
+
+    A measurement regresses when it is more than tolerance slower than the
+    baseline and the difference exceeds min_delta seconds (sub-millisecond
+    timings jitter by more than any sensible tolerance).
+
+    Returns:
+        list: (result, baseline seconds or None, regressed) per result
+    """
+    previous = {(entry['benchmark'], entry['rows']): entry['seconds'] for entry in baseline['results']}
+    rows = []
+    for result in results:
+        before = previous.get((result['benchmark'], result['rows']))
+        regressed = (
+            before is not None and
+            result['seconds'] > before * (1 + tolerance) and
+            result['seconds'] - before > min_delta
+        )
+        rows.append((result, before, regressed))
+    return rows
+
+def write_json(path, payload):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark preprocessing and prediction hot paths on synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[365, 1825, 3650, 18250],
+                       help='Days of daily_metrics history to benchmark')
+    parser.add_argument('--sequence-length', type=int, default=7,
+                       help='Input sequence length')
+    parser.add_argument('--prediction-horizon', type=int, default=7,
+                       help='Prediction horizon')
+    parser.add_argument('--repeats', type=int, default=5,
+                       help='Timed runs per measurement (best is reported)')
+    parser.add_argument('--benchmarks', nargs='+',
+                       help='Only run these benchmarks (e.g. add_features prepare_data)')
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results', 'hot_paths.json'),
+                       help='JSON file for the results')
+    parser.add_argument('--baseline', default=os.path.join(BENCHMARK_DIR, 'results', 'hot_paths_baseline.json'),
+                       help='Stored baseline to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                       help='Allowed slowdown against the baseline (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.2,
+                       help='Ignore slowdowns smaller than this many milliseconds')
+
+    args = parser.parse_args()
+
+    # Model loading and prediction log at INFO for every call
+    logging.basicConfig(level=logging.WARNING)
+
+    results = run_benchmarks(
+        args.sizes, args.repeats, args.sequence_length, args.prediction_horizon, args.benchmarks
+    )
+    payload = {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.platform(),
+        'repeats': args.repeats,
+        'results': results
+    }
+    write_json(args.output, payload)
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    rows = compare(results, baseline or {'results': []}, args.tolerance, args.min_delta_ms / 1000.0)
+
+    print(f"{'benchmark':<36} {'rows':>8} {'time (ms)':>12} {'baseline (ms)':>14} {'change':>9}")
+    for result, before, regressed in rows:
+        if before is None:
+            baseline_label, change = f"{'-':>14}", f"{'-':>9}"
+        else:
+            baseline_label = f"{before * 1000:14.3f}"
+            change = f"{(result['seconds'] / before - 1) * 100:+8.1f}%"
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{result['benchmark']:<36} {result['rows']:>8} {result['seconds'] * 1000:12.3f} "
+              f"{baseline_label} {change}{flag}")
+
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        write_json(args.baseline, payload)
+        print(f"Baseline saved to {args.baseline}")
+    elif baseline is None:
+        print(f"No baseline at {args.baseline} (run with --save-baseline to store one)")
+
+    regressions = sum(regressed for _, _, regressed in rows)
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_hot_paths import MODEL_VERSION, write_json, write_model
+from synthetic_data import fill_snapshot
+from config.snapshot import SnapshotStore
+from preprocessing.features import DAILY_METRICS
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (method, path, query string, JSON body) per load-tested endpoint
+ENDPOINTS = {
+    'predict': ('POST', '/predict', b'', {'days_ahead': 7}),
+    'page-visits': ('GET', '/predict/page-visits', b'days_ahead=7', None),
+    'multiple': ('POST', '/predict/multiple', b'days_ahead=7', list(DAILY_METRICS))
+}
+
+async def asgi_request(app, method, path, query=b'', body=None):
+    """
+    Send one HTTP request straight to an ASGI app, without sockets
+
+    Returns:
+        tuple: (status code, response headers as a dict of bytes)
+    """
+    payload = json.dumps(body).encode() if body is not None else b''
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query,
+        'root_path': '',
+        'headers': [
+            (b'host', b'loadtest'),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(payload)).encode())
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': ('loadtest', 80)
+    }
+    messages = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+    response = {}
+
+    async def receive():
+        return messages.pop() if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = dict(message.get('headers', ()))
+
+    await app(scope, receive, send)
+    return response['status'], response['headers']
+
+@asynccontextmanager
+async def lifespan(app):
+    """Run the app's startup handlers on entry and its shutdown handlers on exit"""
+    inbox = asyncio.Queue()
+    outbox = asyncio.Queue()
+    task = asyncio.create_task(app({'type': 'lifespan', 'asgi': {'version': '3.0'}}, inbox.get, outbox.put))
+
+    await inbox.put({'type': 'lifespan.startup'})
+    message = await outbox.get()
+    if message['type'] != 'lifespan.startup.complete':
+        raise RuntimeError(f"Startup failed: {message.get('message')}")
+
+    try:
+        yield
+    finally:
+        await inbox.put({'type': 'lifespan.shutdown'})
+        await outbox.get()
+        await task
+
+async def run_level(app, endpoint, concurrency, duration):
+    """
+    Keep concurrency requests in flight against one endpoint for duration seconds
+
+    Clients wait for Retry-After on a 503, like well-behaved callers; retrying
+    at once would spin the event loop the app also runs on.
+
+    Returns:
+        dict: Requests, throughput, latency percentiles and non-2xx status counts
+    """
+    method, path, query, body = ENDPOINTS[endpoint]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    latencies = []
+    statuses = Counter()
+
+    async def client():
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            status, headers = await asgi_request(app, method, path, query, body)
+            elapsed = time.perf_counter() - started
+            statuses[status] += 1
+            if 200 <= status < 300:
+                latencies.append(elapsed)
+            elif status == 503:
+                retry_after = float(headers.get(b'retry-after', b'1'))
+                await asyncio.sleep(min(retry_after, max(0.0, deadline - loop.time())))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': int(sum(statuses.values())),
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+        'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+        'errors': {str(status): count for status, count in statuses.items() if not 200 <= status < 300}
+    }
+
+async def sweep(app, endpoints, levels, duration):
+    results = []
+    async with lifespan(app):
+        for endpoint in endpoints:
+            for concurrency in levels:
+                result = await run_level(app, endpoint, concurrency, duration)
+                results.append(result)
+                print_row(result)
+    return results
+
+def print_row(result):
+    p50 = f"{result['p50_ms']:10.2f}" if result['p50_ms'] is not None else f"{'-':>10}"
+    p99 = f"{result['p99_ms']:10.2f}" if result['p99_ms'] is not None else f"{'-':>10}"
+    errors = ', '.join(f"{status}: {count}" for status, count in sorted(result['errors'].items()))
+    print(f"{result['endpoint']:<12} {result['concurrency']:>6} {result['requests']:>9} "
+          f"{result['throughput_rps']:10.1f} {p50} {p99}  {errors}")
+
+def configure_environment(args, snapshot_dir, model_dir):
+    """Point the app at the synthetic snapshot and models (read when api.main is imported and starts)"""
+    os.environ.update({
+        'SNAPSHOT_DIR': snapshot_dir,
+        'SNAPSHOT_OFFLINE': 'True',
+        'MODEL_DIR': model_dir,
+        'MODEL_VERSION': MODEL_VERSION,
+        'MODEL_WATCH_INTERVAL': '0',
+        'INFERENCE_RUNTIME': 'numpy',
+        'FORECAST_ENGINE': args.engine,
+        'FORECAST_CACHE_SIZE': str(args.cache_size),
+        'STARTUP_MODE': 'blocking',
+        'PREDICTION_WORKERS': str(args.workers),
+        'PREDICTION_QUEUE_SIZE': str(args.queue_size)
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the prediction API in-process on synthetic traffic')
+    parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS),
+                       help='Endpoints to load test, one sweep each')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                       help='Concurrent clients per level')
+    parser.add_argument('--duration', type=float, default=3.0,
+                       help='Seconds per concurrency level')
+    parser.add_argument('--days', type=int, default=730,
+                       help='Days of synthetic traffic history')
+    parser.add_argument('--snapshot-dir',
+                       help='Reuse (or keep) a generated snapshot here instead of a temporary one')
+    parser.add_argument('--engine', default='lstm',
+                       help='FORECAST_ENGINE for the run')
+    parser.add_argument('--cache-size', type=int, default=0,
+                       help='FORECAST_CACHE_SIZE (0 measures the uncached path)')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('PREDICTION_WORKERS', 4)),
+                       help='PREDICTION_WORKERS')
+    parser.add_argument('--queue-size', type=int, default=int(os.getenv('PREDICTION_QUEUE_SIZE', 16)),
+                       help='PREDICTION_QUEUE_SIZE (requests beyond it get 503)')
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results', 'load_test.json'),
+                       help='JSON file for the results')
+
+    args = parser.parse_args()
+
+    # Configured before api.main is imported, so its INFO basicConfig is a no-op
+    logging.basicConfig(level=logging.WARNING)
+    # Rejections are counted in the results rather than logged one by one
+    logging.getLogger('api.main').setLevel(logging.ERROR)
+
+    temp_dir = tempfile.mkdtemp(prefix='load_test_')
+    snapshot_dir = args.snapshot_dir or os.path.join(temp_dir, 'snapshot')
+    model_dir = os.path.join(temp_dir, 'models')
+    os.makedirs(model_dir)
+
+    try:
+        store = SnapshotStore(snapshot_dir)
+        if store.is_empty:
+            started = time.perf_counter()
+            store = fill_snapshot(snapshot_dir, args.days)
+            print(f"Generated {args.days} days of traffic in {time.perf_counter() - started:.1f}s")
+
+        # Models get random weights; the scalers are fitted on the generated history
+        history = store.load()
+        for metric in DAILY_METRICS:
+            write_model(model_dir, history, 7, 7, metric=metric)
+
+        configure_environment(args, snapshot_dir, model_dir)
+        from api import main as api_main
+
+        print(f"{'endpoint':<12} {'conc':>6} {'requests':>9} {'req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10}  errors")
+        results = asyncio.run(sweep(api_main.app, args.endpoints, args.concurrency, args.duration))
+
+        write_json(args.output, {
+            'days': args.days,
+            'engine': args.engine,
+            'cache_size': args.cache_size,
+            'workers': args.workers,
+            'queue_size': args.queue_size,
+            'duration': args.duration,
+            'results': results
+        })
+        print(f"\nResults written to {args.output}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.schema import DAILY_METRICS_DTYPE, PAGE_VISIT_EVENTS_DTYPE
+from config.snapshot import SnapshotStore
+
+# Share of sessions starting in each local hour: quiet nights, a working-day peak
+HOURLY_PROFILE = np.array([
+    0.8, 0.5, 0.4, 0.3, 0.3, 0.5, 1.0, 2.0, 3.5, 4.5, 5.0, 5.2,
+    5.0, 5.1, 5.3, 5.2, 4.8, 4.3, 4.0, 4.2, 4.0, 3.2, 2.2, 1.4
+])
+HOURLY_PROFILE = HOURLY_PROFILE / HOURLY_PROFILE.sum()
+
+def traffic_profile(days, end_date=None, base=200.0, trend=0.05, weekly=0.3, yearly=0.15, noise=0.08, seed=0):
+    """
+    Expected sessions per day: a linear trend with weekly and yearly seasonality and noise
+
+    The weekly cycle peaks mid-week and the yearly cycle in late spring, both
+    keyed to the calendar so every generated history lines up with real dates.
+
+    Args:
+        days (int): Days of history, ending at end_date
+        end_date (date): Last day (defaults to today, so recent-data queries hit)
+        base (float): Sessions per day at the first day
+        trend (float): Sessions added per day
+        weekly (float): Amplitude of the weekly cycle (fraction of the level)
+        yearly (float): Amplitude of the yearly cycle (fraction of the level)
+        noise (float): Standard deviation of the multiplicative day-to-day noise
+        seed (int): Random seed
+
+    Returns:
+        tuple: (DatetimeIndex of days, numpy array of expected sessions)
+    """
+    rng = np.random.default_rng(seed)
+    end_date = end_date or datetime.now().date()
+    dates = pd.date_range(end=pd.Timestamp(end_date), periods=days, freq='D')
+
+    level = base + trend * np.arange(days)
+    weekly_factor = 1.0 + weekly * np.cos(2 * np.pi * (dates.dayofweek.to_numpy() - 2) / 7)
+    yearly_factor = 1.0 + yearly * np.cos(2 * np.pi * (dates.dayofyear.to_numpy() - 140) / 365.25)
+    noise_factor = np.maximum(0.0, 1.0 + rng.normal(0, noise, days))
+
+    return dates, level * weekly_factor * yearly_factor * noise_factor
+
+def synthetic_daily_metrics(days, end_date=None, missing_fraction=0.02, seed=0, **profile):
+    """
+    Generate daily_metrics rows directly from the traffic profile
+
+    Much faster than aggregating page_visits events; use it when only the
+    daily series matters.
+
+    Args:
+        days (int): Days of history, ending at end_date
+        end_date (date): Last day (defaults to today)
+        missing_fraction (float): Fraction of days dropped, as gaps in the table
+        seed (int): Random seed
+        **profile: Trend and seasonality options of traffic_profile
+
+    Returns:
+        DataFrame: Columns of DAILY_METRICS_DTYPE, sorted by date
+    """
+    rng = np.random.default_rng(seed)
+    dates, expected = traffic_profile(days, end_date, seed=seed, **profile)
+    visits = rng.poisson(expected).astype(np.float64)
+
+    df = pd.DataFrame({
+        'date': dates,
+        'page_visits': visits,
+        'page_views': (visits * rng.uniform(1.5, 3.0, days)).round(),
+        'avg_time_on_page': rng.gamma(4.0, 15.0, days),
+        'bounce_rate': rng.uniform(20.0, 70.0, days),
+        'unique_visitors': (visits * rng.uniform(0.6, 0.9, days)).round()
+    }, columns=list(DAILY_METRICS_DTYPE.names))
+
+    # Keep the last two weeks complete so prediction inputs are never short
+    droppable = np.flatnonzero(dates < dates[-1] - timedelta(days=14))
+    dropped = rng.choice(droppable, size=int(len(droppable) * missing_fraction), replace=False)
+    return df.drop(index=dropped).reset_index(drop=True)
+
+def synthetic_page_visits(dates, expected_sessions, visitor_pool=None, bounce_probability=0.45, seed=0):
+    """
+    Generate page_visits events for the given days
+
+    Each day gets a Poisson number of sessions, started at hours drawn from
+    HOURLY_PROFILE. Visitors come from a fixed pool, so some return across
+    days. A session views one page with probability bounce_probability and
+    geometrically more otherwise, with gamma-distributed time on each page.
+
+    Args:
+        dates (DatetimeIndex): Days to generate (see traffic_profile)
+        expected_sessions (array): Expected sessions per day
+        visitor_pool (int): Distinct visitors (default: 30 days of average traffic)
+        bounce_probability (float): Chance a session has a single page view
+        seed (int): Random seed
+
+    Returns:
+        numpy structured array: Events of PAGE_VISIT_EVENTS_DTYPE, sorted by timestamp
+    """
+    rng = np.random.default_rng(seed)
+    sessions_per_day = rng.poisson(expected_sessions)
+    n_sessions = int(sessions_per_day.sum())
+    if visitor_pool is None:
+        visitor_pool = max(1, int(np.mean(expected_sessions) * 30))
+
+    # Session starts: day + profile hour + uniform offset within the hour
+    day_ns = np.repeat(dates.asi8, sessions_per_day)
+    hours = rng.choice(24, size=n_sessions, p=HOURLY_PROFILE)
+    session_start = day_ns + (hours * 3600 + rng.uniform(0, 3600, n_sessions)).astype(np.int64) * 10**9
+
+    # Pages per session: 1 for bounces, otherwise 2 or more
+    bounced = rng.random(n_sessions) < bounce_probability
+    pages = np.where(bounced, 1, 1 + rng.geometric(0.5, n_sessions))
+    session_index = np.repeat(np.arange(n_sessions), pages)
+    time_on_page = rng.gamma(2.0, 30.0, len(session_index)).round()
+
+    # Later pages of a session start after the time spent on the earlier ones
+    offsets = np.cumsum(time_on_page) - time_on_page
+    first_page = np.repeat(np.cumsum(pages) - pages, pages)
+    offsets -= offsets[first_page]
+
+    events = np.empty(len(session_index), dtype=PAGE_VISIT_EVENTS_DTYPE)
+    events['timestamp'] = (session_start[session_index] + offsets.astype(np.int64) * 10**9).astype('datetime64[ns]')
+    visitors = rng.integers(0, visitor_pool, n_sessions)
+    events['visitor_id'] = np.array([f'visitor-{v}' for v in visitors], dtype=object)[session_index]
+    events['session_id'] = np.array([f'session-{seed}-{s}' for s in range(n_sessions)], dtype=object)[session_index]
+    events['time_on_page'] = time_on_page
+
+    # Sessions running past midnight of the last day are cut there
+    events = events[events['timestamp'] < (dates[-1] + pd.Timedelta(days=1)).to_datetime64()]
+    return np.sort(events, order='timestamp', kind='stable')
+
+def daily_metrics_from_page_visits(events):
+    """
+    Aggregate page_visits events into daily_metrics rows
+
+    page_visits counts sessions and page_views counts events. bounce_rate is
+    the percentage of single-page sessions, as computed by the backend.
+
+    Args:
+        events (numpy structured array): Events of PAGE_VISIT_EVENTS_DTYPE
+
+    Returns:
+        DataFrame: Columns of DAILY_METRICS_DTYPE
+    """
+    df = pd.DataFrame({
+        'date': events['timestamp'].astype('datetime64[D]'),
+        'visitor_id': events['visitor_id'],
+        'session_id': events['session_id'],
+        'time_on_page': events['time_on_page']
+    })
+    session_pages = df.groupby(['date', 'session_id']).size()
+    bounce_rate = (session_pages == 1).groupby(level='date').mean() * 100
+
+    daily = df.groupby('date').agg(
+        page_visits=('session_id', 'nunique'),
+        page_views=('session_id', 'size'),
+        avg_time_on_page=('time_on_page', 'mean'),
+        unique_visitors=('visitor_id', 'nunique')
+    )
+    daily['bounce_rate'] = bounce_rate.round(2)
+    return daily.reset_index()[list(DAILY_METRICS_DTYPE.names)].astype({
+        name: np.float64 for name in DAILY_METRICS_DTYPE.names[1:]
+    })
+
+def fill_snapshot(snapshot_dir, days, end_date=None, chunk_days=31, seed=0, **profile):
+    """
+    Fill a local daily_metrics snapshot from generated page_visits events
+
+    Events are generated and aggregated one chunk of days at a time, so
+    memory stays bounded for long histories. Point SNAPSHOT_DIR at the
+    directory with SNAPSHOT_OFFLINE=True to serve it without Postgres.
+
+    Args:
+        snapshot_dir (str): Snapshot directory (created if missing)
+        days (int): Days of history, ending at end_date
+        end_date (date): Last day (defaults to today)
+        chunk_days (int): Days of events generated at a time
+        seed (int): Random seed
+        **profile: Trend and seasonality options of traffic_profile
+
+    Returns:
+        SnapshotStore: The filled snapshot
+    """
+    store = SnapshotStore(snapshot_dir)
+    dates, expected = traffic_profile(days, end_date, seed=seed, **profile)
+    visitor_pool = max(1, int(expected.mean() * 30))
+
+    for chunk, start in enumerate(range(0, days, chunk_days)):
+        events = synthetic_page_visits(
+            dates[start:start + chunk_days], expected[start:start + chunk_days],
+            visitor_pool=visitor_pool, seed=seed * 100003 + chunk
+        )
+        store.write(daily_metrics_from_page_visits(events), max_updated_at=datetime.now())
+
+    return store
+
+class SyntheticDataLoader:
+    def __init__(self, df):
+        """
+        In-memory stand-in for DataLoader serving synthetic daily_metrics
+
+        Implements the DataLoader methods PredictionService calls for daily
+        forecasts, so the prediction path runs without Postgres.
+
+        Args:
+            df (DataFrame): daily_metrics rows (see synthetic_daily_metrics)
+        """
+        self.df = df
+        self._dates = df['date'].to_numpy()
+        self.visits_timezone = 'UTC'
+        self.forecast_timezone = 'UTC'
+        self.snapshot = None
+        self.offline = False
+
+    def load_daily_metrics(self, start_date=None, end_date=None, limit=None):
+        """Rows between start_date and end_date (inclusive), like the SQL query"""
+        mask = np.ones(len(self.df), dtype=bool)
+        if start_date:
+            mask &= self._dates >= np.datetime64(start_date)
+        if end_date:
+            mask &= self._dates <= np.datetime64(end_date)
+        df = self.df[mask]
+        return df.head(limit).reset_index(drop=True) if limit else df.reset_index(drop=True)
+
+    def get_data_watermark(self):
+        return (self.df['date'].max().date(), None, len(self.df))
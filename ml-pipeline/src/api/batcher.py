@@ -0,0 +1,162 @@
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future
+
+import numpy as np
+
+from api.metrics import Histogram
+
+# Sentinel that tells the batching thread to exit
+_STOP = object()
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class InferenceBatcher:
+    def __init__(self, predict_fn, max_batch_size=64, max_wait_ms=5.0):
+        """
+        Coalesce concurrent model calls into batched forward passes
+
+        Callers block in predict() while a background thread collects inputs
+        for up to max_wait_ms (or until max_batch_size rows are queued), runs
+        predict_fn once on the concatenated batch and hands each caller its
+        own slice of the output.
+
+        Args:
+            predict_fn (callable): Function mapping an (N, ...) array to N outputs
+            max_batch_size (int): Maximum rows per forward pass
+            max_wait_ms (float): Longest time the first queued request waits for company
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(QUEUE_WAIT_BUCKETS)
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name='inference-batcher', daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, inputs):
+        """
+        Queue inputs for the next batch without waiting
+
+        Args:
+            inputs (array): Model input with a leading batch dimension
+
+        Returns:
+            Future: Resolves to the model output rows for these inputs
+        """
+        if self._closed:
+            raise RuntimeError("Inference batcher is closed")
+
+        future = Future()
+        self._queue.put((np.asarray(inputs), future, time.monotonic()))
+        return future
+
+    def predict(self, inputs, timeout=None):
+        """
+        Run inputs through the model as part of the next batch
+
+        Args:
+            inputs (array): Model input with a leading batch dimension
+            timeout (float): Seconds to wait for the result
+
+        Returns:
+            numpy array: Model output rows for these inputs
+        """
+        return self.submit(inputs).result(timeout)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the window closes"""
+        item = self._queue.get()
+        if item is _STOP:
+            return None
+
+        batch = [item]
+        rows = len(item[0])
+        deadline = item[2] + self.max_wait
+
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is _STOP:
+                # Finish this batch, then exit on the next collect
+                self._queue.put(_STOP)
+                break
+
+            batch.append(item)
+            rows += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+
+            # Skip requests cancelled while queued; the rest can no longer be cancelled
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            for _, _, enqueued_at in batch:
+                self.queue_wait_histogram.observe(started - enqueued_at)
+
+            inputs = [item[0] for item in batch]
+            self.batch_size_histogram.observe(sum(len(x) for x in inputs))
+
+            try:
+                outputs = self.predict_fn(np.concatenate(inputs, axis=0))
+            except Exception as e:
+                logging.error(f"Batched inference failed: {str(e)}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for x, future, _ in batch:
+                future.set_result(outputs[offset:offset + len(x)])
+                offset += len(x)
+
+        # Fail anything that arrived after close()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError("Inference batcher is closed"))
+
+    def close(self):
+        """Finish queued work and stop the batching thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def stats(self):
+        """Get batch-size and queue-wait histograms"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'batch_size': self.batch_size_histogram.snapshot(),
+            'queue_wait_seconds': self.queue_wait_histogram.snapshot()
+        }
@@ -0,0 +1,107 @@
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ServiceSaturatedError(Exception):
+    """Raised when the prediction queue is full and a request is rejected"""
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers=4, max_queue=16, wrapper=None):
+        """
+        Run blocking prediction work off the event loop with admission control
+
+        At most max_workers calls run at once; up to max_queue more may wait
+        for a worker. Anything beyond that is rejected immediately so callers
+        can answer 503 instead of piling up latency.
+
+        Context variables of the caller (e.g. the request trace) are visible
+        on the worker thread.
+
+        Args:
+            max_workers (int): Worker threads for DB queries and inference
+            max_queue (int): Requests allowed to wait for a free worker
+            wrapper (callable): Called as wrapper(func, *args, **kwargs) on the
+                worker instead of func (e.g. to profile the call)
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.wrapper = wrapper
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='prediction-worker'
+        )
+
+        # Only touched from the event loop thread
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self):
+        """Maximum number of admitted requests (running + queued)"""
+        return self.max_workers + self.max_queue
+
+    @property
+    def queue_depth(self):
+        """Number of admitted requests waiting for a worker"""
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs) on a worker thread
+
+        Raises:
+            ServiceSaturatedError: If running and queued requests are at capacity
+        """
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise ServiceSaturatedError(
+                f"Prediction queue is full ({self.in_flight} requests in flight)"
+            )
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        if self.wrapper is not None:
+            call = functools.partial(self.wrapper, call)
+
+        self.in_flight += 1
+        try:
+            future = self._executor.submit(functools.partial(contextvars.copy_context().run, call))
+        except BaseException:
+            self.in_flight -= 1
+            raise
+
+        # The slot is held until the call finishes (or is cancelled before it
+        # starts), not just until the caller stops waiting
+        future.add_done_callback(lambda _: self._release_from(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release_from(self, loop):
+        """Free a slot on the event loop thread (runs once per call, from its done callback)"""
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # The loop is closed; nothing else can touch the counters
+            self._release()
+
+    def _release(self):
+        self.in_flight -= 1
+        self.completed += 1
+
+    def stats(self):
+        """Get worker and queue counters"""
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and release the worker threads"""
+        self._executor.shutdown(wait=wait)
@@ -1,15 +1,22 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional
+import asyncio
 import logging
 import os
 import sys
+import time
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from api.prediction_service import PredictionService
+from api.concurrency import BoundedExecutor, ServiceSaturatedError
+from api.metrics import Counter, PrometheusExposition, RequestMetricsMiddleware, process_rss_bytes
+from api.model_registry import ModelVersionLoadingError
+from api.profiling import ProfilingMiddleware, RequestProfiler
+from api.training_jobs import TrainingJobManager, TrainingJobLimitError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,26 +38,168 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize prediction service
+# Request counts by (method, route, status) and requests being handled, for /metrics
+http_requests = Counter()
+http_in_flight = {'value': 0}
+app.add_middleware(RequestMetricsMiddleware, requests=http_requests, in_flight=http_in_flight)
+
+# Opt-in per-request cProfile runs (X-Profile-Token header) and the slow-request log
+request_profiler = RequestProfiler(
+    token=os.getenv('PROFILING_TOKEN') or None,
+    max_per_minute=int(os.getenv('PROFILE_RATE_LIMIT', 6)),
+    history=int(os.getenv('PROFILE_HISTORY', 20)),
+    profile_dir=os.getenv('PROFILE_DIR') or None,
+    slow_log_size=int(os.getenv('SLOW_REQUEST_LOG_SIZE', 20)),
+    slow_log_window=float(os.getenv('SLOW_REQUEST_WINDOW', 3600))
+)
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
+
+# Initialize prediction service (heavy imports happen in initialize_prediction_service)
 prediction_service = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the prediction service on startup"""
-    global prediction_service
+# 'starting' -> 'warming' -> 'ready' (or 'failed' when no model could be loaded)
+service_state = "starting"
+startup_timings = {}
+
+# Worker pool that keeps DB queries and inference off the event loop
+prediction_executor = BoundedExecutor(
+    max_workers=int(os.getenv('PREDICTION_WORKERS', 4)),
+    max_queue=int(os.getenv('PREDICTION_QUEUE_SIZE', 16)),
+    wrapper=request_profiler.run
+)
+
+def promote_model_version(version):
+    """Swap a freshly promoted version into the live service"""
+    if prediction_service is not None:
+        prediction_service.registry.activate(version)
+
+# Retraining runs in separate processes; promoted models land in MODEL_DIR
+training_jobs = TrainingJobManager(
+    model_dir=os.getenv('MODEL_DIR', 'models'),
+    max_jobs=int(os.getenv('RETRAIN_MAX_JOBS', 1)),
+    on_promote=promote_model_version,
+    active_version=lambda: prediction_service.model_version if prediction_service is not None else None
+)
+
+def service_unavailable():
+    """Build the 503 response used before the prediction service is ready"""
+    if service_state in ("starting", "warming"):
+        return HTTPException(
+            status_code=503,
+            detail="Prediction service is warming up",
+            headers={"Retry-After": "5"}
+        )
+    return HTTPException(status_code=503, detail="Prediction service not initialized")
+
+def service_saturated(e):
+    """Build the 503 response for a rejected prediction request"""
+    logger.warning(f"Rejecting prediction request: {e}")
+    return HTTPException(
+        status_code=503,
+        detail="Prediction service is at capacity, retry later",
+        headers={"Retry-After": "1"}
+    )
+
+def version_loading(e):
+    """Build the 503 response for a pinned model version that is still loading"""
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+def require_admin(token):
+    """Reject debug and retraining requests without the admin token (all of them when none is set)"""
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set PROFILING_TOKEN)")
+    if not request_profiler.authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def parse_batch_sizes(value):
+    """Parse a comma-separated list of warm-up batch sizes"""
+    return [int(size) for size in value.split(',') if size.strip()]
+
+def initialize_prediction_service():
+    """
+    Import, load and warm up the prediction service
+    
+    Runs off the event loop. The service is only published once warm-up has
+    finished, so no request ever pays for TensorFlow import or graph tracing.
+    """
+    global prediction_service, service_state
+    started = time.perf_counter()
+    service_state = "warming"
+    
     try:
+        # Pandas, scikit-learn and TensorFlow are imported here, not at module load
+        phase = time.perf_counter()
+        from api.prediction_service import PredictionService
+        startup_timings['import_seconds'] = time.perf_counter() - phase
+        
+        # Loads and warms MODEL_VERSION (and every version hot-swapped in later)
         model_dir = os.getenv('MODEL_DIR', 'models')
         model_version = os.getenv('MODEL_VERSION', 'v1.0.0')
-        prediction_service = PredictionService(model_dir, model_version)
+        service = PredictionService(
+            model_dir,
+            model_version,
+            cache_size=int(os.getenv('FORECAST_CACHE_SIZE', 128)),
+            cache_ttl=float(os.getenv('FORECAST_CACHE_TTL', 3600)),
+            watermark_ttl=float(os.getenv('FORECAST_WATERMARK_TTL', 60)),
+            batch_max_size=int(os.getenv('BATCH_MAX_SIZE', 64)),
+            batch_max_wait_ms=float(os.getenv('BATCH_MAX_WAIT_MS', 5)),
+            warmup_batch_sizes=parse_batch_sizes(os.getenv('WARMUP_BATCH_SIZES', '1,2,4,8,16,32,64')),
+            memory_budget_mb=float(os.getenv('MODEL_MEMORY_BUDGET_MB', 512)),
+            watch_interval=float(os.getenv('MODEL_WATCH_INTERVAL', 30)),
+            runtime=os.getenv('INFERENCE_RUNTIME', 'auto'),
+            engine=os.getenv('FORECAST_ENGINE', 'auto'),
+            fallback_engine=os.getenv('FALLBACK_ENGINE', 'seasonal_naive') or None,
+            lstm_latency_budget_ms=float(os.getenv('LSTM_LATENCY_BUDGET_MS', 0)),
+            engine_selection_days=int(os.getenv('ENGINE_SELECTION_DAYS', 180)),
+            engine_selection_ttl=float(os.getenv('ENGINE_SELECTION_TTL', 86400)),
+            site_batch_size=int(os.getenv('SITE_BATCH_SIZE', 4096)),
+            feature_checkpoint=os.getenv('FEATURE_CHECKPOINT') or None
+        )
+        startup_timings.update(service.load_timings)
+        
+        # Catch up on the days closed since the feature checkpoint was written
+        if service.feature_builder is not None:
+            try:
+                service.sync_features()
+            except Exception as e:
+                logger.warning(f"Incremental feature sync failed: {e}")
+        
+        prediction_service = service
+        service_state = "ready"
         logger.info("Prediction service initialized successfully")
     except Exception as e:
+        service_state = "failed"
         logger.error(f"Failed to initialize prediction service: {e}")
         # Don't raise here - allow the service to start without model
+    finally:
+        startup_timings['total_seconds'] = time.perf_counter() - started
+        logger.info(f"Startup timings: {startup_timings}")
+
+@app.on_event("startup")
+async def startup_event():
+    """Initialize the prediction service on startup"""
+    loop = asyncio.get_running_loop()
+    
+    if os.getenv('STARTUP_MODE', 'background').lower() == 'blocking':
+        # Accept traffic only after the model is loaded and warm
+        await loop.run_in_executor(None, initialize_prediction_service)
+    else:
+        # Accept traffic immediately; /health reports 'warming' until ready
+        app.state.startup_task = loop.run_in_executor(None, initialize_prediction_service)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release prediction worker threads, training processes and loaded models"""
+    prediction_executor.shutdown(wait=False)
+    training_jobs.shutdown()
+    if prediction_service is not None:
+        prediction_service.close()
 
 # Pydantic models for request/response
 class PredictionRequest(BaseModel):
     days_ahead: int = 7
     metric: str = "page_visits"
+    model_version: Optional[str] = None  # Pin a model version (default: active)
 
 class PredictionResponse(BaseModel):
     predictions: List[dict]
@@ -58,6 +207,23 @@ class PredictionResponse(BaseModel):
     prediction_date: str
     days_ahead: int
     total_predicted_visits: int
+    engine: str = "lstm"
+
+class SitePredictionRequest(BaseModel):
+    site_ids: List[str]
+    days_ahead: int = 7
+    metric: str = "page_visits"
+    model_version: Optional[str] = None  # Pin a model version (default: active)
+
+class RetrainRequest(BaseModel):
+    model_version: Optional[str] = None  # Default: timestamp-based version
+    sequence_length: int = 7
+    prediction_horizon: int = 7
+    days_back: int = 60
+    epochs: int = 100
+    batch_size: int = 32
+    promote: bool = False  # Swap in the new model if it beats the active one on recent days
+    holdout_days: Optional[int] = None  # Recent days both models are backtested on (default days_back // 5)
 
 class ModelInfoResponse(BaseModel):
     model_version: str
@@ -65,15 +231,24 @@ class ModelInfoResponse(BaseModel):
     prediction_horizon: int
     is_trained: bool
     total_parameters: int
+    metrics: List[str] = ["page_visits"]
+    site_metrics: List[str] = []
+    visit_granularities: List[str] = []
+    runtime: str = "keras"
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
-        "status": "healthy",
+        "status": "warming" if service_state in ("starting", "warming") else "healthy",
         "service": "ml-prediction-api",
-        "model_loaded": prediction_service is not None and prediction_service.model is not None
+        "model_loaded": prediction_service is not None and prediction_service.model is not None,
+        "prediction_queue": prediction_executor.stats(),
+        "startup": {
+            "state": service_state,
+            "timings": startup_timings
+        }
     }
 
 # Model information endpoint
@@ -81,7 +256,7 @@ async def health_check():
 async def get_model_info():
     """Get information about the loaded model"""
     if prediction_service is None:
-        raise HTTPException(status_code=503, detail="Prediction service not initialized")
+        raise service_unavailable()
     
     try:
         info = prediction_service.get_model_info()
@@ -105,7 +280,7 @@ async def predict_page_visits(request: PredictionRequest):
         Prediction results with dates and values
     """
     if prediction_service is None:
-        raise HTTPException(status_code=503, detail="Prediction service not initialized")
+        raise service_unavailable()
     
     try:
         # Validate request
@@ -114,12 +289,22 @@ async def predict_page_visits(request: PredictionRequest):
         
         # Make prediction
         if request.metric == "page_visits":
-            result = prediction_service.predict_page_visits(request.days_ahead)
+            result = await prediction_executor.run(
+                prediction_service.predict_page_visits, request.days_ahead, request.model_version
+            )
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported metric: {request.metric}")
         
         return result
         
+    except HTTPException:
+        raise
+    except ServiceSaturatedError as e:
+        raise service_saturated(e)
+    except ModelVersionLoadingError as e:
+        raise version_loading(e)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -130,23 +315,33 @@ async def predict_page_visits(request: PredictionRequest):
 # Simple GET endpoint for quick predictions
 @app.get("/predict/page-visits")
 async def predict_page_visits_simple(
-    days_ahead: int = Query(7, ge=1, le=30, description="Number of days to predict")
+    days_ahead: int = Query(7, ge=1, le=30, description="Number of days to predict"),
+    model_version: Optional[str] = Query(None, description="Pin a model version")
 ):
     """
     Simple GET endpoint for page visits prediction
     
     Args:
         days_ahead: Number of days to predict (1-30)
+        model_version: Model version to use (default: active version)
         
     Returns:
         Prediction results
     """
     if prediction_service is None:
-        raise HTTPException(status_code=503, detail="Prediction service not initialized")
+        raise service_unavailable()
     
     try:
-        result = prediction_service.predict_page_visits(days_ahead)
+        result = await prediction_executor.run(
+            prediction_service.predict_page_visits, days_ahead, model_version
+        )
         return result
+    except ServiceSaturatedError as e:
+        raise service_saturated(e)
+    except ModelVersionLoadingError as e:
+        raise version_loading(e)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail="Prediction failed")
@@ -155,7 +350,8 @@ async def predict_page_visits_simple(
 @app.post("/predict/multiple")
 async def predict_multiple_metrics(
     metrics: List[str] = ["page_visits"],
-    days_ahead: int = 7
+    days_ahead: int = 7,
+    model_version: Optional[str] = None
 ):
     """
     Predict multiple metrics
@@ -163,32 +359,280 @@ async def predict_multiple_metrics(
     Args:
         metrics: List of metrics to predict
         days_ahead: Number of days to predict
+        model_version: Model version to use (default: active version)
         
     Returns:
         Predictions for multiple metrics
     """
     if prediction_service is None:
-        raise HTTPException(status_code=503, detail="Prediction service not initialized")
+        raise service_unavailable()
     
     try:
-        result = prediction_service.predict_multiple_metrics(metrics, days_ahead)
+        result = await prediction_executor.run(
+            prediction_service.predict_multiple_metrics, metrics, days_ahead, model_version
+        )
         return result
+    except ServiceSaturatedError as e:
+        raise service_saturated(e)
+    except ModelVersionLoadingError as e:
+        raise version_loading(e)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Multiple metrics prediction error: {e}")
         raise HTTPException(status_code=500, detail="Prediction failed")
 
-# Model retraining endpoint (for future use)
-@app.post("/model/retrain")
-async def retrain_model():
+# Bulk multi-site prediction endpoint
+@app.post("/predict/sites")
+async def predict_sites(request: SitePredictionRequest):
     """
-    Retrain the model with latest data
+    Forecast a list of sites in one request
     
-    Note: This is a placeholder for future implementation
+    Args:
+        request: Site IDs, days_ahead, metric and optional model version
+        
+    Returns:
+        Shared prediction dates, forecasts keyed by site ID and sites without data
     """
-    return {
-        "message": "Model retraining endpoint - not implemented yet",
-        "status": "placeholder"
-    }
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    max_sites = int(os.getenv('MAX_SITES_PER_REQUEST', 10000))
+    if not request.site_ids or len(request.site_ids) > max_sites:
+        raise HTTPException(status_code=400, detail=f"site_ids must contain 1 to {max_sites} sites")
+    if not 1 <= request.days_ahead <= 30:
+        raise HTTPException(status_code=400, detail="days_ahead must be between 1 and 30")
+    
+    try:
+        return await prediction_executor.run(
+            prediction_service.predict_sites,
+            request.site_ids, request.days_ahead, request.metric, request.model_version
+        )
+    except ServiceSaturatedError as e:
+        raise service_saturated(e)
+    except ModelVersionLoadingError as e:
+        raise version_loading(e)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Site prediction error: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+# Sub-daily visits prediction endpoint
+@app.get("/predict/visits")
+async def predict_visits(
+    steps_ahead: int = Query(24, ge=1, description="Number of buckets to predict"),
+    granularity: str = Query("1h", description="Bucket length, e.g. 1h or 15min"),
+    model_version: Optional[str] = Query(None, description="Pin a model version")
+):
+    """
+    Forecast visits per hourly or N-minute bucket (e.g. for autoscaling)
+    
+    Args:
+        steps_ahead: Number of buckets to predict, starting with the current one (up to one day)
+        granularity: Bucket length
+        model_version: Model version to use (default: active version)
+        
+    Returns:
+        Prediction results with bucket start timestamps and values
+    """
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    try:
+        return await prediction_executor.run(
+            prediction_service.predict_visits, steps_ahead, granularity, model_version
+        )
+    except ServiceSaturatedError as e:
+        raise service_saturated(e)
+    except ModelVersionLoadingError as e:
+        raise version_loading(e)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Visits prediction error: {e}")
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+# Prometheus metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request, prediction-stage, model and process metrics in Prometheus text format"""
+    exposition = PrometheusExposition()
+    
+    exposition.counter(
+        "ml_api_http_requests_total", "HTTP requests by method, route and status",
+        {
+            (("method", method), ("endpoint", endpoint), ("status", status)): count
+            for (method, endpoint, status), count in sorted(http_requests.snapshot().items())
+        }
+    )
+    exposition.gauge("ml_api_http_requests_in_flight", "HTTP requests being handled", http_in_flight['value'])
+    
+    queue = prediction_executor.stats()
+    exposition.gauge("ml_api_prediction_queue_depth", "Prediction requests waiting for a worker", queue['queue_depth'])
+    exposition.counter("ml_api_prediction_rejected_total", "Prediction requests rejected with 503", queue['rejected'])
+    
+    exposition.gauge("ml_api_ready", "1 once the prediction service is ready", int(service_state == "ready"))
+    exposition.gauge(
+        "ml_api_startup_seconds", "Duration of each startup phase",
+        {(("phase", name.replace("_seconds", "")),): value for name, value in startup_timings.items()}
+    )
+    exposition.gauge("process_resident_memory_bytes", "Resident memory size in bytes", process_rss_bytes())
+    
+    if prediction_service is not None:
+        exposition.histogram(
+            "ml_api_prediction_stage_seconds", "Seconds per stage of uncached daily forecasts",
+            {(("stage", stage),): histogram for stage, histogram in prediction_service.stage_histograms.items()}
+        )
+        exposition.gauge(
+            "ml_api_model_load_seconds", "Seconds the most recent model version took to load",
+            prediction_service.load_timings.get('model_load_seconds', 0.0)
+        )
+        
+        cache = prediction_service.forecast_cache.stats()
+        exposition.counter("ml_api_forecast_cache_hits_total", "Forecast cache hits", cache['hits'])
+        exposition.counter("ml_api_forecast_cache_misses_total", "Forecast cache misses", cache['misses'])
+        exposition.counter(
+            "ml_api_forecasts_total", "Uncached forecasts by engine",
+            {(("engine", engine),): count for engine, count in prediction_service.engine_counts.items()}
+        )
+        exposition.counter(
+            "ml_api_engine_fallbacks_total", "LSTM forecasts replaced by the fallback engine",
+            prediction_service.fallback_count
+        )
+    
+    return PlainTextResponse(exposition.render(), media_type="text/plain; version=0.0.4")
+
+# Profiling and slow-request endpoints (admin token required)
+@app.get("/debug/slow-requests")
+async def get_slow_requests(x_profile_token: Optional[str] = Header(None)):
+    """Get the slowest recent requests with their per-stage breakdown"""
+    require_admin(x_profile_token)
+    return {"requests": request_profiler.slow_requests.entries()}
+
+@app.get("/debug/profiles")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """List stored request profiles, newest first"""
+    require_admin(x_profile_token)
+    return {"profiles": request_profiler.list_profiles(), "rate_limited": request_profiler.rate_limited}
+
+@app.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Get the cProfile report of one profiled request"""
+    require_admin(x_profile_token)
+    try:
+        return request_profiler.get_profile(profile_id)['report']
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+# Forecast cache statistics endpoint
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Get forecast cache hit/miss counters"""
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    return prediction_service.get_cache_stats()
+
+# Inference batching statistics endpoint
+@app.get("/batcher/stats")
+async def get_batcher_stats():
+    """Get batch-size and queue-wait histograms for model inference"""
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    return prediction_service.get_batcher_stats()
+
+# Incremental feature endpoint
+@app.get("/features/latest")
+async def get_latest_features():
+    """Get the engineered features of the latest closed day"""
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    return prediction_service.get_feature_stats()
+
+# Model version registry endpoint
+@app.get("/model/versions")
+async def get_model_versions():
+    """Get the active, loaded and available model versions"""
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    return prediction_service.get_registry_stats()
+
+# Forecast engine endpoint
+@app.get("/model/engines")
+async def get_forecast_engines():
+    """Get the forecast engine per metric, backtest scores and fallback counts"""
+    if prediction_service is None:
+        raise service_unavailable()
+    
+    return prediction_service.get_engine_stats()
+
+# Model retraining endpoints
+@app.post("/model/retrain", status_code=202)
+async def retrain_model(request: RetrainRequest = RetrainRequest(),
+                        x_profile_token: Optional[str] = Header(None)):
+    """
+    Retrain the model with latest data in a background process (admin only)
+    
+    Args:
+        request: Training parameters and whether to promote the result
+        
+    Returns:
+        Job status including the job ID
+    """
+    require_admin(x_profile_token)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: training_jobs.submit(**request.model_dump())
+        )
+    except TrainingJobLimitError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/model/retrain")
+async def list_retrain_jobs():
+    """List recent training jobs"""
+    return {"jobs": training_jobs.list_jobs()}
+
+@app.get("/model/retrain/{job_id}")
+async def get_retrain_job(job_id: str):
+    """Get status and progress (stage, epoch, loss, ETA) of a training job"""
+    try:
+        return training_jobs.status(job_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@app.delete("/model/retrain/{job_id}")
+async def cancel_retrain_job(job_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Cancel a running training job (admin only)"""
+    require_admin(x_profile_token)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, training_jobs.cancel, job_id
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@app.post("/model/retrain/{job_id}/promote")
+async def promote_retrain_job(job_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Promote the model of a succeeded training job and swap it in live (admin only)"""
+    require_admin(x_profile_token)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, training_jobs.promote, job_id
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 # Root endpoint
 @app.get("/")
@@ -202,7 +646,16 @@ async def root():
             "model_info": "/model/info",
             "predict": "/predict",
             "predict_simple": "/predict/page-visits",
-            "predict_multiple": "/predict/multiple"
+            "predict_multiple": "/predict/multiple",
+            "predict_sites": "/predict/sites",
+            "predict_visits": "/predict/visits",
+            "cache_stats": "/cache/stats",
+            "batcher_stats": "/batcher/stats",
+            "latest_features": "/features/latest",
+            "model_versions": "/model/versions",
+            "model_engines": "/model/engines",
+            "metrics": "/metrics",
+            "retrain": "/model/retrain"
         },
         "documentation": "/docs"
     }
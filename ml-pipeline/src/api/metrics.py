@@ -0,0 +1,202 @@
+import os
+import bisect
+import threading
+
+
+class Histogram:
+    def __init__(self, buckets):
+        """
+        Fixed-bucket histogram with cumulative (Prometheus-style) counts
+
+        Args:
+            buckets (iterable): Upper bounds of the buckets
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """
+        Get cumulative bucket counts
+
+        Returns:
+            dict: {'buckets': {upper_bound: count}, 'sum': float, 'count': int}
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self.sum
+            count = self.count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            running += bucket_count
+            cumulative['+Inf' if bound == float('inf') else str(bound)] = running
+
+        return {
+            'buckets': cumulative,
+            'sum': total,
+            'count': count
+        }
+
+
+class Counter:
+    def __init__(self):
+        """Monotonic counters keyed on a tuple of label values"""
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: label values tuple -> count
+        """
+        with self._lock:
+            return dict(self._values)
+
+
+def process_rss_bytes():
+    """
+    Resident set size of this process
+
+    Reads /proc/self/statm where available; elsewhere falls back to the peak
+    RSS reported by getrusage.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class PrometheusExposition:
+    def __init__(self):
+        """
+        Builder for the Prometheus text exposition format (version 0.0.4)
+
+        Each method appends one metric family; labels are sequences of
+        (name, value) pairs.
+        """
+        self._lines = []
+
+    def _header(self, name, help_text, kind):
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name, help_text, samples):
+        """
+        Args:
+            samples (dict or number): labels -> value, or a single unlabeled value
+        """
+        self._sample_family(name, help_text, 'gauge', samples)
+
+    def counter(self, name, help_text, samples):
+        """
+        Args:
+            samples (dict or number): labels -> value, or a single unlabeled value
+        """
+        self._sample_family(name, help_text, 'counter', samples)
+
+    def _sample_family(self, name, help_text, kind, samples):
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        self._header(name, help_text, kind)
+        for labels, value in samples.items():
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(self, name, help_text, histograms):
+        """
+        Args:
+            histograms (dict): labels -> Histogram
+        """
+        self._header(name, help_text, 'histogram')
+        for labels, histogram in histograms.items():
+            labels = tuple(labels)
+            snapshot = histogram.snapshot()
+            for bound, count in snapshot['buckets'].items():
+                self._lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {count}")
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(float(snapshot['sum']))}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+
+    def render(self):
+        """
+        Returns:
+            str: Exposition text, newline-terminated
+        """
+        return '\n'.join(self._lines) + '\n'
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app, requests, in_flight):
+        """
+        ASGI middleware counting HTTP requests by route and status
+
+        Plain ASGI rather than an http middleware decorator, so a request pays
+        for two counter updates and no extra task or response wrapping.
+        Routes are labelled with their path template (/model/retrain/{job_id}),
+        unmatched paths as 'unmatched', to keep the label set bounded.
+
+        Args:
+            app: ASGI application
+            requests (Counter): Incremented with (method, route, status)
+            in_flight (dict): {'value': int} gauge of requests being handled
+        """
+        self.app = app
+        self.requests = requests
+        self.in_flight = in_flight
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        # Requests are handled on the event loop thread, so no lock is needed
+        self.in_flight['value'] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight['value'] -= 1
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            self.requests.inc((scope['method'], path, str(status[0])))
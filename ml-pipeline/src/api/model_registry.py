@@ -0,0 +1,442 @@
+import os
+import re
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+MODEL_FILE_PATTERN = re.compile(r'^lstm_model_(.+)\.h5$')
+
+
+class ModelVersionNotFoundError(LookupError):
+    """Raised when a requested model version has no files in the model directory"""
+
+
+class ModelVersionLoadingError(Exception):
+    """Raised when a pinned model version is still loading in the background"""
+
+
+class ModelVersion:
+    def __init__(self, version, metric_models, size_bytes=0, mtime=None, site_models=None,
+                 bucket_models=None):
+        """
+        One loaded model version: a model, processor and batcher per metric
+
+        Args:
+            version (str): Model version string
+            metric_models (dict): metric -> {'model', 'processor', 'batcher'}
+            size_bytes (int): Estimated memory footprint, used for the memory budget
+            mtime (float): Modification time of the page_visits model file when loaded
+            site_models (dict): metric -> {'model', 'processor'} for global multi-site models
+            bucket_models (dict): granularity -> {'model', 'processor', 'timezone'} for
+                sub-daily visits models
+        """
+        self.version = version
+        self.metric_models = metric_models
+        self.site_models = site_models or {}
+        self.bucket_models = bucket_models or {}
+        self.size_bytes = size_bytes
+        self.mtime = mtime
+        self.loaded_at = time.time()
+        self.last_used = time.monotonic()
+
+        # Requests currently using this version; guarded by the registry lock
+        self.in_flight = 0
+        self.retired = False
+
+    def close(self):
+        """Stop the batching threads of every metric model"""
+        for entry in self.metric_models.values():
+            entry['batcher'].close()
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'metrics': list(self.metric_models),
+            'site_metrics': list(self.site_models),
+            'visit_granularities': list(self.bucket_models),
+            'size_bytes': self.size_bytes,
+            'loaded_at': self.loaded_at,
+            'in_flight': self.in_flight
+        }
+
+
+class ModelRegistry:
+    def __init__(self, model_dir, load_fn, memory_budget_bytes=None, ignore_prefixes=()):
+        """
+        Loaded model versions with an atomically swappable active version
+
+        New versions are loaded (and warmed by load_fn) before they become
+        active, so requests never see a cold model. Requests hold a reference
+        to the version they started on through acquire(); a replaced or
+        evicted version is only closed once its last request has finished.
+
+        Args:
+            model_dir (str): Directory containing lstm_model_{version}.h5 / metadata_{version}.pkl
+            load_fn (callable): Maps a version string to a ModelVersion
+            memory_budget_bytes (int): Evict least recently used inactive versions above this
+            ignore_prefixes (iterable): Version prefixes that are not standalone versions
+                (e.g. the per-metric 'page_views_' models belonging to a version)
+        """
+        self.model_dir = model_dir
+        self.load_fn = load_fn
+        self.memory_budget_bytes = memory_budget_bytes
+        self.ignore_prefixes = tuple(ignore_prefixes)
+
+        self.active = None
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        # Versions that failed to load, keyed to the file mtime that failed
+        self._failed = {}
+
+        # Pinned versions loading in the background, and loaded ones kept from
+        # eviction until their first request arrives
+        self._loading = set()
+        self._preloaded = set()
+
+        # version -> mtime of the files present when a version was last activated;
+        # the watcher only promotes versions that appeared or changed since then
+        self._known = {}
+
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+
+        # Counters
+        self.loads = 0
+        self.swaps = 0
+        self.evictions = 0
+
+    # Discovery ----------------------------------------------------------
+
+    def available_versions(self):
+        """
+        Versions with both a model file and a metadata file in model_dir
+
+        Returns:
+            dict: version -> model file modification time
+        """
+        try:
+            filenames = os.listdir(self.model_dir)
+        except FileNotFoundError:
+            return {}
+
+        versions = {}
+        for filename in filenames:
+            match = MODEL_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            version = match.group(1)
+            if version.startswith(self.ignore_prefixes):
+                continue
+            if not os.path.exists(os.path.join(self.model_dir, f'metadata_{version}.pkl')):
+                continue
+            versions[version] = os.path.getmtime(os.path.join(self.model_dir, filename))
+
+        return versions
+
+    # Loading and swapping -----------------------------------------------
+
+    def load(self, version, activate=False, reload=False, pin=False):
+        """
+        Get a loaded version, loading it first if needed
+
+        Args:
+            version (str): Model version
+            activate (bool): Make it the active version once loaded
+            reload (bool): Reload from disk even if already loaded
+            pin (bool): Take a request reference (in_flight) in the same step,
+                so eviction cannot drop the version before the caller uses it
+
+        Returns:
+            ModelVersion: The loaded version
+        """
+        if not reload:
+            loaded = self._get_loaded(version, activate, pin)
+            if loaded is not None:
+                return loaded
+
+        # One load at a time; concurrent requests for the same version share it
+        with self._load_lock:
+            if not reload:
+                loaded = self._get_loaded(version, activate, pin)
+                if loaded is not None:
+                    return loaded
+
+            if version not in self.available_versions():
+                raise ModelVersionNotFoundError(f"Model version not found: {version}")
+
+            loaded = self.load_fn(version)
+            self.loads += 1
+
+            to_close = []
+            with self._lock:
+                replaced = self._versions.get(version)
+                self._versions[version] = loaded
+                if pin:
+                    self._pin(loaded)
+                if activate or (replaced is not None and replaced is self.active):
+                    self._set_active(loaded)
+                if replaced is not None and self._retire(replaced):
+                    to_close.append(replaced)
+
+            for old in to_close:
+                old.close()
+
+        self.evict()
+        return loaded
+
+    def activate(self, version, reload=False):
+        """
+        Load and warm a version, then swap it in as the active version
+
+        Args:
+            version (str): Model version
+            reload (bool): Reload from disk even if already loaded
+
+        Returns:
+            ModelVersion: The new active version
+        """
+        known = self.available_versions()
+        loaded = self.load(version, activate=True, reload=reload)
+        self._known = known
+        logging.info(f"Active model version: {loaded.version}")
+        return loaded
+
+    def _get_loaded(self, version, activate, pin=False):
+        with self._lock:
+            loaded = self._versions.get(version)
+            if loaded is not None and activate:
+                self._set_active(loaded)
+            if loaded is not None and pin:
+                self._pin(loaded)
+            return loaded
+
+    def _pin(self, loaded):
+        """Take a request reference on a version (call with the lock held)"""
+        loaded.in_flight += 1
+        loaded.last_used = time.monotonic()
+
+    def _set_active(self, loaded):
+        """Swap the active version (call with the lock held)"""
+        if self.active is not loaded:
+            self.active = loaded
+            self.swaps += 1
+        loaded.last_used = time.monotonic()
+
+    def _retire(self, loaded):
+        """
+        Mark a version as no longer servable (call with the lock held)
+
+        Returns:
+            bool: True if it is idle and should be closed now
+        """
+        loaded.retired = True
+        return loaded.in_flight == 0
+
+    @contextmanager
+    def acquire(self, version=None):
+        """
+        Hold a model version for the duration of a request
+
+        A pinned version that is not loaded yet is loaded on a background
+        thread rather than the request thread (loading imports TensorFlow and
+        warms every metric model); the request is refused until it is ready.
+
+        Args:
+            version (str): Pinned version (None for the active version)
+
+        Yields:
+            ModelVersion: The version to serve the request with
+
+        Raises:
+            ModelVersionNotFoundError: If the version has no files
+            ModelVersionLoadingError: If the version is loading; retry shortly
+        """
+        with self._lock:
+            loaded = self.active if version is None else self._versions.get(version)
+            if loaded is not None:
+                self._pin(loaded)
+                self._preloaded.discard(loaded.version)
+
+        if loaded is None:
+            if version is None:
+                raise ModelVersionNotFoundError("No active model version")
+            self._load_in_background(version)
+            raise ModelVersionLoadingError(f"Model version {version} is loading, retry shortly")
+
+        try:
+            yield loaded
+        finally:
+            with self._lock:
+                loaded.in_flight -= 1
+                close = loaded.retired and loaded.in_flight == 0
+            if close:
+                loaded.close()
+            elif loaded is not self.active:
+                # Versions kept over the budget while in use can go now
+                self.evict()
+
+    def _load_in_background(self, version):
+        """Start loading a pinned version unless it is loading already"""
+        mtime = self.available_versions().get(version)
+        if mtime is None:
+            raise ModelVersionNotFoundError(f"Model version not found: {version}")
+        if self._failed.get(version) == mtime:
+            raise RuntimeError(f"Model version {version} failed to load")
+
+        with self._lock:
+            if version in self._loading:
+                return
+            self._loading.add(version)
+            # Marked before loading, so the eviction that follows the load keeps it
+            self._preloaded.add(version)
+
+        def load():
+            try:
+                self.load(version)
+            except Exception as e:
+                self._failed[version] = mtime
+                with self._lock:
+                    self._preloaded.discard(version)
+                logging.error(f"Failed to load model version {version}: {str(e)}")
+            finally:
+                with self._lock:
+                    self._loading.discard(version)
+
+        threading.Thread(target=load, name=f'model-load-{version}', daemon=True).start()
+
+    def evict(self):
+        """
+        Drop least recently used inactive versions until under the memory budget
+
+        Versions with requests in flight are kept, even if the budget cannot be
+        met; they are evicted once their last request finishes.
+        """
+        if not self.memory_budget_bytes:
+            return
+
+        to_close = []
+        with self._lock:
+            total = sum(loaded.size_bytes for loaded in self._versions.values())
+            candidates = sorted(
+                (loaded for loaded in self._versions.values()
+                 if loaded is not self.active and loaded.in_flight == 0
+                 and loaded.version not in self._preloaded),
+                key=lambda loaded: loaded.last_used
+            )
+            for loaded in candidates:
+                if total <= self.memory_budget_bytes:
+                    break
+                del self._versions[loaded.version]
+                total -= loaded.size_bytes
+                self.evictions += 1
+                logging.info(f"Evicted model version {loaded.version}")
+                if self._retire(loaded):
+                    to_close.append(loaded)
+
+        for loaded in to_close:
+            loaded.close()
+
+    # Watching -----------------------------------------------------------
+
+    def poll(self):
+        """
+        Activate the newest version added to (or rewritten in) model_dir since
+        the last activation
+
+        Versions already present when a version was activated are never
+        promoted, so pinning an older MODEL_VERSION (e.g. a rollback) sticks
+        until a new version is deployed.
+
+        Returns:
+            str: Newly activated version, or None
+        """
+        versions = {
+            version: mtime for version, mtime in self.available_versions().items()
+            if self._known.get(version) != mtime
+        }
+        if not versions:
+            return None
+
+        latest = max(versions, key=versions.get)
+        mtime = versions[latest]
+        active = self.active
+        if active is not None and active.mtime is not None and mtime <= active.mtime:
+            return None
+        if self._failed.get(latest) == mtime:
+            return None
+
+        with self._lock:
+            loaded = self._versions.get(latest)
+        reload = loaded is not None and loaded.mtime is not None and mtime > loaded.mtime
+
+        try:
+            self.activate(latest, reload=reload)
+        except Exception as e:
+            self._failed[latest] = mtime
+            logging.error(f"Failed to load model version {latest}: {str(e)}")
+            return None
+
+        return latest
+
+    def start_watching(self, interval):
+        """
+        Poll model_dir for new versions on a background thread
+
+        Args:
+            interval (float): Seconds between polls
+        """
+        if self._watch_thread is not None:
+            return
+
+        def watch():
+            while not self._watch_stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    logging.error(f"Model directory poll failed: {str(e)}")
+
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(target=watch, name='model-registry-watch', daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the background watcher"""
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+
+    def close(self):
+        """Stop watching and close every loaded version"""
+        self.stop_watching()
+        to_close = []
+        with self._lock:
+            for loaded in self._versions.values():
+                if self._retire(loaded):
+                    to_close.append(loaded)
+            self._versions = {}
+            self.active = None
+        for loaded in to_close:
+            loaded.close()
+
+    def stats(self):
+        """Get loaded and available versions and swap/eviction counters"""
+        with self._lock:
+            loaded = [version.stats() for version in self._versions.values()]
+            active = self.active.version if self.active is not None else None
+
+        return {
+            'active': active,
+            'loaded': loaded,
+            'available': sorted(self.available_versions()),
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'loaded_bytes': sum(version['size_bytes'] for version in loaded),
+            'loads': self.loads,
+            'swaps': self.swaps,
+            'evictions': self.evictions,
+            'watching': self._watch_thread is not None
+        }
@@ -1,71 +1,460 @@
 import sys
 import os
+import re
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
+import time
 from typing import List, Dict, Optional
 import joblib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from config.database import DataLoader
 from preprocessing.data_processor import DataProcessor
-from models.lstm_model import LSTMModel
+from preprocessing.features import DAILY_METRICS, default_feature_specs, metric_model_version
+from preprocessing.incremental import IncrementalFeatureBuilder
+from preprocessing.multi_series import MultiSeriesProcessor, site_model_version
+from preprocessing.granularity import (
+    DAILY, bucket_model_version, buckets_per_day, current_bucket_start, granularity_label, parse_granularity
+)
+from api.forecast_cache import ForecastCache
+from api.batcher import InferenceBatcher
+from api.model_registry import ModelRegistry, ModelVersion
+from api.metrics import Histogram
+from api.profiling import record_stage
+from models.numpy_lstm import NumpyLSTMModel, weights_path
+from models.baselines import (
+    BASELINE_FORECASTERS, HoltWintersForecaster, MovingAverageForecaster, SeasonalNaiveForecaster
+)
+from training.backtest import Backtester
+
+# Metrics reported as whole counts; the rest are rates/averages
+COUNT_METRICS = ('page_visits', 'page_views', 'unique_visitors')
+
+# Forecast engines: the trained LSTM plus the classical baselines
+ENGINES = ('lstm',) + tuple(BASELINE_FORECASTERS)
+
+# Version label of forecasts served without any LSTM version loaded
+BASELINE_VERSION = 'baseline'
+
+# Timed stages of a daily forecast request, in order
+PREDICTION_STAGES = ('db_load', 'features', 'scaling', 'inference', 'inverse_transform', 'response')
+STAGE_SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
 
 class PredictionService:
-    def __init__(self, model_dir='models', model_version='v1.0.0'):
+    def __init__(self, model_dir='models', model_version='v1.0.0',
+                 cache_size=128, cache_ttl=3600, watermark_ttl=60,
+                 batch_max_size=64, batch_max_wait_ms=5.0,
+                 warmup_batch_sizes=(), memory_budget_mb=512, watch_interval=0,
+                 runtime='auto', engine='auto', fallback_engine='seasonal_naive',
+                 lstm_latency_budget_ms=0, engine_selection_days=180, engine_selection_ttl=86400,
+                 site_batch_size=4096, feature_checkpoint=None):
         """
         Initialize the prediction service
         
         Args:
             model_dir (str): Directory containing trained models
             model_version (str): Version of the model to load
+            cache_size (int): Maximum number of cached forecasts (0 disables caching)
+            cache_ttl (float): Seconds a cached forecast stays valid
+            watermark_ttl (float): Seconds between daily_metrics watermark checks
+            batch_max_size (int): Maximum sequences per batched forward pass
+            batch_max_wait_ms (float): Time window for collecting a batch
+            warmup_batch_sizes (iterable): Batch sizes every loaded version is warmed at
+            memory_budget_mb (float): Memory budget for loaded versions (0 for unlimited)
+            watch_interval (float): Seconds between model_dir polls for new versions (0 disables)
+            runtime (str): 'numpy' or 'keras' inference; 'auto' uses NumPy when exported weights exist
+            engine (str): Forecast engine (see ENGINES); 'auto' picks per metric by backtest error
+            fallback_engine (str): Baseline used when the LSTM is unavailable, fails or is too slow
+                (None to fail instead)
+            lstm_latency_budget_ms (float): Longest wait for an LSTM forecast before falling back (0 waits forever)
+            engine_selection_days (int): Days of history the 'auto' backtests run over
+            engine_selection_ttl (float): Seconds an 'auto' engine choice stays valid
+            site_batch_size (int): Sites per forward pass of a global multi-site model
+            feature_checkpoint (str): File the incremental feature state is resumed from and saved to
+                (None disables incremental features)
         """
+        if runtime not in ('auto', 'numpy', 'keras'):
+            raise ValueError(f"Unknown inference runtime: {runtime}")
+        if engine not in ENGINES + ('auto',):
+            raise ValueError(f"Unknown forecast engine: {engine}")
+        if fallback_engine is not None and fallback_engine not in BASELINE_FORECASTERS:
+            raise ValueError(f"Fallback engine must be a baseline: {fallback_engine}")
+        
         self.model_dir = model_dir
-        self.model_version = model_version
+        self.default_version = model_version
+        self.runtime = runtime
         
         # Initialize components
         self.data_loader = DataLoader()
-        self.data_processor = None
-        self.model = None
-        self.scaler = None
+        self.load_timings = {}
+        
+        # Micro-batching in front of the model
+        self.batch_max_size = batch_max_size
+        self.batch_max_wait_ms = batch_max_wait_ms
+        self.warmup_batch_sizes = tuple(warmup_batch_sizes)
+        
+        # Classical forecasters: stateless, shared by every metric and version
+        self.engine = engine
+        self.fallback_engine = fallback_engine
+        self.lstm_latency_budget = lstm_latency_budget_ms / 1000.0 if lstm_latency_budget_ms else None
+        self.baselines = {name: forecaster() for name, forecaster in BASELINE_FORECASTERS.items()}
+        self.engine_selection_days = engine_selection_days
+        self.engine_selection_ttl = engine_selection_ttl
+        self._engine_selections = {}
+        self._selection_lock = threading.Lock()
+        self._selection_locks = {}
+        self._selection_pending = set()
+        
+        # 'auto' backtests run here, never on a request thread
+        self._selection_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='engine-selection')
+        self.engine_counts = {name: 0 for name in ENGINES}
+        self.fallback_count = 0
+        self.site_batch_size = site_batch_size
+        
+        # Seconds spent per stage of uncached forecasts (see PREDICTION_STAGES)
+        self.stage_histograms = {stage: Histogram(STAGE_SECONDS_BUCKETS) for stage in PREDICTION_STAGES}
+        
+        # Loaded versions; requests pin one through registry.acquire()
+        self.registry = ModelRegistry(
+            model_dir,
+            self._load_version,
+            memory_budget_bytes=int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None,
+            ignore_prefixes=[f"{metric}_" for metric in DAILY_METRICS if metric != 'page_visits'] + ['sites_', 'visits_']
+        )
+        
+        # Baselines for sub-daily visits, with one day of buckets as the season
+        self._bucket_baselines = {}
+        
+        # Forecast cache
+        self.forecast_cache = ForecastCache(max_entries=cache_size, ttl_seconds=cache_ttl)
+        self.watermark_ttl = watermark_ttl
+        self._watermark = None
+        self._watermark_checked_at = None
+        
+        # Features of the latest closed day, appended as new days arrive
+        self.feature_checkpoint = feature_checkpoint
+        self.feature_builder = self._load_feature_builder() if feature_checkpoint else None
+        self._feature_lock = threading.Lock()
         
         # Load model and components
         self.load_model()
         
+        if watch_interval:
+            self.registry.start_watching(watch_interval)
+    
+    # The active version's components, for callers that predate the registry
+    
+    @property
+    def model_version(self):
+        active = self.registry.active
+        return active.version if active is not None else self.default_version
+    
+    @property
+    def metric_models(self):
+        active = self.registry.active
+        return active.metric_models if active is not None else {}
+    
+    @property
+    def model(self):
+        entry = self.metric_models.get('page_visits')
+        return entry['model'] if entry else None
+    
+    @property
+    def data_processor(self):
+        entry = self.metric_models.get('page_visits')
+        return entry['processor'] if entry else None
+    
+    @property
+    def batcher(self):
+        entry = self.metric_models.get('page_visits')
+        return entry['batcher'] if entry else None
+    
+    @property
+    def scaler(self):
+        processor = self.data_processor
+        return processor.scaler if processor is not None else None
+    
     def load_model(self):
-        """Load the trained model and associated components"""
+        """(Re)load the configured model version and make it active"""
         try:
-            # Load model
-            model_path = os.path.join(self.model_dir, f'lstm_model_{self.model_version}.h5')
-            metadata_path = os.path.join(self.model_dir, f'metadata_{self.model_version}.pkl')
-            
-            if not os.path.exists(model_path):
-                raise FileNotFoundError(f"Model file not found: {model_path}")
-            
-            # Load metadata
-            metadata = joblib.load(metadata_path)
-            sequence_length = metadata['sequence_length']
-            prediction_horizon = metadata['prediction_horizon']
-            
-            # Initialize data processor
-            self.data_processor = DataProcessor(sequence_length, prediction_horizon)
+            self.registry.activate(self.default_version, reload=True)
             
-            # Load model
-            self.model = LSTMModel(sequence_length, prediction_horizon, self.model_version)
-            self.model.load_model(model_path, metadata_path)
+            # Forecasts from a previous load of this version are no longer valid
+            self.invalidate_cache()
             
-            # Load scaler (we'll need to refit it with recent data)
-            self.scaler = self.data_processor.scaler
+        except (LookupError, FileNotFoundError) as e:
+            if self.fallback_engine is None or self.registry.active is not None:
+                logging.error(f"Failed to load model: {str(e)}")
+                raise
             
-            logging.info(f"Model loaded successfully: {model_path}")
+            # No model yet: serve the baselines until the watcher finds a version
+            logging.warning(f"Failed to load model ({str(e)}); serving {self.fallback_engine} forecasts")
             
         except Exception as e:
             logging.error(f"Failed to load model: {str(e)}")
             raise
     
+    def _load_version(self, version):
+        """
+        Load and warm every metric model of a version (called by the registry)
+        
+        Args:
+            version (str): Model version
+            
+        Returns:
+            ModelVersion: Loaded version, ready to serve
+        """
+        started = time.perf_counter()
+        model_path = os.path.join(self.model_dir, f'lstm_model_{version}.h5')
+        mtime = os.path.getmtime(model_path) if os.path.exists(model_path) else None
+        
+        # page_visits is required; other metrics are served when a model exists
+        metric_models = {'page_visits': self._load_metric_model('page_visits', version)}
+        for metric in DAILY_METRICS:
+            if metric in metric_models:
+                continue
+            try:
+                metric_models[metric] = self._load_metric_model(metric, version)
+            except FileNotFoundError:
+                continue
+        
+        # Global multi-site models are optional
+        site_models = {}
+        for metric in DAILY_METRICS:
+            try:
+                site_models[metric] = self._load_site_model(metric, version)
+            except FileNotFoundError:
+                continue
+        
+        # Sub-daily visits models: one per granularity found in model_dir
+        bucket_models = {}
+        pattern = re.compile(rf'^lstm_model_visits_(\d+(?:h|min))_{re.escape(version)}\.h5$')
+        for name in (sorted(os.listdir(self.model_dir)) if os.path.isdir(self.model_dir) else []):
+            match = pattern.match(name)
+            if match:
+                granularity = granularity_label(match.group(1))
+                bucket_models[granularity] = self._load_bucket_model(granularity, version)
+        
+        self.load_timings['model_load_seconds'] = time.perf_counter() - started
+        
+        try:
+            # Trace the model at every batch size the batcher can produce
+            started = time.perf_counter()
+            self._warm_up_models(
+                {
+                    **metric_models,
+                    **{f'sites:{metric}': entry for metric, entry in site_models.items()},
+                    **{f'visits:{granularity}': entry for granularity, entry in bucket_models.items()}
+                },
+                self.warmup_batch_sizes
+            )
+            self.load_timings['warmup_seconds'] = time.perf_counter() - started
+        except Exception:
+            for entry in metric_models.values():
+                entry['batcher'].close()
+            raise
+        
+        # Weights dominate memory; their file size is a cheap, TF-free estimate
+        size_bytes = sum(
+            os.path.getsize(entry['model_path'])
+            for entry in list(metric_models.values()) + list(site_models.values()) + list(bucket_models.values())
+        )
+        
+        loaded = ModelVersion(
+            version, metric_models, size_bytes=size_bytes, mtime=mtime,
+            site_models=site_models, bucket_models=bucket_models
+        )
+        
+        # Pick engines in the background; requests use the LSTM until then
+        if self.engine == 'auto':
+            for metric in metric_models:
+                self.schedule_engine_selection(loaded, metric)
+        
+        return loaded
+    
+    def _load_metric_model(self, metric, model_version):
+        """
+        Load the model, processor and batcher for one metric
+        
+        Args:
+            metric (str): Metric the model forecasts
+            model_version (str): Model version
+            
+        Returns:
+            dict: {'model', 'processor', 'batcher', 'model_path', 'training_end_date'}
+        """
+        version = metric_model_version(model_version, metric)
+        model_path = os.path.join(self.model_dir, f'lstm_model_{version}.h5')
+        metadata_path = os.path.join(self.model_dir, f'metadata_{version}.pkl')
+        
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        
+        # Load metadata
+        metadata = joblib.load(metadata_path)
+        sequence_length = metadata['sequence_length']
+        prediction_horizon = metadata['prediction_horizon']
+        
+        # Initialize data processor
+        processor = DataProcessor(sequence_length, prediction_horizon)
+        
+        # Load model
+        model = self._load_lstm(version, model_path, metadata_path, sequence_length, prediction_horizon)
+        
+        # Batch concurrent requests into single forward passes
+        batcher = InferenceBatcher(
+            model.predict,
+            max_batch_size=self.batch_max_size,
+            max_wait_ms=self.batch_max_wait_ms
+        )
+        
+        # Backtests only score the LSTM on days after it was trained; models
+        # saved before the cutoff was recorded fall back to the file time
+        training_end_date = metadata.get('training_end_date')
+        training_end_date = (
+            pd.Timestamp(training_end_date) if training_end_date
+            else pd.Timestamp(os.path.getmtime(model_path), unit='s')
+        ).normalize()
+        
+        # Load the scaler fitted at training time
+        if metadata.get('scaler') is not None:
+            processor.set_scaler(metadata['scaler'])
+        else:
+            logging.warning(
+                f"Model metadata for {metric} has no fitted scaler; it will be refit on "
+                "recent data for every prediction. Retrain to store the training scaler."
+            )
+        
+        logging.info(f"Model loaded successfully: {model_path}")
+        
+        return {
+            'model': model,
+            'processor': processor,
+            'batcher': batcher,
+            'model_path': model_path,
+            'training_end_date': training_end_date
+        }
+    
+    def _load_site_model(self, metric, model_version):
+        """
+        Load the global multi-site model for one metric
+        
+        Args:
+            metric (str): Metric the model forecasts
+            model_version (str): Model version
+            
+        Returns:
+            dict: {'model', 'processor', 'model_path'}
+        """
+        version = site_model_version(model_version, metric)
+        model_path = os.path.join(self.model_dir, f'lstm_model_{version}.h5')
+        metadata_path = os.path.join(self.model_dir, f'metadata_{version}.pkl')
+        
+        if not os.path.exists(model_path) or not os.path.exists(metadata_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        
+        metadata = joblib.load(metadata_path)
+        sequence_length = metadata['sequence_length']
+        prediction_horizon = metadata['prediction_horizon']
+        
+        # Per-site scaling parameters fitted at training time
+        processor = MultiSeriesProcessor(sequence_length, prediction_horizon)
+        processor.scaler = metadata['scaler']
+        processor.is_fitted = True
+        
+        model = self._load_lstm(version, model_path, metadata_path, sequence_length, prediction_horizon)
+        
+        logging.info(f"Multi-site model loaded successfully: {model_path} ({len(processor.scaler)} sites)")
+        
+        return {'model': model, 'processor': processor, 'model_path': model_path}
+    
+    def _load_bucket_model(self, granularity, model_version):
+        """
+        Load the sub-daily visits model for one granularity
+        
+        Args:
+            granularity (str): Bucket length label ('1h', '15min', ...)
+            model_version (str): Model version
+            
+        Returns:
+            dict: {'model', 'processor', 'timezone', 'model_path'}
+        """
+        version = bucket_model_version(model_version, granularity)
+        model_path = os.path.join(self.model_dir, f'lstm_model_{version}.h5')
+        metadata_path = os.path.join(self.model_dir, f'metadata_{version}.pkl')
+        
+        if not os.path.exists(model_path) or not os.path.exists(metadata_path):
+            raise FileNotFoundError(f"Model file not found: {model_path}")
+        
+        metadata = joblib.load(metadata_path)
+        sequence_length = metadata['sequence_length']
+        prediction_horizon = metadata['prediction_horizon']
+        
+        processor = DataProcessor(sequence_length, prediction_horizon, granularity=granularity)
+        processor.set_scaler(metadata['scaler'])
+        
+        model = self._load_lstm(version, model_path, metadata_path, sequence_length, prediction_horizon)
+        
+        logging.info(f"Visits model loaded successfully: {model_path}")
+        
+        return {
+            'model': model,
+            'processor': processor,
+            'timezone': metadata.get('timezone') or self.data_loader.forecast_timezone,
+            'model_path': model_path
+        }
+    
+    def _load_lstm(self, version, model_path, metadata_path, sequence_length, prediction_horizon):
+        """Load a model with the NumPy runtime when its weights are exported, else with Keras"""
+        numpy_path = weights_path(self.model_dir, version)
+        if self.runtime == 'numpy' or (self.runtime == 'auto' and os.path.exists(numpy_path)):
+            # Exported weights run without TensorFlow
+            return NumpyLSTMModel.load(numpy_path, sequence_length, prediction_horizon, version)
+        
+        # Import TensorFlow only once a Keras model is actually needed
+        started = time.perf_counter()
+        from models.lstm_model import LSTMModel
+        self.load_timings.setdefault('tensorflow_import_seconds', time.perf_counter() - started)
+        
+        model = LSTMModel(sequence_length, prediction_horizon, version)
+        model.load_model(model_path, metadata_path)
+        return model
+    
+    def warm_up(self, batch_sizes=(1,)):
+        """
+        Run synthetic inferences on the active version so graph tracing happens before real traffic
+        
+        Args:
+            batch_sizes (iterable): Batch sizes to trace (sizes above batch_max_size are skipped)
+            
+        Returns:
+            Dict: '{metric}:{batch_size}' -> seconds for the warm-up call
+        """
+        return self._warm_up_models(self.metric_models, batch_sizes)
+    
+    def _warm_up_models(self, metric_models, batch_sizes):
+        timings = {}
+        
+        for metric, entry in metric_models.items():
+            model = entry['model']
+            for batch_size in batch_sizes:
+                if batch_size < 1 or batch_size > self.batch_max_size:
+                    continue
+                started = time.perf_counter()
+                model.predict(np.zeros((batch_size, model.sequence_length, 1), dtype=np.float32))
+                timings[f'{metric}:{batch_size}'] = time.perf_counter() - started
+        
+        if timings:
+            logging.info(f"Warm-up finished for {len(timings)} model/batch-size combinations")
+        return timings
+    
     def get_recent_data(self, days_back=30):
         """
         Get recent data for prediction
@@ -89,117 +478,875 @@ class PredictionService:
         
         return df
     
-    def prepare_prediction_input(self, recent_data):
+    def prepare_prediction_input(self, recent_data, metric='page_visits', metric_models=None):
         """
         Prepare input sequence for prediction
         
         Args:
             recent_data (DataFrame): Recent daily metrics
+            metric (str): Metric to build the sequence for
+            metric_models (dict): Models of the version serving the request (default: active)
             
         Returns:
             tuple: (input_sequence, scaler)
         """
-        # Add features
-        df_with_features = self.data_processor.add_features(recent_data)
+        metric_models = metric_models if metric_models is not None else self.metric_models
+        data_processor = metric_models[metric]['processor']
         
-        # Prepare data and fit scaler
-        X_train, y_train, X_test, y_test, scaler = self.data_processor.prepare_data(
-            df_with_features, target_column='page_visits'
+        # Scaler saved with the model: only the last sequence_length values are needed
+        if data_processor.is_fitted:
+            started = time.perf_counter()
+            input_sequence = data_processor.create_prediction_sequence(
+                recent_data, target_column=metric
+            )
+            self._observe_stage('scaling', started)
+            return input_sequence, data_processor.scaler
+        
+        # Legacy models without a stored scaler: refit on the last 30 days using a
+        # throwaway processor so concurrent requests never share a half-fitted scaler
+        dates = pd.to_datetime(recent_data['date'])
+        recent_data = recent_data[dates >= pd.Timestamp(datetime.now().date() - timedelta(days=30))]
+        processor = DataProcessor(
+            data_processor.sequence_length,
+            data_processor.prediction_horizon
         )
+        started = time.perf_counter()
+        df_with_features = processor.add_features(recent_data, metrics=[metric])
+        started = self._observe_stage('features', started)
         
-        # Create prediction sequence from recent data
-        input_sequence = self.data_processor.create_prediction_sequence(
-            df_with_features, target_column='page_visits'
+        X_train, y_train, X_test, y_test, scaler = processor.prepare_data(
+            df_with_features, target_column=metric
         )
         
+        input_sequence = processor.create_prediction_sequence(
+            df_with_features, target_column=metric
+        )
+        self._observe_stage('scaling', started)
+        
         return input_sequence, scaler
     
-    def predict_page_visits(self, days_ahead=7) -> Dict:
+    def _observe_stage(self, stage, started):
+        """Record the seconds since started for a stage and return the current time"""
+        now = time.perf_counter()
+        self.stage_histograms[stage].observe(now - started)
+        record_stage(stage, now - started)
+        return now
+    
+    def get_data_watermark(self):
+        """
+        Get the daily_metrics watermark, re-querying at most every watermark_ttl seconds
+        
+        Returns:
+            tuple: (max_date, max_updated_at, row_count), or None if unavailable
+        """
+        now = time.monotonic()
+        if (self._watermark_checked_at is None or
+                now - self._watermark_checked_at >= self.watermark_ttl):
+            watermark = self.data_loader.get_data_watermark()
+            changed = watermark != self._watermark
+            self._watermark = watermark
+            self._watermark_checked_at = now
+            
+            # New rows may have closed a day the features have not seen
+            if changed and self.feature_builder is not None:
+                try:
+                    self.sync_features()
+                except Exception as e:
+                    logging.warning(f"Incremental feature sync failed: {str(e)}")
+        
+        return self._watermark
+    
+    def _load_feature_builder(self):
+        """Resume the incremental features from the checkpoint, or start empty"""
+        if os.path.exists(self.feature_checkpoint):
+            try:
+                builder = IncrementalFeatureBuilder.load(self.feature_checkpoint)
+                logging.info(f"Resumed incremental features at {builder.last_date} from {self.feature_checkpoint}")
+                return builder
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable feature checkpoint {self.feature_checkpoint}: {str(e)}")
+        
+        return IncrementalFeatureBuilder(default_feature_specs(DAILY_METRICS))
+    
+    def sync_features(self):
+        """
+        Append the closed days after the feature watermark and checkpoint the state
+        
+        Only days after the builder's last day are queried, so a resumed
+        builder never rescans history; an empty one reads just enough days to
+        fill its longest window. Today is left out until it closes, since its
+        row still changes.
+        
+        Returns:
+            int: Days appended
+        """
+        if self.feature_builder is None:
+            return 0
+        
+        with self._feature_lock:
+            builder = self.feature_builder
+            end_date = datetime.now().date() - timedelta(days=1)
+            if builder.last_date is not None:
+                start_date = builder.last_date + timedelta(days=1)
+            else:
+                start_date = end_date - timedelta(days=builder.capacity - 1)
+            
+            if start_date > end_date:
+                return 0
+            
+            df = self.data_loader.load_daily_metrics(start_date=start_date, end_date=end_date)
+            appended = len(builder.update_from_frame(df)) if not df.empty else 0
+            if appended:
+                builder.save(self.feature_checkpoint)
+                logging.info(f"Appended {appended} day(s) to incremental features (now at {builder.last_date})")
+            return appended
+    
+    def get_feature_stats(self) -> Dict:
+        """Get the incremental feature watermark and the latest day's feature row"""
+        if self.feature_builder is None:
+            return {'error': 'Incremental features are disabled (set FEATURE_CHECKPOINT)'}
+        
+        with self._feature_lock:
+            builder = self.feature_builder
+            return {
+                'checkpoint': self.feature_checkpoint,
+                'last_date': builder.last_date.isoformat() if builder.last_date else None,
+                'days_seen': builder.n_seen,
+                'features': builder.latest_features()
+            }
+    
+    def get_forecast(self, metric='page_visits', model_version=None):
+        """
+        Get the full-horizon forecast for a metric, served from cache when possible
+        
+        Args:
+            metric (str): Metric to forecast
+            model_version (str): Pinned model version (None for the active version)
+            
+        Returns:
+            numpy array: Forecast values in original scale (length prediction_horizon)
+        """
+        return self.get_forecasts([metric], model_version)[metric]
+    
+    def get_forecasts(self, metrics, model_version=None):
+        """
+        Get full-horizon forecasts for several metrics at once
+        
+        Args:
+            metrics (List[str]): Metrics with a loaded model
+            model_version (str): Pinned model version (None for the active version)
+            
+        Returns:
+            Dict: metric -> forecast values in original scale
+        """
+        with self._acquire(model_version) as loaded:
+            return self._get_forecasts(loaded, metrics)[0]
+    
+    @contextmanager
+    def _acquire(self, model_version=None):
+        """
+        Pin a model version for a request, or yield None when no version is
+        loaded and the baselines can serve instead
+        """
+        if model_version is None and self.registry.active is None and self.fallback_engine is not None:
+            yield None
+            return
+        
+        with self.registry.acquire(model_version) as loaded:
+            yield loaded
+    
+    def servable_metrics(self, loaded):
+        """Metrics a version (or the baselines alone, for None) can forecast"""
+        if self.fallback_engine is not None or self.engine in BASELINE_FORECASTERS:
+            return DAILY_METRICS
+        return tuple(loaded.metric_models) if loaded is not None else ()
+    
+    def _get_forecasts(self, loaded, metrics):
+        """
+        Forecast several metrics with one model version
+        
+        Each metric is served by its engine (see choose_engine). Cached
+        metrics are returned directly. The rest share a single daily_metrics
+        fetch; LSTM input sequences are submitted to the per-metric batchers
+        together so the forward passes overlap, and baselines are computed
+        inline in microseconds.
+        
+        Args:
+            loaded (ModelVersion): Version acquired for this request (None for baselines only)
+            metrics (List[str]): Metrics to forecast
+            
+        Returns:
+            tuple: (metric -> forecast values in original scale, metric -> engine used)
+        """
+        metric_models = loaded.metric_models if loaded is not None else {}
+        version = loaded.version if loaded is not None else BASELINE_VERSION
+        watermark = self.get_data_watermark()
+        today = datetime.now().date()
+        forecasts = {}
+        engines = {}
+        cache_keys = {}
+        
+        for metric in metrics:
+            if metric not in self.servable_metrics(loaded):
+                raise ValueError(f"No trained model for metric: {metric}")
+            
+            engines[metric] = self.choose_engine(loaded, metric)
+            
+            # Without a watermark we cannot tell if the data changed, so skip the cache
+            if watermark is None:
+                continue
+            
+            cache_keys[metric] = (
+                version,
+                engines[metric],
+                metric,
+                self._engine_horizon(engines[metric], metric_models.get(metric)),
+                watermark,
+                today
+            )
+            cached = self.forecast_cache.get(cache_keys[metric])
+            if cached is not None:
+                forecasts[metric] = cached
+        
+        missing = [metric for metric in metrics if metric not in forecasts]
+        if not missing:
+            return forecasts, engines
+        
+        # One fetch feeds every metric
+        started = time.perf_counter()
+        recent_data = self.get_recent_data(days_back=self._history_days(missing, engines))
+        self._observe_stage('db_load', started)
+        
+        # Submit every input sequence before waiting on any result
+        pending = {}
+        for metric in missing:
+            if engines[metric] == 'lstm':
+                input_sequence, scaler = self.prepare_prediction_input(recent_data, metric, metric_models)
+                future = metric_models[metric]['batcher'].submit(input_sequence)
+                pending[metric] = (future, scaler, time.perf_counter())
+            else:
+                forecasts[metric] = self._baseline_forecast(engines[metric], recent_data, metric)
+        
+        deadline = time.monotonic() + self.lstm_latency_budget if self.lstm_latency_budget else None
+        for metric, (future, scaler, submitted) in pending.items():
+            try:
+                timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+                prediction_scaled = future.result(timeout=timeout)
+                started = self._observe_stage('inference', submitted)
+                forecasts[metric] = scaler.inverse_transform(prediction_scaled)[0]
+                self._observe_stage('inverse_transform', started)
+            except Exception as e:
+                if self.fallback_engine is None:
+                    raise
+                
+                # Not cached: the next request tries the LSTM again
+                reason = 'over latency budget' if isinstance(e, FutureTimeoutError) else str(e)
+                logging.warning(f"LSTM forecast for {metric} failed ({reason}); using {self.fallback_engine}")
+                cache_keys.pop(metric, None)
+                engines[metric] = self.fallback_engine
+                forecasts[metric] = self._baseline_forecast(self.fallback_engine, recent_data, metric)
+                self.fallback_count += 1
+        
+        for metric in missing:
+            forecasts[metric].flags.writeable = False
+            self.engine_counts[engines[metric]] += 1
+            if metric in cache_keys:
+                self.forecast_cache.put(cache_keys[metric], forecasts[metric])
+        
+        return forecasts, engines
+    
+    def _engine_horizon(self, engine, entry):
+        if engine == 'lstm':
+            return entry['model'].prediction_horizon
+        return self.baselines[engine].prediction_horizon
+    
+    def _history_days(self, metrics, engines):
+        """Days of recent data covering the LSTM default and every baseline's input window"""
+        days = [30] + [self.baselines[engines[metric]].sequence_length for metric in metrics
+                       if engines[metric] != 'lstm']
+        if self.fallback_engine is not None:
+            days.append(self.baselines[self.fallback_engine].sequence_length)
+        return max(days)
+    
+    def _metric_history(self, recent_data, metric, days):
+        """
+        Gap-free daily values of a metric, oldest first, zero-padded to days
+        
+        Missing days count as zero, as in DataProcessor._fill_missing_dates.
+        """
+        series = recent_data[['date', metric]].copy()
+        series['date'] = pd.to_datetime(series['date'])
+        index = pd.date_range(end=series['date'].max(), periods=days, freq='D')
+        
+        values = series.groupby('date')[metric].sum().reindex(index, fill_value=0)
+        return values.to_numpy(dtype=np.float64)
+    
+    def _baseline_forecast(self, engine, recent_data, metric):
+        forecaster = self.baselines[engine]
+        started = time.perf_counter()
+        history = self._metric_history(recent_data, metric, forecaster.sequence_length)
+        started = self._observe_stage('features', started)
+        forecast = forecaster.predict(history[np.newaxis, :])[0]
+        self._observe_stage('inference', started)
+        return forecast
+    
+    def choose_engine(self, loaded, metric):
+        """
+        Engine that serves a metric for a version
+        
+        A configured engine is used as is; when it is the LSTM and the
+        version has no model for the metric, the fallback baseline serves
+        instead. In 'auto' mode the engine with the lowest backtest RMSE
+        over recent history is used (see select_engine). Selection runs in
+        the background; until it has finished (and while a stale choice is
+        refreshed) the current choice, or else the LSTM or fallback, serves.
+        
+        Args:
+            loaded (ModelVersion): Version serving the request (None for baselines only)
+            metric (str): Metric to forecast
+            
+        Returns:
+            str: Engine name
+        """
+        has_lstm = loaded is not None and metric in loaded.metric_models
+        
+        if self.engine == 'auto':
+            selection = self._current_selection(loaded, metric)
+            if selection is not None:
+                return selection['engine']
+            return 'lstm' if has_lstm else (self.fallback_engine or 'seasonal_naive')
+        if self.engine != 'lstm':
+            return self.engine
+        if has_lstm:
+            return 'lstm'
+        if self.fallback_engine is None:
+            raise ValueError(f"No trained model for metric: {metric}")
+        return self.fallback_engine
+    
+    def _selection_key(self, loaded, metric):
+        return (loaded.version if loaded is not None else BASELINE_VERSION, metric)
+    
+    def _current_selection(self, loaded, metric):
+        """The cached 'auto' choice (None before the first), scheduling a refresh when missing or stale"""
+        selection = self._engine_selections.get(self._selection_key(loaded, metric))
+        if selection is None or time.monotonic() - selection['_checked_at'] >= self.engine_selection_ttl:
+            self.schedule_engine_selection(loaded, metric)
+        return selection
+    
+    def schedule_engine_selection(self, loaded, metric):
+        """
+        Run select_engine for a version and metric on the background selection thread
+        
+        Returns:
+            bool: False if a selection for the same key is already queued or running
+        """
+        key = self._selection_key(loaded, metric)
+        with self._selection_lock:
+            if key in self._selection_pending:
+                return False
+            self._selection_pending.add(key)
+        
+        def run():
+            try:
+                self.select_engine(loaded, metric, refresh=True)
+            finally:
+                with self._selection_lock:
+                    self._selection_pending.discard(key)
+        
+        try:
+            self._selection_executor.submit(run)
+        except RuntimeError:
+            # Shut down with the service
+            with self._selection_lock:
+                self._selection_pending.discard(key)
+            return False
+        return True
+    
+    def select_engine(self, loaded, metric, refresh=False):
+        """
+        Pick the engine with the lowest backtest RMSE for a metric
+        
+        Every candidate (the version's LSTM, when it has a fitted scaler, and
+        each baseline) is backtested with Backtester over the same origins in
+        the last engine_selection_days days. With an LSTM, only origins after
+        its training_end_date are used, so it is never scored in sample. Choices are cached per version
+        and metric for engine_selection_ttl seconds. When the backtest cannot
+        run (no data, too little history) the LSTM is kept if available,
+        otherwise the fallback baseline is used.
+        
+        Args:
+            loaded (ModelVersion): Version serving the request (None for baselines only)
+            metric (str): Metric to forecast
+            refresh (bool): Ignore a cached choice
+            
+        Returns:
+            Dict: {'engine', 'scores', 'selected_at'} (plus 'error' when the backtest failed)
+        """
+        key = self._selection_key(loaded, metric)
+        now = time.monotonic()
+        
+        selection = self._engine_selections.get(key)
+        if not refresh and selection is not None and now - selection['_checked_at'] < self.engine_selection_ttl:
+            return selection
+        
+        # One backtest per key at a time; other versions and metrics are not blocked
+        with self._selection_lock:
+            key_lock = self._selection_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            selection = self._engine_selections.get(key)
+            if not refresh and selection is not None and now - selection['_checked_at'] < self.engine_selection_ttl:
+                return selection
+            
+            entry = loaded.metric_models.get(metric) if loaded is not None else None
+            try:
+                scores = self._backtest_engines(entry, metric)
+                engine = min(scores, key=lambda name: scores[name]['rmse'])
+                selection = {'engine': engine, 'scores': scores}
+            except Exception as e:
+                engine = 'lstm' if entry is not None else (self.fallback_engine or 'seasonal_naive')
+                logging.warning(f"Engine selection for {metric} failed ({str(e)}); using {engine}")
+                selection = {'engine': engine, 'scores': None, 'error': str(e)}
+            
+            selection.update(selected_at=datetime.now().isoformat(), _checked_at=time.monotonic())
+            self._engine_selections[key] = selection
+            logging.info(f"Forecast engine for {key[1]} ({key[0]}): {selection['engine']}")
+            return selection
+    
+    def _backtest_engines(self, entry, metric):
+        """
+        Backtest RMSE/MAE/MAPE of every candidate engine on recent history
+        
+        Returns:
+            Dict: engine -> overall backtest errors
+        """
+        # (predict_fn, scaler, sequence_length) per engine
+        candidates = {
+            name: (forecaster.predict, None, forecaster.sequence_length)
+            for name, forecaster in self.baselines.items()
+        }
+        recent_data = self.get_recent_data(days_back=self.engine_selection_days)
+        values = self._metric_history(recent_data, metric, self.engine_selection_days)
+        
+        horizon = 7
+        if entry is not None:
+            model = entry['model']
+            processor = entry['processor']
+            # Legacy models without a stored scaler are scaled on the data they see
+            scaler = processor.scaler if processor.is_fitted else DataProcessor().scaler.fit(values.reshape(-1, 1))
+            candidates['lstm'] = (model.predict, scaler, model.sequence_length)
+            horizon = model.prediction_horizon
+        
+        # Every engine forecasts from the same origins
+        start = max(sequence_length for _, _, sequence_length in candidates.values())
+        if entry is not None and entry.get('training_end_date') is not None:
+            # First position whose date is after the LSTM's training data
+            last_date = pd.to_datetime(recent_data['date']).max().normalize()
+            first_unseen = len(values) - (last_date - entry['training_end_date']).days
+            if first_unseen > len(values) - horizon:
+                raise ValueError(f"No backtest origins after the LSTM training cutoff ({entry['training_end_date'].date()})")
+            start = max(start, first_unseen)
+        scores = {}
+        for name, (predict_fn, scaler, sequence_length) in candidates.items():
+            result = Backtester(sequence_length, horizon).run(values, predict_fn, scaler=scaler, start=start)
+            scores[name] = dict(result['overall'], n_origins=result['n_origins'])
+        
+        return scores
+    
+    def get_engine_stats(self) -> Dict:
+        """Get the engine configuration, per-metric choices and usage counters"""
+        return {
+            'engine': self.engine,
+            'fallback_engine': self.fallback_engine,
+            'lstm_latency_budget_ms': self.lstm_latency_budget * 1000 if self.lstm_latency_budget else 0,
+            'forecasts_by_engine': dict(self.engine_counts),
+            'fallbacks': self.fallback_count,
+            'selections': {
+                f'{version}:{metric}': {key: value for key, value in selection.items() if not key.startswith('_')}
+                for (version, metric), selection in self._engine_selections.items()
+            }
+        }
+    
+    def invalidate_cache(self):
+        """Drop cached forecasts and force a fresh watermark check"""
+        self.forecast_cache.clear()
+        self._watermark_checked_at = None
+    
+    def get_cache_stats(self) -> Dict:
+        """Get forecast cache hit/miss counters"""
+        stats = self.forecast_cache.stats()
+        stats['watermark'] = [str(value) for value in self._watermark] if self._watermark else None
+        return stats
+    
+    def get_batcher_stats(self) -> Dict:
+        """Get batch-size and queue-wait histograms for model inference"""
+        if self.batcher is None:
+            return {'error': 'No model loaded'}
+        
+        return self.batcher.stats()
+    
+    def get_registry_stats(self) -> Dict:
+        """Get loaded and available model versions"""
+        return self.registry.stats()
+    
+    def close(self):
+        """Stop the model directory watcher and engine selection and release every loaded version"""
+        self._selection_executor.shutdown(wait=False, cancel_futures=True)
+        self.registry.close()
+    
+    def predict_page_visits(self, days_ahead=7, model_version=None) -> Dict:
         """
         Predict page visits for the next N days
         
         Args:
             days_ahead (int): Number of days to predict
+            model_version (str): Pinned model version (None for the active version)
             
         Returns:
             Dict: Prediction results with dates and values
         """
         try:
-            # Get recent data
-            recent_data = self.get_recent_data()
-            
-            # Prepare input sequence
-            input_sequence, scaler = self.prepare_prediction_input(recent_data)
-            
-            # Make prediction
-            prediction_scaled = self.model.predict(input_sequence)
-            prediction_original = scaler.inverse_transform(prediction_scaled)
-            
-            # Get prediction values
-            predictions = prediction_original[0][:days_ahead]
-            
-            # Generate dates for predictions
-            start_date = datetime.now().date() + timedelta(days=1)
-            prediction_dates = [start_date + timedelta(days=i) for i in range(days_ahead)]
-            
-            # Format results
-            results = {
-                'predictions': [
-                    {
-                        'date': date.strftime('%Y-%m-%d'),
-                        'predicted_visits': int(max(0, round(pred)))  # Ensure non-negative
-                    }
-                    for date, pred in zip(prediction_dates, predictions)
-                ],
-                'model_version': self.model_version,
-                'prediction_date': datetime.now().isoformat(),
-                'days_ahead': days_ahead,
-                'total_predicted_visits': int(sum(max(0, pred) for pred in predictions))
-            }
-            
-            return results
+            with self._acquire(model_version) as loaded:
+                # Slice the cached full-horizon forecast
+                forecasts, engines = self._get_forecasts(loaded, ['page_visits'])
+                started = time.perf_counter()
+                result = self._format_page_visits(
+                    forecasts['page_visits'][:days_ahead], days_ahead, self._version_label(loaded),
+                    engines['page_visits']
+                )
+                self._observe_stage('response', started)
+                return result
             
         except Exception as e:
             logging.error(f"Prediction failed: {str(e)}")
             raise
     
-    def predict_multiple_metrics(self, metrics: List[str], days_ahead=7) -> Dict:
+    def _version_label(self, loaded):
+        return loaded.version if loaded is not None else BASELINE_VERSION
+    
+    def _prediction_dates(self, days_ahead):
+        start_date = datetime.now().date() + timedelta(days=1)
+        return [start_date + timedelta(days=i) for i in range(days_ahead)]
+    
+    def _format_page_visits(self, predictions, days_ahead, model_version, engine='lstm'):
+        """Format a page_visits forecast slice"""
+        prediction_dates = self._prediction_dates(days_ahead)
+        
+        return {
+            'predictions': [
+                {
+                    'date': date.strftime('%Y-%m-%d'),
+                    'predicted_visits': int(max(0, round(pred)))  # Ensure non-negative
+                }
+                for date, pred in zip(prediction_dates, predictions)
+            ],
+            'model_version': model_version,
+            'engine': engine,
+            'prediction_date': datetime.now().isoformat(),
+            'days_ahead': days_ahead,
+            'total_predicted_visits': int(sum(max(0, pred) for pred in predictions))
+        }
+    
+    def _format_metric(self, metric, predictions, days_ahead, model_version, engine='lstm'):
+        """Format a forecast slice for any other daily metric"""
+        prediction_dates = self._prediction_dates(days_ahead)
+        
+        if metric in COUNT_METRICS:
+            values = [int(max(0, round(pred))) for pred in predictions]
+        else:
+            values = [float(max(0.0, pred)) for pred in predictions]
+        
+        return {
+            'metric': metric,
+            'predictions': [
+                {'date': date.strftime('%Y-%m-%d'), 'predicted_value': value}
+                for date, value in zip(prediction_dates, values)
+            ],
+            'model_version': model_version,
+            'engine': engine,
+            'prediction_date': datetime.now().isoformat(),
+            'days_ahead': days_ahead
+        }
+    
+    def predict_multiple_metrics(self, metrics: List[str], days_ahead=7, model_version=None) -> Dict:
         """
-        Predict multiple metrics (placeholder for future expansion)
+        Predict multiple metrics from one data fetch
         
         Args:
             metrics (List[str]): List of metrics to predict
             days_ahead (int): Number of days to predict
+            model_version (str): Pinned model version (None for the active version)
             
         Returns:
             Dict: Predictions for multiple metrics
         """
-        results = {}
+        metrics = list(dict.fromkeys(metrics))
         
+        with self._acquire(model_version) as loaded:
+            available = [metric for metric in metrics if metric in self.servable_metrics(loaded)]
+            version = self._version_label(loaded)
+            
+            try:
+                forecasts, engines = self._get_forecasts(loaded, available) if available else ({}, {})
+            except Exception as e:
+                logging.error(f"Multiple metrics prediction failed: {str(e)}")
+                raise
+        
+        results = {}
         for metric in metrics:
-            if metric == 'page_visits':
-                results[metric] = self.predict_page_visits(days_ahead)
+            if metric in forecasts:
+                predictions = forecasts[metric][:days_ahead]
+                if metric == 'page_visits':
+                    results[metric] = self._format_page_visits(predictions, days_ahead, version, engines[metric])
+                else:
+                    results[metric] = self._format_metric(metric, predictions, days_ahead, version, engines[metric])
+            elif metric in DAILY_METRICS:
+                results[metric] = {'error': f'No trained model for {metric}'}
             else:
-                # Placeholder for other metrics
-                results[metric] = {
-                    'error': f'Prediction for {metric} not implemented yet'
-                }
+                results[metric] = {'error': f'Unsupported metric: {metric}'}
         
         return results
     
+    def predict_sites(self, site_ids: List[str], days_ahead=7, metric='page_visits', model_version=None) -> Dict:
+        """
+        Forecast many sites in one pass with the global multi-site model
+        
+        One query loads the recent history of every requested site, the
+        windows are scaled per site and run through the model in batches of
+        site_batch_size. Without a multi-site model for the metric (or if it
+        fails) the fallback baseline forecasts every site in one vectorized call.
+        
+        Args:
+            site_ids (List[str]): Sites to forecast
+            days_ahead (int): Number of days to predict
+            metric (str): Metric to forecast
+            model_version (str): Pinned model version (None for the active version)
+            
+        Returns:
+            Dict: Shared prediction dates and per-site forecast values
+        """
+        if metric not in DAILY_METRICS:
+            raise ValueError(f"Unsupported metric: {metric}")
+        
+        site_ids = list(dict.fromkeys(str(site_id) for site_id in site_ids))
+        
+        with self._acquire(model_version) as loaded:
+            entry = loaded.site_models.get(metric) if loaded is not None else None
+            if entry is None and self.fallback_engine is None:
+                raise ValueError(f"No multi-site model for metric: {metric}")
+            
+            history_days = [30]
+            if entry is not None:
+                history_days.append(entry['model'].sequence_length)
+            if self.fallback_engine is not None:
+                history_days.append(self.baselines[self.fallback_engine].sequence_length)
+            
+            end_date = datetime.now().date()
+            df = self.data_loader.load_site_metrics(
+                start_date=end_date - timedelta(days=max(history_days)),
+                end_date=end_date,
+                site_ids=site_ids,
+                metrics=[metric]
+            )
+            
+            engine = 'lstm' if entry is not None else self.fallback_engine
+            if df.empty:
+                found, forecasts, missing = [], np.zeros((0, days_ahead)), site_ids
+            elif entry is not None:
+                try:
+                    found, forecasts, missing = self._predict_site_batch(entry, df, site_ids, metric)
+                except Exception as e:
+                    if self.fallback_engine is None:
+                        raise
+                    logging.warning(f"Multi-site forecast for {metric} failed ({str(e)}); using {self.fallback_engine}")
+                    engine = self.fallback_engine
+                    self.fallback_count += 1
+            
+            if engine != 'lstm' and not df.empty:
+                forecaster = self.baselines[engine]
+                found, history, missing = MultiSeriesProcessor.panel_history(
+                    df, site_ids, forecaster.sequence_length, metric
+                )
+                forecasts = forecaster.predict(history)
+            
+            version = self._version_label(loaded)
+        
+        forecasts = np.maximum(np.asarray(forecasts)[:, :days_ahead], 0)
+        if metric in COUNT_METRICS:
+            forecasts = np.round(forecasts).astype(np.int64)
+        
+        return {
+            'metric': metric,
+            'model_version': version,
+            'engine': engine,
+            'prediction_date': datetime.now().isoformat(),
+            'days_ahead': days_ahead,
+            'dates': [date.strftime('%Y-%m-%d') for date in self._prediction_dates(days_ahead)],
+            'forecasts': dict(zip(found, forecasts.tolist())),
+            'missing_sites': missing
+        }
+    
+    def _predict_site_batch(self, entry, df, site_ids, metric):
+        """
+        Run the multi-site model over every site with data
+        
+        Returns:
+            tuple: (found site IDs, forecasts (n_found, horizon) in original scale, missing site IDs)
+        """
+        model = entry['model']
+        processor = entry['processor']
+        found, X, data_min, data_range, missing = processor.create_prediction_batch(df, site_ids, metric)
+        
+        scaled = np.empty((len(found), model.prediction_horizon))
+        for offset in range(0, len(found), self.site_batch_size):
+            batch = X[offset:offset + self.site_batch_size]
+            scaled[offset:offset + len(batch)] = np.asarray(model.predict(batch)).reshape(len(batch), -1)
+        
+        return found, processor.scaler.inverse_transform(scaled, data_min, data_range), missing
+    
+    def predict_visits(self, steps_ahead=24, granularity='1h', model_version=None) -> Dict:
+        """
+        Forecast visits per hourly or N-minute bucket, starting with the current bucket
+        
+        Only complete buckets are used as input. Without a visits model for
+        the granularity (or if it fails) the fallback baseline forecasts
+        with one day of buckets as its season.
+        
+        Args:
+            steps_ahead (int): Number of buckets to predict (at most one day of buckets)
+            granularity (str): Bucket length, e.g. '1h' or '15min'
+            model_version (str): Pinned model version (None for the active version)
+            
+        Returns:
+            Dict: Prediction results with bucket start timestamps and values
+        """
+        granularity = granularity_label(granularity)
+        if granularity == DAILY:
+            raise ValueError("Daily forecasts are served by /predict")
+        if not 1 <= steps_ahead <= buckets_per_day(granularity):
+            raise ValueError(f"steps_ahead must be between 1 and {buckets_per_day(granularity)} for {granularity}")
+        
+        step = pd.Timedelta(seconds=parse_granularity(granularity))
+        
+        with self._acquire(model_version) as loaded:
+            entry = loaded.bucket_models.get(granularity) if loaded is not None else None
+            if entry is None and self.fallback_engine is None:
+                raise ValueError(f"No {granularity} visits model")
+            
+            if self.engine in BASELINE_FORECASTERS:
+                engine = self.engine
+            else:
+                engine = 'lstm' if entry is not None else self.fallback_engine
+            
+            timezone = entry['timezone'] if entry is not None else self.data_loader.forecast_timezone
+            start_time = current_bucket_start(granularity, timezone)
+            version = self._version_label(loaded)
+            
+            # Complete buckets only change when a new bucket starts
+            cache_key = ('visits', version, granularity, engine, timezone, start_time.value)
+            forecast = self.forecast_cache.get(cache_key)
+            if forecast is None:
+                forecast, engine = self._forecast_buckets(entry, engine, granularity, timezone, start_time)
+                if engine == cache_key[3]:
+                    forecast.flags.writeable = False
+                    self.forecast_cache.put(cache_key, forecast)
+            self.engine_counts[engine] += 1
+        
+        predictions = np.maximum(forecast[:steps_ahead], 0)
+        timestamps = pd.date_range(start=start_time, periods=len(predictions), freq=step)
+        
+        return {
+            'predictions': [
+                {'timestamp': timestamp.isoformat(), 'predicted_visits': int(round(pred))}
+                for timestamp, pred in zip(timestamps, predictions)
+            ],
+            'granularity': granularity,
+            'timezone': timezone,
+            'model_version': version,
+            'engine': engine,
+            'prediction_date': datetime.now().isoformat(),
+            'steps_ahead': steps_ahead,
+            'total_predicted_visits': int(predictions.sum())
+        }
+    
+    def _forecast_buckets(self, entry, engine, granularity, timezone, start_time):
+        """
+        Full-horizon bucket forecast from the buckets before start_time
+        
+        Returns:
+            tuple: (forecast values in original scale, engine that produced them)
+        """
+        baselines = self._get_bucket_baselines(granularity)
+        history_steps = [baselines[name].sequence_length for name in (engine, self.fallback_engine)
+                         if name in baselines]
+        if entry is not None:
+            history_steps.append(entry['model'].sequence_length)
+        
+        step = pd.Timedelta(seconds=parse_granularity(granularity))
+        df = self.data_loader.load_visit_buckets(
+            start_time - max(history_steps) * step, start_time, granularity=granularity, timezone=timezone
+        )
+        if df.empty:
+            raise ValueError("No recent page visits available for prediction")
+        
+        if engine == 'lstm':
+            try:
+                processor = entry['processor']
+                X = processor.create_prediction_sequence(df, target_column='visits')
+                scaled = np.asarray(entry['model'].predict(X)).reshape(-1, 1)
+                return processor.inverse_transform(scaled).ravel(), engine
+            except Exception as e:
+                if self.fallback_engine is None:
+                    raise
+                logging.warning(f"{granularity} visits forecast failed ({str(e)}); using {self.fallback_engine}")
+                engine = self.fallback_engine
+                self.fallback_count += 1
+        
+        forecaster = baselines[engine]
+        history = df['visits'].to_numpy(dtype=np.float64)[-forecaster.sequence_length:]
+        return forecaster.predict(history[np.newaxis, :])[0], engine
+    
+    def _get_bucket_baselines(self, granularity):
+        """Baselines with a season (or window) of one day of buckets, built once per granularity"""
+        with self._selection_lock:
+            baselines = self._bucket_baselines.get(granularity)
+            if baselines is None:
+                per_day = buckets_per_day(granularity)
+                baselines = {
+                    'seasonal_naive': SeasonalNaiveForecaster(season=per_day, prediction_horizon=per_day),
+                    'moving_average': MovingAverageForecaster(window=per_day, prediction_horizon=per_day),
+                    # Eight days of hourly history; finer buckets use two days to keep
+                    # the precomputed forecast matrix small
+                    'holt_winters': HoltWintersForecaster(
+                        season=per_day, seasons=max(2, 192 // per_day), prediction_horizon=per_day
+                    )
+                }
+                self._bucket_baselines[granularity] = baselines
+            return baselines
+    
     def get_model_info(self) -> Dict:
-        """Get information about the loaded model"""
-        if self.model is None:
+        """Get information about the active model version"""
+        active = self.registry.active
+        if active is None:
             return {'error': 'No model loaded'}
         
+        model = active.metric_models['page_visits']['model']
         return {
-            'model_version': self.model_version,
-            'sequence_length': self.model.sequence_length,
-            'prediction_horizon': self.model.prediction_horizon,
-            'is_trained': self.model.is_trained,
-            'total_parameters': self.model.model.count_params() if self.model.model else 0
+            'model_version': active.version,
+            'sequence_length': model.sequence_length,
+            'prediction_horizon': model.prediction_horizon,
+            'is_trained': model.is_trained,
+            'total_parameters': self._count_params(model),
+            'metrics': list(active.metric_models),
+            'site_metrics': list(active.site_models),
+            'visit_granularities': list(active.bucket_models),
+            'runtime': 'numpy' if isinstance(model, NumpyLSTMModel) else 'keras'
         }
     
+    def _count_params(self, model):
+        if isinstance(model, NumpyLSTMModel):
+            return model.count_params()
+        return model.model.count_params() if model.model else 0
+    
     def get_prediction_confidence(self, predictions: List[float]) -> Dict:
         """
         Calculate confidence intervals for predictions (simplified)
@@ -240,7 +1387,7 @@ class PredictionService:
             return False
         if days_ahead > 30:  # Limit to 30 days
             return False
-        if self.model is None:
+        if self.model is None and self.fallback_engine is None:
             return False
         
         return True 
\ No newline at end of file
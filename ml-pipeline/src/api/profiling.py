@@ -0,0 +1,309 @@
+import os
+import io
+import time
+import hmac
+import heapq
+import pstats
+import cProfile
+import itertools
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# Header carrying the admin token that turns on profiling for one request
+PROFILE_HEADER = 'x-profile-token'
+
+# Admin endpoints take the same header for authentication and are never profiled
+DEBUG_PATH_PREFIX = '/debug/'
+
+# Trace of the request being handled; set by ProfilingMiddleware and copied to
+# worker threads by BoundedExecutor
+current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class RequestTrace:
+    __slots__ = ('method', 'path', 'started_at', 'stages', 'profile', 'profile_id')
+
+    def __init__(self, method, path):
+        """
+        Per-request record of stage timings and whether to profile
+
+        Args:
+            method (str): HTTP method
+            path (str): Request path
+        """
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.stages = {}
+        self.profile = False
+        self.profile_id = None
+
+    def add_stage(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+def record_stage(stage, seconds):
+    """Add stage time to the current request's trace (no-op outside a request)"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add_stage(stage, seconds)
+
+
+class SlowRequestLog:
+    def __init__(self, size=20, window_seconds=3600):
+        """
+        The slowest requests of a rolling time window
+
+        A min-heap of at most size entries. A request faster than the
+        fastest kept entry costs one comparison; entries older than
+        window_seconds are dropped so the log tracks recent behaviour.
+
+        Args:
+            size (int): Requests kept
+            window_seconds (float): Age after which entries are dropped
+        """
+        self.size = size
+        self.window_seconds = window_seconds
+        self._heap = []
+        self._oldest = 0.0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, duration, entry):
+        """
+        Offer a finished request
+
+        Args:
+            duration (float): Request seconds
+            entry (dict): Request details
+        """
+        if self.size <= 0:
+            return
+        now = time.monotonic()
+
+        # Fast path, without the lock: the log is full, nothing in it has
+        # expired and this request is faster than every kept one
+        heap = self._heap
+        if len(heap) >= self.size and duration <= heap[0][0] and now - self._oldest <= self.window_seconds:
+            return
+
+        with self._lock:
+            self._expire(now)
+            item = (duration, next(self._sequence), now, entry)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+            else:
+                return
+            self._oldest = min(added for _, _, added, _ in self._heap)
+
+    def _expire(self, now):
+        if self._heap and now - self._oldest > self.window_seconds:
+            self._heap = [item for item in self._heap if now - item[2] <= self.window_seconds]
+            heapq.heapify(self._heap)
+            self._oldest = min((added for _, _, added, _ in self._heap), default=now)
+
+    def entries(self):
+        """
+        Returns:
+            list: Kept requests, slowest first
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return [entry for _, _, _, entry in sorted(self._heap, key=lambda item: -item[0])]
+
+
+class RequestProfiler:
+    def __init__(self, token=None, max_per_minute=6, history=20, limit=40, profile_dir=None,
+                 slow_log_size=20, slow_log_window=3600):
+        """
+        Opt-in cProfile runs for single requests, plus the slow-request log
+
+        A request whose profile header matches token is run under cProfile
+        on its worker thread (deterministic, so the call counts are exact).
+        Reports are kept in memory, and also dumped as .prof files when
+        profile_dir is set.
+
+        Args:
+            token (str): Admin token (None or empty disables profiling)
+            max_per_minute (int): Profiled requests allowed per rolling minute
+            history (int): Profile reports kept in memory
+            limit (int): Functions listed per report
+            profile_dir (str): Directory for raw .prof dumps (None to skip)
+            slow_log_size (int): Slowest requests kept (see SlowRequestLog)
+            slow_log_window (float): Seconds a slow request stays in the log
+        """
+        self.token = token or None
+        self.max_per_minute = max_per_minute
+        self.history = history
+        self.limit = limit
+        self.profile_dir = profile_dir
+        self.slow_requests = SlowRequestLog(slow_log_size, slow_log_window)
+
+        self._recent = deque()
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.rate_limited = 0
+
+    @property
+    def enabled(self):
+        return self.token is not None
+
+    def authorized(self, token):
+        """Constant-time check of an admin token"""
+        return self.enabled and token is not None and hmac.compare_digest(token, self.token)
+
+    def admit(self):
+        """
+        Take a slot from the rate limit
+
+        Returns:
+            bool: False when max_per_minute profiles ran in the last minute
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.max_per_minute:
+                self.rate_limited += 1
+                return False
+            self._recent.append(now)
+            return True
+
+    def run(self, func, *args, **kwargs):
+        """
+        Call func, under cProfile when the current request asked for it
+
+        Used as the BoundedExecutor wrapper, so it runs on the worker thread
+        that does the work.
+        """
+        trace = current_trace.get()
+        if trace is None or not trace.profile:
+            return func(*args, **kwargs)
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            trace.profile_id = self._store(trace, profiler)
+
+    def _store(self, trace, profiler):
+        profile_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{next(self._ids)}"
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(self.limit)
+        stats.print_callers(min(self.limit, 15))
+
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, f'{profile_id}.prof'))
+
+        with self._lock:
+            self._profiles[profile_id] = {
+                'id': profile_id,
+                'method': trace.method,
+                'path': trace.path,
+                'created_at': datetime.now().isoformat(),
+                'total_seconds': stats.total_tt,
+                'report': stream.getvalue()
+            }
+            while len(self._profiles) > self.history:
+                self._profiles.popitem(last=False)
+
+        return profile_id
+
+    def get_profile(self, profile_id):
+        """
+        Raises:
+            KeyError: If the profile is unknown or was dropped from the history
+        """
+        with self._lock:
+            if profile_id not in self._profiles:
+                raise KeyError(f"Profile not found: {profile_id}")
+            return self._profiles[profile_id]
+
+    def list_profiles(self):
+        with self._lock:
+            return [
+                {key: value for key, value in profile.items() if key != 'report'}
+                for profile in reversed(self._profiles.values())
+            ]
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, profiler):
+        """
+        ASGI middleware that traces every HTTP request
+
+        Sets current_trace for the request, turns on profiling when the
+        profile header carries the admin token and the rate limit allows,
+        and offers the finished request to the slow-request log. Profiled
+        responses carry X-Profile-Id (or X-Profile-Status: rate-limited).
+
+        Args:
+            app: ASGI application
+            profiler (RequestProfiler): Profiler and slow-request log
+        """
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope['method'], scope['path'])
+        status = [500]
+        rate_limited = False
+
+        token = None
+        for name, value in scope.get('headers', ()):
+            if name == PROFILE_HEADER.encode():
+                token = value.decode('latin-1')
+                break
+
+        if token is not None:
+            if not self.profiler.authorized(token):
+                await send({'type': 'http.response.start', 'status': 403,
+                            'headers': [(b'content-type', b'application/json')]})
+                await send({'type': 'http.response.body', 'body': b'{"detail":"Invalid profiling token"}'})
+                return
+            if not scope['path'].startswith(DEBUG_PATH_PREFIX):
+                trace.profile = self.profiler.admit()
+                rate_limited = not trace.profile
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+                if trace.profile_id is not None:
+                    message['headers'] = list(message.get('headers', ())) + [
+                        (b'x-profile-id', trace.profile_id.encode())
+                    ]
+                elif rate_limited:
+                    message['headers'] = list(message.get('headers', ())) + [
+                        (b'x-profile-status', b'rate-limited')
+                    ]
+            await send(message)
+
+        started = time.perf_counter()
+        reset = current_trace.set(trace)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_trace.reset(reset)
+            duration = time.perf_counter() - started
+            self.profiler.slow_requests.add(duration, {
+                'method': trace.method,
+                'path': trace.path,
+                'query': scope.get('query_string', b'').decode('latin-1'),
+                'status': status[0],
+                'started_at': datetime.fromtimestamp(trace.started_at).isoformat(),
+                'duration_ms': duration * 1000,
+                'stages_ms': {stage: seconds * 1000 for stage, seconds in trace.stages.items()},
+                'profile_id': trace.profile_id
+            })
@@ -0,0 +1,422 @@
+import os
+import time
+import uuid
+import queue
+import shutil
+import logging
+import threading
+import multiprocessing
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+
+# Promoted files, metadata last: the model registry only sees a version once both
+# lstm_model_{version}.h5 and metadata_{version}.pkl are in place
+PROMOTED_FILES = ('lstm_model_{}.h5', 'lstm_weights_{}.npz', 'training_results_{}.pkl', 'metadata_{}.pkl')
+
+FINISHED_STATES = ('succeeded', 'failed', 'cancelled')
+
+
+class TrainingJobLimitError(Exception):
+    """Raised when a training job is submitted while the job limit is reached"""
+
+
+def run_training_job(params, staging_dir, events):
+    """
+    Entry point of the training process
+
+    Runs ModelTrainer.run_training_pipeline and streams progress events
+    (dicts) to the parent through events.
+
+    Args:
+        params (dict): Training parameters from TrainingJobManager.submit
+        staging_dir (str): Directory the model is saved to
+        events (multiprocessing.Queue): Progress and result events
+    """
+    try:
+        from training.train_model import ModelTrainer
+
+        trainer = ModelTrainer(
+            sequence_length=params['sequence_length'],
+            prediction_horizon=params['prediction_horizon'],
+            model_version=params['model_version'],
+            progress_callback=lambda **info: events.put({'type': 'progress', **info})
+        )
+        result = trainer.run_training_pipeline(
+            days_back=params['days_back'],
+            epochs=params['epochs'],
+            batch_size=params['batch_size'],
+            model_dir=staging_dir
+        )
+        done = {
+            'type': 'done',
+            'evaluation_metrics': {key: float(value) for key, value in result['evaluation_metrics'].items()}
+        }
+
+        if params['promote'] and params['compare_version']:
+            events.put({'type': 'progress', 'stage': 'comparing'})
+            try:
+                done['holdout_metrics'] = score_against_active(params, staging_dir)
+            except Exception as e:
+                done['comparison_error'] = str(e)
+        events.put(done)
+    except Exception as e:
+        events.put({'type': 'error', 'error': str(e)})
+        raise
+
+
+def score_against_active(params, staging_dir):
+    """
+    Backtest the new model and the version it would replace on the same recent days
+
+    The last holdout_days days fall in the new model's test split (the
+    newest 20% of its windows), so neither model is scored on data it was
+    fitted to, as long as the active version was trained earlier.
+
+    Returns:
+        Dict: {'version', 'holdout_days', 'scores': {'candidate': ..., 'current': ...}}
+    """
+    from config.database import DataLoader
+    from training.backtest import holdout_scores, load_model
+
+    models = {
+        'candidate': load_model(staging_dir, params['model_version']),
+        'current': load_model(params['model_dir'], params['compare_version'])
+    }
+    target_column = models['candidate'][1].get('target_column', 'page_visits')
+
+    end_date = datetime.now().date()
+    history_days = params['holdout_days'] + max(model.sequence_length for model, _ in models.values())
+    df = DataLoader().load_daily_metrics(start_date=end_date - timedelta(days=history_days), end_date=end_date)
+    if df.empty:
+        raise ValueError("No recent data to compare the models on")
+
+    return {
+        'version': params['compare_version'],
+        'holdout_days': params['holdout_days'],
+        'scores': holdout_scores(models, df, target_column, params['holdout_days'])
+    }
+
+
+class TrainingJob:
+    def __init__(self, job_id, params):
+        self.job_id = job_id
+        self.params = params
+        self.status = 'queued'
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = {'stage': 'queued'}
+        self.evaluation_metrics = None
+        self.holdout_metrics = None
+        self.promoted = False
+        self.promotion_reason = None
+        self.error = None
+
+        self.process = None
+        self.events = None
+        self._training_started = None
+        self._comparison_error = None
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'params': self.params,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': dict(self.progress),
+            'evaluation_metrics': self.evaluation_metrics,
+            'holdout_metrics': self.holdout_metrics,
+            'promoted': self.promoted,
+            'promotion_reason': self.promotion_reason,
+            'error': self.error
+        }
+
+
+class TrainingJobManager:
+    def __init__(self, model_dir='models', max_jobs=1, history_size=20,
+                 on_promote=None, active_version=None, target=run_training_job):
+        """
+        Run training pipelines in separate processes
+
+        Training never shares the serving process's GIL or event loop. Each
+        job trains into its own staging directory under model_dir/jobs and
+        is only moved into model_dir when promoted, so the model registry
+        never sees a half-written or unwanted version.
+
+        Args:
+            model_dir (str): Directory serving models are loaded from
+            max_jobs (int): Maximum concurrently running jobs
+            history_size (int): Finished jobs kept for status queries
+            on_promote (callable): Called with the version after its files are promoted
+            active_version (callable): Returns the version currently serving, scored against
+                new models on the same recent holdout before promotion
+            target (callable): Process entry point (params, staging_dir, events)
+        """
+        self.model_dir = model_dir
+        self.max_jobs = max_jobs
+        self.history_size = history_size
+        self.on_promote = on_promote
+        self.active_version = active_version
+        self.target = target
+
+        # Spawned (not forked) children do not inherit serving threads or TF state
+        self._context = multiprocessing.get_context('spawn')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def staging_dir(self, job_id):
+        return os.path.join(self.model_dir, 'jobs', job_id)
+
+    def submit(self, model_version=None, sequence_length=7, prediction_horizon=7,
+               days_back=60, epochs=100, batch_size=32, promote=False, holdout_days=None):
+        """
+        Start a training job
+
+        Args:
+            model_version (str): Version to train (default: timestamp-based)
+            sequence_length (int): Input sequence length
+            prediction_horizon (int): Number of days to predict
+            days_back (int): Days of training data
+            epochs (int): Maximum training epochs
+            batch_size (int): Training batch size
+            promote (bool): Promote the model if it beats the active version
+            holdout_days (int): Most recent days both models are backtested on before
+                promoting; at most, and by default, days_back // 5 (the new model's test split)
+
+        Returns:
+            Dict: Job status
+        """
+        model_version = model_version or datetime.now().strftime('v%Y%m%d%H%M%S')
+        if os.path.exists(os.path.join(self.model_dir, f'lstm_model_{model_version}.h5')):
+            raise ValueError(f"Model version already exists: {model_version}")
+        holdout_days = holdout_days or days_back // 5
+        if promote and not prediction_horizon <= holdout_days <= days_back // 5:
+            raise ValueError(
+                f"holdout_days must be between prediction_horizon ({prediction_horizon}) "
+                f"and days_back // 5 ({days_back // 5})"
+            )
+
+        params = {
+            'model_version': model_version,
+            'sequence_length': sequence_length,
+            'prediction_horizon': prediction_horizon,
+            'days_back': days_back,
+            'epochs': epochs,
+            'batch_size': batch_size,
+            'promote': promote,
+            'holdout_days': holdout_days,
+            'model_dir': self.model_dir,
+            'compare_version': self.active_version() if promote and self.active_version is not None else None
+        }
+
+        with self._lock:
+            running = [job for job in self._jobs.values() if job.status not in FINISHED_STATES]
+            if len(running) >= self.max_jobs:
+                raise TrainingJobLimitError(f"{len(running)} training job(s) already running")
+
+            job = TrainingJob(uuid.uuid4().hex[:12], params)
+            self._jobs[job.job_id] = job
+            self._trim_history()
+
+            staging_dir = self.staging_dir(job.job_id)
+            os.makedirs(staging_dir, exist_ok=True)
+
+            job.events = self._context.Queue()
+            job.process = self._context.Process(
+                target=self.target,
+                args=(params, staging_dir, job.events),
+                name=f'training-job-{job.job_id}',
+                daemon=True
+            )
+            job.process.start()
+            job.status = 'running'
+            job.started_at = datetime.now().isoformat()
+            job.progress = {'stage': 'starting'}
+
+        threading.Thread(
+            target=self._monitor, args=(job,), name=f'training-monitor-{job.job_id}', daemon=True
+        ).start()
+
+        logging.info(f"Started training job {job.job_id} for version {model_version}")
+        return job.to_dict()
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.history_size)]:
+            # An unpromoted model can no longer be promoted once its job is forgotten
+            shutil.rmtree(self.staging_dir(job_id), ignore_errors=True)
+            del self._jobs[job_id]
+
+    def _monitor(self, job):
+        """Apply the job's events until its process exits"""
+        done = None
+        while True:
+            try:
+                event = job.events.get(timeout=0.5)
+            except queue.Empty:
+                if not job.process.is_alive():
+                    break
+                continue
+
+            if event['type'] == 'progress':
+                self._update_progress(job, event)
+            elif event['type'] == 'done':
+                done = event
+                job.holdout_metrics = event.get('holdout_metrics')
+                job._comparison_error = event.get('comparison_error')
+            else:
+                job.error = event['error']
+
+        job.process.join()
+
+        if job.status == 'cancelled':
+            pass
+        elif done is not None:
+            job.evaluation_metrics = done['evaluation_metrics']
+            job.progress = {'stage': 'done'}
+            if job.params['promote']:
+                self._maybe_promote(job)
+            job.status = 'succeeded'
+        else:
+            job.status = 'failed'
+            job.error = job.error or f"Training process exited with code {job.process.exitcode}"
+            shutil.rmtree(self.staging_dir(job.job_id), ignore_errors=True)
+
+        job.finished_at = datetime.now().isoformat()
+        job.events.close()
+        logging.info(f"Training job {job.job_id} {job.status}")
+
+    def _update_progress(self, job, event):
+        progress = {key: value for key, value in event.items() if key != 'type'}
+
+        if progress.get('stage') == 'training':
+            now = time.monotonic()
+            if job._training_started is None:
+                job._training_started = now
+
+            epoch, epochs = progress.get('epoch'), progress.get('epochs')
+            if epoch and epochs:
+                # Early stopping can finish sooner; this is an upper bound
+                seconds_per_epoch = (now - job._training_started) / epoch
+                progress['eta_seconds'] = seconds_per_epoch * (epochs - epoch)
+
+        job.progress = progress
+
+    def _maybe_promote(self, job):
+        """Promote the job's model if it beats the active version on the same recent holdout"""
+        version = job.params['model_version']
+        active = self.active_version() if self.active_version is not None else None
+
+        if active is None:
+            reason = "No active model"
+        elif active != job.params['compare_version']:
+            job.promotion_reason = f"Active version changed to {active} during training; not promoted"
+            return
+        elif job.holdout_metrics is None:
+            job.promotion_reason = f"Holdout comparison failed: {job._comparison_error}"
+            return
+        else:
+            candidate = job.holdout_metrics['scores']['candidate']['rmse']
+            current = job.holdout_metrics['scores']['current']['rmse']
+            days = job.holdout_metrics['holdout_days']
+            if candidate >= current:
+                job.promotion_reason = (
+                    f"Holdout RMSE {candidate:.4f} does not beat {active} ({current:.4f}) over the last {days} days"
+                )
+                return
+            reason = f"Holdout RMSE {candidate:.4f} beats {active} ({current:.4f}) over the last {days} days"
+
+        try:
+            self._promote(job)
+            job.promotion_reason = reason
+        except Exception as e:
+            job.promotion_reason = f"Promotion failed: {str(e)}"
+            logging.error(f"Failed to promote {version}: {str(e)}")
+
+    def promote(self, job_id):
+        """
+        Move a succeeded job's model into model_dir and activate it
+
+        For jobs submitted without promote, or whose model did not beat the
+        active version on the holdout.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Dict: Job status
+        """
+        with self._lock:
+            job = self.get(job_id)
+            if job.status != 'succeeded':
+                raise ValueError(f"Training job {job_id} is {job.status}; only succeeded jobs can be promoted")
+            if job.promoted:
+                raise ValueError(f"Training job {job_id} is already promoted")
+
+            self._promote(job)
+            job.promotion_reason = "Promoted manually"
+            return job.to_dict()
+
+    def _promote(self, job):
+        job_id = job.job_id
+        version = job.params['model_version']
+        staging_dir = self.staging_dir(job_id)
+
+        for pattern in PROMOTED_FILES:
+            source = os.path.join(staging_dir, pattern.format(version))
+            if os.path.exists(source):
+                os.replace(source, os.path.join(self.model_dir, pattern.format(version)))
+
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        job.promoted = True
+
+        if self.on_promote is not None:
+            self.on_promote(version)
+
+        logging.info(f"Promoted model version {version} from job {job_id}")
+
+    def cancel(self, job_id):
+        """
+        Stop a running job
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Dict: Job status
+        """
+        job = self.get(job_id)
+        if job.status in FINISHED_STATES:
+            return job.to_dict()
+
+        job.status = 'cancelled'
+        job.process.terminate()
+        job.process.join(timeout=10)
+        shutil.rmtree(self.staging_dir(job_id), ignore_errors=True)
+
+        logging.info(f"Cancelled training job {job_id}")
+        return job.to_dict()
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown training job: {job_id}")
+        return job
+
+    def status(self, job_id):
+        """Get the status of one job"""
+        return self.get(job_id).to_dict()
+
+    def list_jobs(self):
+        """Get the status of every tracked job, newest last"""
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def shutdown(self):
+        """Terminate running jobs"""
+        for job in list(self._jobs.values()):
+            if job.status not in FINISHED_STATES:
+                self.cancel(job.job_id)
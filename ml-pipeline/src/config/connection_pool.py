@@ -0,0 +1,224 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the pool timeout"""
+
+
+class ConnectionPool:
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0,
+                 max_uses=1000, idle_timeout=300.0, health_check=True):
+        """
+        Bounded, thread-safe pool of psycopg2 connections
+
+        Connections are opened lazily, health-checked on checkout and recycled
+        after max_uses checkouts or idle_timeout seconds without use.
+
+        Args:
+            connect (callable): Function returning a new psycopg2 connection
+            min_size (int): Connections kept open once the pool is in use
+            max_size (int): Maximum number of open connections
+            timeout (float): Seconds to wait for a free connection
+            max_uses (int): Checkouts before a connection is recycled (0 = unlimited)
+            idle_timeout (float): Idle seconds before a connection is recycled (0 = never)
+            health_check (bool): Run SELECT 1 on checkout
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._connect = connect
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, uses, last_used)
+        self._uses = {}  # id(conn) -> uses for checked-out connections
+        self._size = 0
+        self._closed = False
+
+        # Counters
+        self.created = 0
+        self.recycled = 0
+        self.waits = 0
+
+    def _is_expired(self, uses, last_used, now):
+        if self.max_uses and uses >= self.max_uses:
+            return True
+        if self.idle_timeout and now - last_used >= self.idle_timeout:
+            return True
+        return False
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _reserve(self, deadline):
+        """Take an idle connection, or a slot to open a new one (returns None, 0)"""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                now = time.monotonic()
+                while self._idle:
+                    conn, uses, last_used = self._idle.pop()
+                    if conn.closed or (self._size > self.min_size and
+                                       self._is_expired(uses, last_used, now)):
+                        self._size -= 1
+                        self.recycled += 1
+                        self._close(conn)
+                        continue
+                    if self._is_expired(uses, last_used, now):
+                        # Below min_size: replace rather than shrink
+                        self.recycled += 1
+                        self._close(conn)
+                        return None, 0
+                    return conn, uses
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection available within {self.timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                self.waits += 1
+                self._cond.wait(remaining)
+
+    def _release_slot(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        """
+        Check out a connection, waiting up to timeout seconds
+
+        Returns:
+            connection: Healthy psycopg2 connection
+        """
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            conn, uses = self._reserve(deadline)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+                with self._cond:
+                    self.created += 1
+            elif not self._is_healthy(conn):
+                self._close(conn)
+                with self._cond:
+                    self._size -= 1
+                    self.recycled += 1
+                    self._cond.notify()
+                continue
+
+            with self._cond:
+                self._uses[id(conn)] = uses + 1
+            return conn
+
+    def putconn(self, conn, discard=False):
+        """
+        Return a connection to the pool
+
+        Args:
+            conn: Connection obtained from getconn
+            discard (bool): Close the connection instead of reusing it
+        """
+        with self._cond:
+            uses = self._uses.pop(id(conn), 0)
+
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        if discard or conn.closed or self._closed:
+            self._close(conn)
+            self._release_slot()
+            return
+
+        with self._cond:
+            self._idle.append((conn, uses, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that checks out a connection and commits on success
+
+        Yields:
+            connection: psycopg2 connection
+        """
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _, _ = self._idle.pop()
+                self._size -= 1
+                self._close(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Get pool size and usage counters"""
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._uses),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'created': self.created,
+                'recycled': self.recycled,
+                'waits': self.waits
+            }
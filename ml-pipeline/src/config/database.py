@@ -1,11 +1,28 @@
 import os
+import math
+import time as time_module
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
 import psycopg2
+import numpy as np
 import pandas as pd
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
 
+from config.connection_pool import ConnectionPool
+from config.schema import DAILY_METRICS_DTYPE, PAGE_VISIT_EVENTS_DTYPE, VISIT_SLOTS_DTYPE
+from config.snapshot import SnapshotStore
+from preprocessing.hyperloglog import HyperLogLog
+from preprocessing.granularity import SECONDS_PER_DAY, floor_to_buckets, parse_granularity
+
 load_dotenv()
 
+# Pools shared by every DataLoader in the process, keyed on connection settings
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
 class DatabaseConfig:
     def __init__(self):
         self.host = os.getenv('DB_HOST', 'localhost')
@@ -14,6 +31,13 @@ class DatabaseConfig:
         self.user = os.getenv('DB_USER', 'postgres')
         self.password = os.getenv('DB_PASSWORD', 'password')
         
+        # Connection pool settings
+        self.pool_min_size = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+        self.pool_max_size = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        self.pool_max_uses = int(os.getenv('DB_POOL_MAX_USES', '1000'))
+        self.pool_idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+        
     def get_connection(self):
         """Get a database connection"""
         return psycopg2.connect(
@@ -27,13 +51,150 @@ class DatabaseConfig:
     def get_connection_string(self):
         """Get connection string for pandas"""
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
+    
+    def create_pool(self):
+        """Create a connection pool using the DB_POOL_* settings"""
+        return ConnectionPool(
+            self.get_connection,
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            timeout=self.pool_timeout,
+            max_uses=self.pool_max_uses,
+            idle_timeout=self.pool_idle_timeout
+        )
+
+def get_shared_pool(db_config):
+    """Get the process-wide connection pool for the given database settings"""
+    key = (db_config.host, db_config.port, db_config.database, db_config.user)
+    
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = db_config.create_pool()
+            _shared_pools[key] = pool
+        return pool
 
 class DataLoader:
-    def __init__(self):
+    def __init__(self, pool=None, snapshot_dir=None, offline=None):
+        """
+        Initialize the data loader
+        
+        Args:
+            pool (ConnectionPool): Connection pool to use (defaults to the shared pool)
+            snapshot_dir (str): Local daily_metrics snapshot directory (defaults to SNAPSHOT_DIR)
+            offline (bool): Serve daily_metrics only from the snapshot, never the database
+                (defaults to SNAPSHOT_OFFLINE)
+        """
         self.db_config = DatabaseConfig()
+        self.pool = pool or get_shared_pool(self.db_config)
+        
+        # Local columnar snapshot of daily_metrics
+        snapshot_dir = snapshot_dir or os.getenv('SNAPSHOT_DIR')
+        if offline is None:
+            offline = os.getenv('SNAPSHOT_OFFLINE', 'False').lower() == 'true'
+        if offline and not snapshot_dir:
+            raise ValueError("Offline mode requires a snapshot directory (SNAPSHOT_DIR)")
+        
+        self.snapshot = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        self.offline = offline
+        self.snapshot_sync_interval = float(os.getenv('SNAPSHOT_SYNC_INTERVAL', '300'))
+        self.snapshot_retry_interval = float(os.getenv('SNAPSHOT_RETRY_INTERVAL', '30'))
+        self._snapshot_synced_at = None
+        self._snapshot_failed_at = None
+        self._snapshot_failures = 0
+        self._snapshot_sync_lock = threading.Lock()
+        
+        # Database watermark the snapshot was last synced up to
+        self._synced_db_watermark = None
+        
+        # page_visits.timestamp is a naive wall clock in visits_timezone; sub-daily
+        # buckets are cut on the wall clock of forecast_timezone
+        self.visits_timezone = os.getenv('PAGE_VISITS_TIMEZONE', 'UTC')
+        self.forecast_timezone = os.getenv('FORECAST_TIMEZONE') or self.visits_timezone
+        
+        # Per-day (visits, HyperLogLog) for closed days, reused across approximate loads;
+        # days without visits are (0, None). Least recently used days are dropped first.
+        self.sketch_cache_days = int(os.getenv('SKETCH_CACHE_DAYS', '400'))
+        self._daily_sketches = OrderedDict()
+        self._daily_sketches_lock = threading.Lock()
+    
+    def sync_snapshot(self, force=False):
+        """
+        Pull daily_metrics rows newer than (or updated since) the snapshot watermark
+        
+        Runs at most every SNAPSHOT_SYNC_INTERVAL seconds unless forced. After
+        a failed sync the next attempt waits SNAPSHOT_RETRY_INTERVAL seconds,
+        doubling with each further failure up to SNAPSHOT_SYNC_INTERVAL, and
+        the existing snapshot keeps serving reads meanwhile. Reads that find a
+        sync already running only wait for it while the snapshot is empty.
+        
+        Args:
+            force (bool): Sync even if the interval has not elapsed
+            
+        Returns:
+            int: Number of rows pulled
+        """
+        if self.snapshot is None or self.offline:
+            return 0
+        
+        if not self._snapshot_sync_lock.acquire(blocking=force or self.snapshot.is_empty):
+            return 0
+        
+        try:
+            now = time_module.monotonic()
+            if (not force and self._snapshot_synced_at is not None and
+                    now - self._snapshot_synced_at < self.snapshot_sync_interval):
+                return 0
+            if not force and self._snapshot_failed_at is not None:
+                backoff = min(
+                    self.snapshot_retry_interval * 2 ** (self._snapshot_failures - 1),
+                    self.snapshot_sync_interval
+                )
+                if now - self._snapshot_failed_at < backoff:
+                    return 0
+            
+            manifest = self.snapshot.manifest
+            query = f"""
+            SELECT {', '.join(DAILY_METRICS_DTYPE.names)}, updated_at
+            FROM daily_metrics
+            """
+            params = []
+            if manifest['max_date'] is not None:
+                query += " WHERE date > %s"
+                params.append(manifest['max_date'])
+                if manifest['max_updated_at'] is not None:
+                    query += " OR updated_at > %s"
+                    params.append(manifest['max_updated_at'])
+            query += " ORDER BY date ASC"
+            
+            dtype = np.dtype(DAILY_METRICS_DTYPE.descr + [('updated_at', 'datetime64[us]')])
+            
+            try:
+                pulled = 0
+                for batch in self.iter_query(query, params, dtype, cursor_name='snapshot_sync'):
+                    updated_at = batch['updated_at']
+                    updated_at = updated_at[~np.isnat(updated_at)]
+                    self.snapshot.write(batch, updated_at.max() if len(updated_at) else None)
+                    pulled += len(batch)
+                self._snapshot_synced_at = now
+                self._snapshot_failed_at = None
+                self._snapshot_failures = 0
+                return pulled
+            except Exception as e:
+                self._snapshot_failed_at = time_module.monotonic()
+                self._snapshot_failures += 1
+                logging.warning(f"Error syncing daily metrics snapshot (failure {self._snapshot_failures}); "
+                                f"serving the local snapshot: {e}")
+                return 0
+        finally:
+            self._snapshot_sync_lock.release()
     
     def load_daily_metrics(self, start_date=None, end_date=None, limit=None):
-        """Load daily metrics from database"""
+        """Load daily metrics from the snapshot (if configured) or the database"""
+        if self.snapshot is not None:
+            self.sync_snapshot()
+            return self.snapshot.load(start_date, end_date, limit)
+        
         query = """
         SELECT 
             date,
@@ -61,48 +222,475 @@ class DataLoader:
             params.append(limit)
         
         try:
-            with self.db_config.get_connection() as conn:
+            with self.pool.connection() as conn:
                 df = pd.read_sql_query(query, conn, params=params)
                 return df
         except Exception as e:
             print(f"Error loading daily metrics: {e}")
             return pd.DataFrame()
     
-    def load_page_visits(self, start_date=None, end_date=None, limit=None):
-        """Load raw page visits data"""
-        query = """
-        SELECT 
-            DATE(timestamp) as date,
-            COUNT(*) as visits,
-            COUNT(DISTINCT visitor_id) as unique_visitors
-        FROM page_visits
+    def load_site_metrics(self, start_date=None, end_date=None, site_ids=None, metrics=None):
+        """
+        Load per-site daily metrics from site_daily_metrics
+        
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+            site_ids (list): Sites to load (None for every site)
+            metrics (list): Metric columns to load (default: all daily metrics)
+        
+        Returns:
+            DataFrame: site_id, date and metric columns, ordered by site and date
+        """
+        metrics = list(metrics or DAILY_METRICS_DTYPE.names[1:])
+        unknown = set(metrics) - set(DAILY_METRICS_DTYPE.names[1:])
+        if unknown:
+            raise ValueError(f"Unknown metrics: {sorted(unknown)}")
+        
+        query = f"""
+        SELECT site_id, date, {', '.join(metrics)}
+        FROM site_daily_metrics
+        WHERE 1=1
+        """
+        
+        params = []
+        if start_date:
+            query += " AND date >= %s"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= %s"
+            params.append(end_date)
+        if site_ids is not None:
+            query += " AND site_id = ANY(%s)"
+            params.append([str(site_id) for site_id in site_ids])
+        
+        query += " ORDER BY site_id, date ASC"
+        
+        try:
+            with self.pool.connection() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+        except Exception as e:
+            print(f"Error loading site metrics: {e}")
+            return pd.DataFrame()
+    
+    def iter_query(self, query, params, dtype, fetch_size=10000, cursor_name='stream'):
+        """
+        Stream a query through a named (server-side) cursor as typed record batches
+        
+        Only fetch_size rows are held in memory at a time, so the result set
+        can be far larger than RAM.
+        
+        Args:
+            query (str): SQL query whose columns match dtype
+            params (list): Query parameters
+            dtype (numpy.dtype): Structured dtype for the batches
+            fetch_size (int): Rows per batch (and per network round trip)
+            cursor_name (str): Server-side cursor name
+            
+        Yields:
+            numpy structured array: Up to fetch_size rows
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor(name=cursor_name) as cursor:
+                cursor.itersize = fetch_size
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    
+                    batch = np.empty(len(rows), dtype=dtype)
+                    for name, values in zip(dtype.names, zip(*rows)):
+                        batch[name] = np.array(values, dtype=dtype[name])
+                    yield batch
+    
+    def iter_daily_metrics(self, start_date=None, end_date=None, fetch_size=10000):
+        """
+        Stream daily metrics in date order as typed record batches
+        
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+            fetch_size (int): Rows per batch
+            
+        Yields:
+            numpy structured array: Rows with DAILY_METRICS_DTYPE
+        """
+        if self.snapshot is not None:
+            self.sync_snapshot()
+            yield from self.snapshot.iter_batches(start_date, end_date)
+            return
+        
+        query = f"""
+        SELECT {', '.join(DAILY_METRICS_DTYPE.names)}
+        FROM daily_metrics
         WHERE 1=1
         """
         
         params = []
         if start_date:
-            query += " AND DATE(timestamp) >= %s"
+            query += " AND date >= %s"
             params.append(start_date)
         if end_date:
-            query += " AND DATE(timestamp) <= %s"
+            query += " AND date <= %s"
             params.append(end_date)
+        
+        query += " ORDER BY date ASC"
+        
+        yield from self.iter_query(
+            query, params, DAILY_METRICS_DTYPE, fetch_size, cursor_name='daily_metrics_stream'
+        )
+    
+    def iter_page_visit_events(self, start_date=None, end_date=None, fetch_size=50000):
+        """
+        Stream raw page visit events in timestamp order as typed record batches
+        
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+            fetch_size (int): Rows per batch
+            
+        Yields:
+            numpy structured array: Rows with PAGE_VISIT_EVENTS_DTYPE
+        """
+        conditions, params = self._timestamp_range(start_date, end_date)
+        where = " AND ".join(conditions) if conditions else "1=1"
+        
+        query = f"""
+        SELECT {', '.join(PAGE_VISIT_EVENTS_DTYPE.names)}
+        FROM page_visits
+        WHERE {where}
+        ORDER BY timestamp ASC
+        """
+        
+        yield from self.iter_query(
+            query, params, PAGE_VISIT_EVENTS_DTYPE, fetch_size, cursor_name='page_visits_stream'
+        )
+    
+    @staticmethod
+    def _timestamp_range(start_date=None, end_date=None):
+        """
+        Convert an inclusive date range into a half-open timestamp range
+        
+        Comparing the raw timestamp column (instead of DATE(timestamp)) lets
+        Postgres use idx_page_visits_timestamp.
+        
+        Returns:
+            tuple: (conditions, params)
+        """
+        conditions, params = [], []
+        if start_date:
+            conditions.append("timestamp >= %s")
+            params.append(datetime.combine(pd.Timestamp(start_date).date(), time.min))
+        if end_date:
+            conditions.append("timestamp < %s")
+            params.append(datetime.combine(pd.Timestamp(end_date).date() + timedelta(days=1), time.min))
+        return conditions, params
+    
+    def load_page_visits(self, start_date=None, end_date=None, limit=None,
+                         approximate_distinct=False, fetch_size=50000):
+        """
+        Load raw page visits data aggregated per day
+        
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+            limit (int): Maximum number of days to return
+            approximate_distinct (bool): Estimate unique visitors with HyperLogLog
+                sketches instead of COUNT(DISTINCT visitor_id)
+            fetch_size (int): Rows per round trip when streaming for sketches
             
-        query += " GROUP BY DATE(timestamp) ORDER BY date ASC"
+        Returns:
+            DataFrame: date, visits, unique_visitors
+        """
+        if approximate_distinct:
+            return self._load_page_visits_approximate(start_date, end_date, limit, fetch_size)
+        
+        conditions, params = self._timestamp_range(start_date, end_date)
+        where = " AND ".join(conditions) if conditions else "1=1"
+        
+        query = f"""
+        SELECT 
+            DATE(timestamp) as date,
+            COUNT(*) as visits,
+            COUNT(DISTINCT visitor_id) as unique_visitors
+        FROM page_visits
+        WHERE {where}
+        GROUP BY DATE(timestamp) ORDER BY date ASC
+        """
         
         if limit:
             query += " LIMIT %s"
             params.append(limit)
         
         try:
-            with self.db_config.get_connection() as conn:
+            with self.pool.connection() as conn:
                 df = pd.read_sql_query(query, conn, params=params)
                 return df
         except Exception as e:
             print(f"Error loading page visits: {e}")
             return pd.DataFrame()
     
+    def _load_page_visits_approximate(self, start_date, end_date, limit, fetch_size):
+        """
+        Aggregate page visits per day with one HyperLogLog sketch per day
+        
+        Rows are streamed through a server-side cursor, so memory is bounded by
+        fetch_size plus one 16 KB sketch per day. Closed days (before today)
+        are cached, including days without visits, for up to
+        SKETCH_CACHE_DAYS days (least recently used first out); later calls
+        only stream the runs of days in their range that are not cached.
+        """
+        today = date.today()
+        sketches = {}
+        
+        if start_date and end_date:
+            first, last = pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+            days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+            with self._daily_sketches_lock:
+                for day in days:
+                    if day in self._daily_sketches:
+                        self._daily_sketches.move_to_end(day)
+                        sketches[day] = self._daily_sketches[day]
+            
+            # Contiguous runs of uncached days, one query each
+            ranges = []
+            for day in days:
+                if day in sketches:
+                    continue
+                if ranges and ranges[-1][1] == day - timedelta(days=1):
+                    ranges[-1][1] = day
+                else:
+                    ranges.append([day, day])
+        else:
+            days = None
+            ranges = [[start_date, end_date]]
+        
+        try:
+            streamed = {}
+            for range_start, range_end in ranges:
+                streamed.update(self._stream_day_sketches(range_start, range_end, fetch_size))
+        except Exception as e:
+            logging.error(f"Error loading page visits: {e}")
+            return pd.DataFrame()
+        
+        # Closed days without a row have no visits; cache them so they are not queried again
+        if days is not None:
+            for range_start, range_end in ranges:
+                day = range_start
+                while day <= range_end and day < today:
+                    streamed.setdefault(day, (0, None))
+                    day += timedelta(days=1)
+        
+        sketches.update(streamed)
+        
+        with self._daily_sketches_lock:
+            for day, entry in streamed.items():
+                if day < today:
+                    self._daily_sketches[day] = entry
+                    self._daily_sketches.move_to_end(day)
+            while len(self._daily_sketches) > self.sketch_cache_days:
+                self._daily_sketches.popitem(last=False)
+        
+        days = sorted(day for day, (visits, _) in sketches.items() if visits)
+        if limit:
+            days = days[:limit]
+        
+        return pd.DataFrame({
+            'date': days,
+            'visits': [sketches[day][0] for day in days],
+            'unique_visitors': [sketches[day][1].count() for day in days]
+        }, columns=['date', 'visits', 'unique_visitors'])
+    
+    def _stream_day_sketches(self, start_date, end_date, fetch_size):
+        """
+        Stream (date, visitor_id) rows of a date range into per-day sketches
+        
+        Returns:
+            dict: date -> (visits, HyperLogLog) for days with at least one visit
+        """
+        conditions, params = self._timestamp_range(start_date, end_date)
+        where = " AND ".join(conditions) if conditions else "1=1"
+        query = f"""
+        SELECT DATE(timestamp) as date, visitor_id
+        FROM page_visits
+        WHERE {where}
+        """
+        dtype = np.dtype([('date', 'datetime64[D]'), ('visitor_id', 'O')])
+        
+        streamed = {}
+        for batch in self.iter_query(query, params, dtype, fetch_size,
+                                     cursor_name='page_visits_sketch'):
+            visitor_ids = pd.Series(batch['visitor_id'])
+            for day, day_visitor_ids in visitor_ids.groupby(batch['date']):
+                day = pd.Timestamp(day).date()
+                visits, sketch = streamed.get(day, (0, None))
+                if sketch is None:
+                    sketch = HyperLogLog()
+                sketch.add(day_visitor_ids)
+                streamed[day] = (visits + len(day_visitor_ids), sketch)
+        
+        return streamed
+    
+    def load_visit_buckets(self, start_time=None, end_time=None, granularity='1h',
+                           timezone=None, fetch_size=10000):
+        """
+        Count page visits per time-zone-aware hourly or N-minute bucket
+        
+        Postgres counts visits per slot of the stored timestamp (the largest
+        slot that divides both the bucket and 15 minutes, so it lines up with
+        every UTC offset in use). The slots, typically a few thousand rows,
+        are streamed back and regrouped into buckets of the target time
+        zone's wall clock with vectorized NumPy, so no raw events leave the
+        database.
+        
+        Args:
+            start_time (datetime): First instant to include (naive values are in timezone)
+            end_time (datetime): End of the range, exclusive (naive values are in timezone)
+            granularity (str): Bucket length, e.g. '1h' or '15min'
+            timezone (str): Time zone of the buckets (defaults to FORECAST_TIMEZONE)
+            fetch_size (int): Slots per batch
+        
+        Returns:
+            DataFrame: timestamp (bucket start, tz-aware) and visits; every bucket
+                between start_time and end_time is present (0 without visits)
+        """
+        seconds = parse_granularity(granularity)
+        if seconds == SECONDS_PER_DAY:
+            raise ValueError("Daily visits come from load_page_visits or daily_metrics")
+        timezone = timezone or self.forecast_timezone
+        slot_seconds = math.gcd(seconds, 900)
+        
+        # Bounds in UTC nanoseconds; the start is floored so the first bucket is complete
+        bounds = [
+            self._to_utc_ns(value, timezone) if value is not None else None
+            for value in (start_time, end_time)
+        ]
+        if bounds[0] is not None:
+            bounds[0] = int(floor_to_buckets([bounds[0]], seconds, timezone)[0])
+        
+        conditions, params = [], [slot_seconds]
+        for bound, operator in zip(bounds, ('>=', '<')):
+            if bound is not None:
+                # The column holds naive wall-clock times of visits_timezone
+                stored = pd.Timestamp(bound, tz='UTC').tz_convert(self.visits_timezone).tz_localize(None)
+                conditions.append(f"timestamp {operator} %s")
+                params.append(stored.to_pydatetime())
+        where = " AND ".join(conditions) if conditions else "1=1"
+        
+        query = f"""
+        SELECT FLOOR(EXTRACT(EPOCH FROM timestamp) / %s)::BIGINT AS slot, COUNT(*) AS visits
+        FROM page_visits
+        WHERE {where}
+        GROUP BY slot ORDER BY slot
+        """
+        
+        try:
+            batches = list(self.iter_query(
+                query, params, VISIT_SLOTS_DTYPE, fetch_size, cursor_name='visit_slots_stream'
+            ))
+        except Exception as e:
+            print(f"Error loading visit buckets: {e}")
+            return pd.DataFrame()
+        
+        slots = np.concatenate(batches) if batches else np.empty(0, dtype=VISIT_SLOTS_DTYPE)
+        return self._bucket_slots(slots, slot_seconds, seconds, timezone, *bounds)
+    
+    @staticmethod
+    def _to_utc_ns(value, timezone):
+        timestamp = pd.Timestamp(value)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(timezone, ambiguous=False, nonexistent='shift_forward')
+        return timestamp.tz_convert('UTC').value
+    
+    def _bucket_slots(self, slots, slot_seconds, seconds, timezone, start_ns=None, end_ns=None):
+        """
+        Regroup per-slot counts into a gap-free series of local buckets
+        
+        Args:
+            slots (array): Records with VISIT_SLOTS_DTYPE (slot = stored wall clock // slot_seconds)
+            slot_seconds (int): Slot length in seconds
+            seconds (int): Bucket length in seconds
+            timezone (str): Time zone of the buckets
+            start_ns (int): Range start in UTC nanoseconds (default: first slot)
+            end_ns (int): Range end in UTC nanoseconds, exclusive (default: after the last slot)
+        
+        Returns:
+            DataFrame: timestamp, visits
+        """
+        step = np.int64(seconds) * 10**9
+        
+        # Stored wall-clock times -> UTC; the repeated hour when clocks go back
+        # is ambiguous in a naive column and is read as standard time
+        utc_ns = slots['slot'] * np.int64(slot_seconds) * 10**9
+        if self.visits_timezone != 'UTC' and len(utc_ns):
+            utc_ns = pd.to_datetime(utc_ns).tz_localize(
+                self.visits_timezone, ambiguous=np.zeros(len(utc_ns), dtype=bool), nonexistent='shift_forward'
+            ).tz_convert('UTC').asi8
+        starts = floor_to_buckets(utc_ns, seconds, timezone)
+        
+        if start_ns is None:
+            start_ns = starts.min() if len(starts) else 0
+        if end_ns is None:
+            end_ns = starts.max() + step if len(starts) else start_ns
+        first = floor_to_buckets([start_ns], seconds, timezone)[0]
+        n_buckets = max(int(-(-(end_ns - first) // step)), 0)
+        
+        # Buckets are evenly spaced in UTC, so each slot's bucket is an index
+        index = (starts - first) // step
+        keep = (index >= 0) & (index < n_buckets)
+        visits = np.bincount(index[keep], weights=slots['visits'][keep], minlength=n_buckets)
+        
+        timestamps = pd.to_datetime(first + np.arange(n_buckets, dtype=np.int64) * step, utc=True)
+        return pd.DataFrame({'timestamp': timestamps.tz_convert(timezone), 'visits': visits})
+    
+    def get_data_watermark(self):
+        """
+        Get the latest date and update time in daily_metrics
+
+        With a snapshot, reads are served from it, so its watermark is
+        returned: a change in the database forces a sync first, and the
+        result always describes the rows load_daily_metrics returns.
+
+        Returns:
+            tuple: (max_date, max_updated_at, row_count), or None on error
+        """
+        if self.offline:
+            return self.snapshot.watermark
+        
+        db_watermark = self._query_data_watermark()
+        if self.snapshot is None:
+            return db_watermark
+        
+        if db_watermark is not None and db_watermark != self._synced_db_watermark:
+            self.sync_snapshot(force=True)
+            if self._snapshot_failed_at is None:
+                self._synced_db_watermark = db_watermark
+        
+        return self.snapshot.watermark
+    
+    def _query_data_watermark(self):
+        """(MAX(date), MAX(updated_at), COUNT(*)) of daily_metrics in the database"""
+        query = """
+        SELECT MAX(date), MAX(updated_at), COUNT(*)
+        FROM daily_metrics
+        """
+
+        try:
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(query)
+                    result = cursor.fetchone()
+                    return tuple(result) if result else None
+        except Exception as e:
+            print(f"Error loading data watermark: {e}")
+            return None
+
     def get_minimum_data_requirement(self):
         """Check if we have enough data for training (minimum 30 days)"""
+        if self.offline:
+            return self.snapshot.count_days(date.today() - timedelta(days=60))
+        
         query = """
         SELECT COUNT(DISTINCT date) as days_count
         FROM daily_metrics
@@ -110,7 +698,7 @@ class DataLoader:
         """
         
         try:
-            with self.db_config.get_connection() as conn:
+            with self.pool.connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute(query)
                     result = cursor.fetchone()
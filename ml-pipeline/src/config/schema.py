@@ -0,0 +1,24 @@
+import numpy as np
+
+# Column types for streamed record batches
+DAILY_METRICS_DTYPE = np.dtype([
+    ('date', 'datetime64[D]'),
+    ('page_visits', 'f8'),
+    ('page_views', 'f8'),
+    ('avg_time_on_page', 'f8'),
+    ('bounce_rate', 'f8'),
+    ('unique_visitors', 'f8')
+])
+
+PAGE_VISIT_EVENTS_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[us]'),
+    ('visitor_id', 'O'),
+    ('session_id', 'O'),
+    ('time_on_page', 'f8')
+])
+
+# Visit counts per fixed-length slot of the stored timestamp (see DataLoader.load_visit_buckets)
+VISIT_SLOTS_DTYPE = np.dtype([
+    ('slot', 'i8'),
+    ('visits', 'f8')
+])
@@ -0,0 +1,246 @@
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.schema import DAILY_METRICS_DTYPE
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class SnapshotStore:
+    def __init__(self, root_dir):
+        """
+        Local columnar snapshot of daily_metrics
+
+        Rows are partitioned by month; each partition is a directory holding
+        one .npy file per column, read back with memory mapping. A JSON
+        manifest records the live directory of every partition and the
+        (max date, max updated_at) watermark used for incremental syncs.
+        Partitions are rewritten into a new directory and swapped in through
+        the manifest, so readers never see a half-written month. A replaced
+        version is only deleted by the write after the one that replaced it,
+        so readers that resolved it just before the swap can finish.
+
+        Args:
+            root_dir (str): Directory holding the snapshot
+        """
+        self.root_dir = root_dir
+        self.columns = DAILY_METRICS_DTYPE.names
+        self._lock = threading.Lock()
+        os.makedirs(root_dir, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    # Manifest -----------------------------------------------------------
+
+    def _read_manifest(self):
+        path = os.path.join(self.root_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {'partitions': {}, 'retired': [], 'max_date': None, 'max_updated_at': None, 'row_count': 0}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        path = os.path.join(self.root_dir, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+        self.manifest = manifest
+
+    @property
+    def watermark(self):
+        """
+        Snapshot watermark in the same shape as DataLoader.get_data_watermark
+
+        Returns:
+            tuple: (max_date, max_updated_at, row_count), or None if empty
+        """
+        if not self.manifest['row_count']:
+            return None
+        max_date = pd.Timestamp(self.manifest['max_date']).date()
+        max_updated_at = self.manifest['max_updated_at']
+        if max_updated_at is not None:
+            max_updated_at = datetime.fromisoformat(max_updated_at)
+        return (max_date, max_updated_at, self.manifest['row_count'])
+
+    @property
+    def is_empty(self):
+        return not self.manifest['partitions']
+
+    # Partitions ---------------------------------------------------------
+
+    def _read_partition(self, month, mmap=True):
+        """
+        Load every column of a partition from one version directory
+
+        The version is resolved once, so all columns come from the same write.
+        A reader that resolved a version two writes old retries against the
+        current manifest.
+        """
+        mode = 'r' if mmap else None
+        while True:
+            dirname = self.manifest['partitions'][month]
+            directory = os.path.join(self.root_dir, dirname)
+            try:
+                return {
+                    column: np.load(os.path.join(directory, f'{column}.npy'), mmap_mode=mode)
+                    for column in self.columns
+                }
+            except FileNotFoundError:
+                if self.manifest['partitions'].get(month) == dirname:
+                    raise
+
+    def _write_partition(self, month, columns, manifest):
+        """Write a new version of a partition and point the manifest at it"""
+        current = manifest['partitions'].get(month)
+        version = int(current.rsplit('.', 1)[1]) + 1 if current else 0
+        dirname = f'{month}.{version}'
+        directory = os.path.join(self.root_dir, dirname)
+        os.makedirs(directory, exist_ok=True)
+
+        for column in self.columns:
+            np.save(os.path.join(directory, f'{column}.npy'), columns[column])
+
+        manifest['partitions'][month] = dirname
+        return current
+
+    def write(self, data, max_updated_at=None):
+        """
+        Upsert rows into the snapshot (later rows win for duplicate dates)
+
+        Args:
+            data (DataFrame or structured array): Rows with a date column and metric columns
+            max_updated_at (datetime): Latest updated_at among the rows, for the watermark
+        """
+        rows = self._to_records(data)
+        if len(rows) == 0:
+            return
+
+        with self._lock:
+            manifest = json.loads(json.dumps(self.manifest))
+            months = rows['date'].astype('datetime64[M]')
+            replaced = []
+
+            for month in np.unique(months):
+                key = str(month)
+                new_rows = rows[months == month]
+
+                if key in manifest['partitions']:
+                    existing = self._read_partition(key, mmap=False)
+                    merged = np.empty(len(existing['date']) + len(new_rows), dtype=DAILY_METRICS_DTYPE)
+                    for column in self.columns:
+                        merged[column] = np.concatenate([existing[column], new_rows[column]])
+                    manifest['row_count'] -= len(existing['date'])
+                else:
+                    merged = new_rows
+
+                # Keep the last occurrence of each date, sorted by date
+                _, last_index = np.unique(merged['date'][::-1], return_index=True)
+                merged = merged[len(merged) - 1 - last_index]
+
+                replaced.append(self._write_partition(
+                    key, {column: np.ascontiguousarray(merged[column]) for column in self.columns}, manifest
+                ))
+                manifest['row_count'] += len(merged)
+
+            max_date = str(rows['date'].max())
+            if manifest['max_date'] is None or max_date > manifest['max_date']:
+                manifest['max_date'] = max_date
+            if max_updated_at is not None:
+                max_updated_at = pd.Timestamp(max_updated_at).isoformat()
+                if manifest['max_updated_at'] is None or max_updated_at > manifest['max_updated_at']:
+                    manifest['max_updated_at'] = max_updated_at
+
+            # Versions replaced now stay readable until the next write
+            retired = manifest.get('retired', [])
+            manifest['retired'] = [dirname for dirname in replaced if dirname]
+            self._write_manifest(manifest)
+
+            for dirname in retired:
+                shutil.rmtree(os.path.join(self.root_dir, dirname), ignore_errors=True)
+
+    def _to_records(self, data):
+        if isinstance(data, np.ndarray) and data.dtype.names:
+            rows = np.empty(len(data), dtype=DAILY_METRICS_DTYPE)
+            for column in self.columns:
+                rows[column] = data[column] if column in data.dtype.names else 0
+            return rows
+
+        rows = np.empty(len(data), dtype=DAILY_METRICS_DTYPE)
+        rows['date'] = pd.to_datetime(data['date']).to_numpy(dtype='datetime64[D]')
+        for column in self.columns[1:]:
+            rows[column] = data[column].to_numpy(dtype=np.float64) if column in data else 0
+        return rows
+
+    # Reads --------------------------------------------------------------
+
+    def _months_between(self, start_date, end_date):
+        months = sorted(self.manifest['partitions'])
+        if start_date is not None:
+            first = str(np.datetime64(pd.Timestamp(start_date).date(), 'M'))
+            months = [month for month in months if month >= first]
+        if end_date is not None:
+            last = str(np.datetime64(pd.Timestamp(end_date).date(), 'M'))
+            months = [month for month in months if month <= last]
+        return months
+
+    def iter_batches(self, start_date=None, end_date=None):
+        """
+        Yield one record batch per month in the date range, read via memory mapping
+
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+
+        Yields:
+            numpy structured array: Rows with DAILY_METRICS_DTYPE
+        """
+        start = np.datetime64(pd.Timestamp(start_date).date(), 'D') if start_date is not None else None
+        end = np.datetime64(pd.Timestamp(end_date).date(), 'D') if end_date is not None else None
+
+        for month in self._months_between(start_date, end_date):
+            columns = self._read_partition(month)
+            dates = columns['date']
+
+            lo = np.searchsorted(dates, start, side='left') if start is not None else 0
+            hi = np.searchsorted(dates, end, side='right') if end is not None else len(dates)
+            if hi <= lo:
+                continue
+
+            batch = np.empty(hi - lo, dtype=DAILY_METRICS_DTYPE)
+            for column in self.columns:
+                batch[column] = columns[column][lo:hi]
+            yield batch
+
+    def load(self, start_date=None, end_date=None, limit=None):
+        """
+        Load a date range as a DataFrame (same columns as load_daily_metrics)
+
+        Args:
+            start_date (date): First day to include
+            end_date (date): Last day to include
+            limit (int): Maximum number of rows
+
+        Returns:
+            DataFrame: Daily metrics ordered by date
+        """
+        batches = list(self.iter_batches(start_date, end_date))
+        if not batches:
+            return pd.DataFrame(columns=list(self.columns))
+
+        rows = np.concatenate(batches)
+        if limit:
+            rows = rows[:limit]
+
+        df = pd.DataFrame({column: rows[column] for column in self.columns})
+        df['date'] = df['date'].astype('datetime64[ns]')
+        return df
+
+    def count_days(self, start_date=None, end_date=None):
+        """Number of days stored in the date range"""
+        return sum(len(batch) for batch in self.iter_batches(start_date, end_date))
@@ -0,0 +1,141 @@
+import numpy as np
+
+# Longest forecast the API serves (days_ahead is capped at 30)
+MAX_HORIZON = 30
+
+
+class SeasonalNaiveForecaster:
+    name = 'seasonal_naive'
+
+    def __init__(self, season=7, prediction_horizon=MAX_HORIZON):
+        """
+        Repeat the last observed season (same weekday last week)
+
+        Args:
+            season (int): Season length in days
+            prediction_horizon (int): Days to forecast
+        """
+        self.season = season
+        self.sequence_length = season
+        self.prediction_horizon = prediction_horizon
+
+    def predict(self, X):
+        """
+        Args:
+            X (array): History of shape (batch, sequence_length[, 1]), oldest first
+
+        Returns:
+            numpy array: Forecasts of shape (batch, prediction_horizon)
+        """
+        history = _as_batch(X)[:, -self.season:]
+        return history[:, np.arange(self.prediction_horizon) % self.season]
+
+
+class MovingAverageForecaster:
+    name = 'moving_average'
+
+    def __init__(self, window=7, prediction_horizon=MAX_HORIZON):
+        """
+        Flat forecast at the mean of the last window days
+
+        Args:
+            window (int): Days averaged
+            prediction_horizon (int): Days to forecast
+        """
+        self.window = window
+        self.sequence_length = window
+        self.prediction_horizon = prediction_horizon
+
+    def predict(self, X):
+        history = _as_batch(X)[:, -self.window:]
+        return np.repeat(history.mean(axis=1, keepdims=True), self.prediction_horizon, axis=1)
+
+
+class HoltWintersForecaster:
+    name = 'holt_winters'
+
+    def __init__(self, season=7, seasons=8, alpha=0.3, beta=0.05, gamma=0.2, damping=0.9,
+                 prediction_horizon=MAX_HORIZON):
+        """
+        Additive Holt-Winters (triple exponential smoothing) with damped trend
+
+        With fixed smoothing parameters every forecast is a linear function
+        of the input window, so the recursion runs once at construction (on
+        the identity basis) and predict() is a single matmul.
+
+        Args:
+            season (int): Season length in days (weekly by default)
+            seasons (int): Seasons of history used (sequence_length = season * seasons)
+            alpha (float): Level smoothing
+            beta (float): Trend smoothing
+            gamma (float): Seasonal smoothing
+            damping (float): Trend damping factor (1.0 for an undamped trend)
+            prediction_horizon (int): Days to forecast
+        """
+        if seasons < 2:
+            raise ValueError("Holt-Winters needs at least two seasons of history")
+
+        self.season = season
+        self.sequence_length = season * seasons
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.damping = damping
+        self.prediction_horizon = prediction_horizon
+
+        # (sequence_length, prediction_horizon): forecasts = history @ weights
+        self.weights = self.smooth(np.eye(self.sequence_length))
+
+    def predict(self, X):
+        return _as_batch(X)[:, -self.sequence_length:] @ self.weights
+
+    def smooth(self, history):
+        """
+        Run the smoothing recursion over (batch, sequence_length) histories
+
+        Returns:
+            numpy array: Forecasts of shape (batch, prediction_horizon)
+        """
+        season = self.season
+
+        # Initial level, trend and seasonal indices from the first two seasons
+        first = history[:, :season].mean(axis=1)
+        second = history[:, season:2 * season].mean(axis=1)
+        level = first
+        trend = (second - first) / season
+        seasonal = history[:, :season] - first[:, np.newaxis]
+
+        for t in range(season, history.shape[1]):
+            value = history[:, t]
+            index = t % season
+            previous_level = level
+
+            level = self.alpha * (value - seasonal[:, index]) + (1 - self.alpha) * (level + self.damping * trend)
+            trend = self.beta * (level - previous_level) + (1 - self.beta) * self.damping * trend
+            seasonal[:, index] = self.gamma * (value - level) + (1 - self.gamma) * seasonal[:, index]
+
+        # Damped trend: sum of damping**1..k
+        steps = np.arange(1, self.prediction_horizon + 1)
+        if self.damping == 1.0:
+            trend_weights = steps.astype(np.float64)
+        else:
+            trend_weights = np.cumsum(self.damping ** steps)
+
+        season_index = (history.shape[1] + steps - 1) % season
+        return level[:, np.newaxis] + trend[:, np.newaxis] * trend_weights + seasonal[:, season_index]
+
+
+def _as_batch(X):
+    """(batch, steps[, 1]) -> float64 (batch, steps)"""
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 3:
+        X = X[:, :, 0]
+    return X
+
+
+# Engines selectable by name (FORECAST_ENGINE)
+BASELINE_FORECASTERS = {
+    SeasonalNaiveForecaster.name: SeasonalNaiveForecaster,
+    MovingAverageForecaster.name: MovingAverageForecaster,
+    HoltWintersForecaster.name: HoltWintersForecaster
+}
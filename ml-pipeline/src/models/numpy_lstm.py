@@ -0,0 +1,229 @@
+import os
+import json
+
+import numpy as np
+
+# Layers that only matter during training
+INFERENCE_NOOP_LAYERS = ('InputLayer', 'Dropout', 'SpatialDropout1D', 'GaussianNoise', 'ActivityRegularization')
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 0.5 * (np.tanh(0.5 * x) + 1.0),  # Overflow-free and faster than exp
+    'hard_sigmoid': lambda x: np.clip(0.2 * x + 0.5, 0.0, 1.0),
+    'relu': lambda x: np.maximum(x, 0.0)
+}
+
+
+def weights_path(model_dir, version):
+    """Path of the exported NumPy weights for a model version"""
+    return os.path.join(model_dir, f'lstm_weights_{version}.npz')
+
+
+def _activation(name):
+    if name is None:
+        return 'linear'
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy inference: {name}")
+    return name
+
+
+def export_keras_weights(keras_model, path):
+    """
+    Write the weights of a Sequential LSTM/Dense Keras model to a compact .npz file
+
+    Args:
+        keras_model: Trained tf.keras model (LSTM, Dense, Dropout, Flatten and Reshape layers)
+        path (str): Output file path
+
+    Returns:
+        str: Path written
+    """
+    layers = []
+    arrays = {}
+
+    for index, layer in enumerate(keras_model.layers):
+        kind = layer.__class__.__name__
+        config = layer.get_config()
+
+        if kind in INFERENCE_NOOP_LAYERS:
+            continue
+
+        if kind == 'LSTM':
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            layers.append({
+                'kind': 'lstm',
+                'units': int(config['units']),
+                'activation': _activation(config.get('activation', 'tanh')),
+                'recurrent_activation': _activation(config.get('recurrent_activation', 'sigmoid')),
+                'return_sequences': bool(config.get('return_sequences', False)),
+                'go_backwards': bool(config.get('go_backwards', False))
+            })
+            arrays[f'{len(layers) - 1}_kernel'] = kernel
+            arrays[f'{len(layers) - 1}_recurrent_kernel'] = recurrent_kernel
+            arrays[f'{len(layers) - 1}_bias'] = bias
+        elif kind == 'Dense':
+            weights = layer.get_weights()
+            layers.append({'kind': 'dense', 'activation': _activation(config.get('activation'))})
+            arrays[f'{len(layers) - 1}_kernel'] = weights[0]
+            arrays[f'{len(layers) - 1}_bias'] = weights[1] if len(weights) > 1 else np.zeros(weights[0].shape[1])
+        elif kind == 'Flatten':
+            layers.append({'kind': 'flatten'})
+        elif kind == 'Reshape':
+            layers.append({'kind': 'reshape', 'target_shape': list(config['target_shape'])})
+        else:
+            raise ValueError(f"Layer {index} ({kind}) is not supported by NumPy inference")
+
+    arrays = {name: np.asarray(value, dtype=np.float32) for name, value in arrays.items()}
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # np.savez appends .npz to names without it, so write through a file object
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, spec=np.array(json.dumps(layers)), **arrays)
+    os.replace(tmp_path, path)
+
+    return path
+
+
+class NumpyLSTMModel:
+    def __init__(self, layers, sequence_length, prediction_horizon, version=None):
+        """
+        LSTM forward pass in NumPy, for serving without TensorFlow
+
+        Exposes the parts of the LSTMModel interface used at inference time
+        (predict, sequence_length, prediction_horizon, is_trained). The
+        input projection of every timestep is one matmul, so the per-step
+        loop only does the recurrent matmul and gate arithmetic.
+
+        Args:
+            layers (list): Layer dicts (spec plus weight arrays) from load()
+            sequence_length (int): Input sequence length
+            prediction_horizon (int): Number of predicted steps
+            version (str): Model version
+        """
+        self.layers = layers
+        self.sequence_length = sequence_length
+        self.prediction_horizon = prediction_horizon
+        self.version = version
+        self.is_trained = True
+        self.model = None
+
+    @classmethod
+    def load(cls, path, sequence_length, prediction_horizon, version=None):
+        """
+        Load weights written by export_keras_weights
+
+        Args:
+            path (str): .npz weights file
+            sequence_length (int): Input sequence length
+            prediction_horizon (int): Number of predicted steps
+            version (str): Model version
+
+        Returns:
+            NumpyLSTMModel: Model ready for predict()
+        """
+        with np.load(path) as data:
+            spec = json.loads(str(data['spec']))
+            layers = []
+            for index, layer in enumerate(spec):
+                layer = dict(layer)
+                for name in ('kernel', 'recurrent_kernel', 'bias'):
+                    key = f'{index}_{name}'
+                    if key in data:
+                        layer[name] = data[key]
+                layers.append(layer)
+
+        return cls(layers, sequence_length, prediction_horizon, version)
+
+    def count_params(self):
+        """Number of weights, as reported by Keras"""
+        return int(sum(
+            layer[name].size
+            for layer in self.layers
+            for name in ('kernel', 'recurrent_kernel', 'bias')
+            if name in layer
+        ))
+
+    def predict(self, X, verbose=0):
+        """
+        Run the forward pass
+
+        Args:
+            X (array): Input of shape (batch, sequence_length, features)
+
+        Returns:
+            numpy array: Model output, same shape as Keras predict
+        """
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 2:
+            x = x[:, :, np.newaxis]
+
+        for layer in self.layers:
+            kind = layer['kind']
+            if kind == 'lstm':
+                x = self._lstm(x, layer)
+            elif kind == 'dense':
+                x = ACTIVATIONS[layer['activation']](x @ layer['kernel'] + layer['bias'])
+            elif kind == 'flatten':
+                x = x.reshape(len(x), -1)
+            else:
+                x = x.reshape((len(x),) + tuple(layer['target_shape']))
+
+        return x
+
+    def _lstm(self, x, layer):
+        units = layer['units']
+        activation = ACTIVATIONS[layer['activation']]
+        recurrent_activation = ACTIVATIONS[layer['recurrent_activation']]
+        recurrent_kernel = layer['recurrent_kernel']
+
+        if layer['go_backwards']:
+            x = x[:, ::-1]
+
+        batch_size, steps, _ = x.shape
+
+        # Input contribution for every timestep in one matmul (Keras gate order: i, f, c, o)
+        projected = x @ layer['kernel'] + layer['bias']
+
+        h = np.zeros((batch_size, units), dtype=np.float32)
+        c = np.zeros((batch_size, units), dtype=np.float32)
+        outputs = np.empty((batch_size, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+
+            # One activation call over all gates beats three calls on slices
+            gates = recurrent_activation(z)
+            i = gates[:, :units]
+            f = gates[:, units:2 * units]
+            g = activation(z[:, 2 * units:3 * units])
+            o = gates[:, 3 * units:]
+
+            c = f * c + i * g
+            h = o * activation(c)
+
+            if outputs is not None:
+                outputs[:, t] = h
+
+        return outputs if outputs is not None else h
+
+
+def max_abs_difference(keras_model, numpy_model, X):
+    """
+    Largest absolute difference between Keras and NumPy predictions
+
+    Args:
+        keras_model: tf.keras model
+        numpy_model (NumpyLSTMModel): Exported model
+        X (array): Sample inputs
+
+    Returns:
+        float: max |keras - numpy|
+    """
+    expected = np.asarray(keras_model.predict(X, verbose=0))
+    actual = numpy_model.predict(X)
+    return float(np.max(np.abs(expected - actual)))
@@ -1,21 +1,35 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import mean_squared_error, mean_absolute_error
+from preprocessing.features import FeatureEngine, default_feature_specs, CALENDAR_FEATURES, INTRADAY_FEATURES
+from preprocessing.granularity import DAILY, buckets_per_day, granularity_label, parse_granularity
 import warnings
 warnings.filterwarnings('ignore')
 
 class DataProcessor:
-    def __init__(self, sequence_length=7, prediction_horizon=7):
+    def __init__(self, sequence_length=7, prediction_horizon=7, contiguous_sequences=False,
+                 granularity=DAILY):
         """
         Initialize data processor for LSTM model
         
         Args:
-            sequence_length (int): Number of days to use as input sequence
-            prediction_horizon (int): Number of days to predict ahead
+            sequence_length (int): Number of steps (days, hours, ...) to use as input sequence
+            prediction_horizon (int): Number of steps to predict ahead
+            contiguous_sequences (bool): Materialize X/y as contiguous copies instead of
+                read-only strided views (for backends that require owned buffers)
+            granularity (str): Step length: 'D' for daily_metrics rows, or '1h' / '{N}min'
+                for buckets from DataLoader.load_visit_buckets (keyed on 'timestamp')
         """
         self.sequence_length = sequence_length
         self.prediction_horizon = prediction_horizon
+        self.contiguous_sequences = contiguous_sequences
+        self.granularity = granularity_label(granularity)
+        if self.granularity == DAILY:
+            self.time_column, self.freq = 'date', 'D'
+        else:
+            self.time_column, self.freq = 'timestamp', pd.Timedelta(seconds=parse_granularity(granularity))
         self.scaler = MinMaxScaler(feature_range=(0, 1))
         self.is_fitted = False
         
@@ -30,12 +44,30 @@ class DataProcessor:
         Returns:
             tuple: (X_train, y_train, X_test, y_test, scaler)
         """
+        scaled_data = self.prepare_series(df, target_column)
+        
+        # Create sequences and split into train and test sets (80/20 split)
+        X_train, y_train, X_test, y_test = self.split_sequences(scaled_data, train_fraction=0.8)
+        
+        return X_train, y_train, X_test, y_test, self.scaler
+    
+    def prepare_series(self, df, target_column='page_visits'):
+        """
+        Fit the scaler and return the scaled, gap-free target series
+        
+        Args:
+            df (DataFrame): Input dataframe with date (or timestamp) and target column
+            target_column (str): Column name to predict
+            
+        Returns:
+            numpy array: Scaled values of shape (n_steps, 1)
+        """
         # Ensure we have the required columns
-        if 'date' not in df.columns or target_column not in df.columns:
-            raise ValueError(f"DataFrame must contain 'date' and '{target_column}' columns")
+        if self.time_column not in df.columns or target_column not in df.columns:
+            raise ValueError(f"DataFrame must contain '{self.time_column}' and '{target_column}' columns")
         
         # Sort by date
-        df = df.sort_values('date').reset_index(drop=True)
+        df = df.sort_values(self.time_column).reset_index(drop=True)
         
         # Fill missing dates with 0 values
         df = self._fill_missing_dates(df, target_column)
@@ -47,41 +79,171 @@ class DataProcessor:
         scaled_data = self.scaler.fit_transform(target_values)
         self.is_fitted = True
         
-        # Create sequences
+        return scaled_data
+    
+    def split_sequences(self, scaled_data, train_fraction=0.8):
+        """
+        Window a scaled series and split it chronologically
+        
+        Args:
+            scaled_data (array): Scaled values of shape (n_days, 1)
+            train_fraction (float): Share of windows used for training
+            
+        Returns:
+            tuple: (X_train, y_train, X_test, y_test)
+        """
         X, y = self._create_sequences(scaled_data)
         
-        # Split into train and test sets (80/20 split)
-        split_index = int(len(X) * 0.8)
-        X_train, X_test = X[:split_index], X[split_index:]
-        y_train, y_test = y[:split_index], y[split_index:]
+        split_index = int(len(X) * train_fraction)
+        return X[:split_index], y[:split_index], X[split_index:], y[split_index:]
+    
+    def fill_missing_dates_batches(self, batches, target_column='page_visits'):
+        """
+        Stream a target series out of time-ordered record batches, zero-filling gaps
+        
+        Each batch is filled by _fill_missing_dates and the steps between
+        batches are zero-filled, so the concatenated output is the series
+        prepare_series builds from the same rows.
+        
+        Args:
+            batches (iterable): Structured arrays with time_column and target_column fields
+            target_column (str): Field to extract
+            
+        Yields:
+            numpy array: Consecutive float64 values, one per step (missing steps are 0)
+        """
+        time_column = self.time_column
+        step = pd.Timedelta(days=1) if self.freq == 'D' else self.freq
+        next_time = None
+        
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+            
+            df = pd.DataFrame({
+                time_column: pd.to_datetime(batch[time_column]),
+                target_column: batch[target_column]
+            })
+            filled = self._fill_missing_dates(df, target_column)
+            values = filled[target_column].to_numpy(dtype=np.float64)
+            
+            first_time = filled[time_column].iloc[0]
+            if next_time is not None and first_time > next_time:
+                values = np.concatenate([np.zeros((first_time - next_time) // step), values])
+            next_time = filled[time_column].iloc[-1] + step
+            
+            yield values
+    
+    def prepare_data_batches(self, batch_source, target_column='page_visits'):
+        """
+        Prepare LSTM training data from streamed record batches
+        
+        Makes two passes over batch_source: the first fits the scaler with
+        partial_fit, the second scales values batch by batch. Only the scaled
+        target series (8 bytes per day) is kept, and the windows are strided
+        views over it, so peak memory does not depend on the width of the
+        source rows or on materializing a DataFrame.
+        
+        Args:
+            batch_source (callable): Returns a fresh iterable of record batches
+                (e.g. lambda: loader.iter_daily_metrics(start, end))
+            target_column (str): Field to predict
+            
+        Returns:
+            tuple: (X_train, y_train, X_test, y_test, scaler)
+        """
+        # Pass 1: fit the scaler
+        self.scaler = MinMaxScaler(feature_range=(0, 1))
+        n_values = 0
+        for values in self.fill_missing_dates_batches(batch_source(), target_column):
+            self.scaler.partial_fit(values.reshape(-1, 1))
+            n_values += len(values)
+        
+        if n_values == 0:
+            raise ValueError("No data found for the specified date range")
+        self.is_fitted = True
+        
+        # Pass 2: scale into one preallocated array
+        scaled_data = np.empty((n_values, 1), dtype=np.float64)
+        offset = 0
+        for values in self.fill_missing_dates_batches(batch_source(), target_column):
+            scaled_data[offset:offset + len(values)] = self.scaler.transform(values.reshape(-1, 1))
+            offset += len(values)
+        
+        if offset != n_values:
+            raise ValueError("Data changed between passes; retry the load")
+        
+        # Create sequences and split into train and test sets (80/20 split)
+        X_train, y_train, X_test, y_test = self.split_sequences(scaled_data, train_fraction=0.8)
         
         return X_train, y_train, X_test, y_test, self.scaler
     
     def _fill_missing_dates(self, df, target_column):
-        """Fill missing dates with 0 values"""
+        """Fill missing dates (or sub-daily buckets) with 0 values"""
+        time_column = self.time_column
+        
         # Create complete date range
-        date_range = pd.date_range(start=df['date'].min(), end=df['date'].max(), freq='D')
+        date_range = pd.date_range(start=df[time_column].min(), end=df[time_column].max(), freq=self.freq)
         
         # Create complete dataframe
-        complete_df = pd.DataFrame({'date': date_range})
-        complete_df = complete_df.merge(df, on='date', how='left')
+        complete_df = pd.DataFrame({time_column: date_range})
+        complete_df = complete_df.merge(df, on=time_column, how='left')
         
         # Fill missing values with 0
         complete_df[target_column] = complete_df[target_column].fillna(0)
         
         return complete_df
     
-    def _create_sequences(self, data):
-        """Create input sequences and target values for LSTM"""
-        X, y = [], []
+    def _create_sequences(self, data, contiguous=None):
+        """
+        Create input sequences and target values for LSTM
+        
+        Windows are strided views over data, so no window is copied unless
+        contiguous copies are requested.
+        
+        Args:
+            data (array): Scaled values, shape (n,) or (n, features)
+            contiguous (bool): Override contiguous_sequences for this call
+            
+        Returns:
+            tuple: (X, y) with shapes (samples, sequence_length, features) and
+                (samples, prediction_horizon, features)
+        """
+        if contiguous is None:
+            contiguous = self.contiguous_sequences
+        
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        
+        window = self.sequence_length + self.prediction_horizon
+        n_samples = len(data) - window + 1
         
-        for i in range(len(data) - self.sequence_length - self.prediction_horizon + 1):
-            # Input sequence
-            X.append(data[i:(i + self.sequence_length)])
-            # Target sequence
-            y.append(data[(i + self.sequence_length):(i + self.sequence_length + self.prediction_horizon)])
+        if n_samples <= 0:
+            return (
+                np.empty((0, self.sequence_length) + data.shape[1:], dtype=data.dtype),
+                np.empty((0, self.prediction_horizon) + data.shape[1:], dtype=data.dtype)
+            )
         
-        return np.array(X), np.array(y)
+        # (samples, features, window) -> (samples, window, features)
+        windows = sliding_window_view(data, window, axis=0).swapaxes(1, 2)
+        X = windows[:, :self.sequence_length]
+        y = windows[:, self.sequence_length:]
+        
+        if contiguous:
+            return np.ascontiguousarray(X), np.ascontiguousarray(y)
+        
+        return X, y
+    
+    def set_scaler(self, scaler):
+        """
+        Use a scaler fitted elsewhere (e.g. loaded with a trained model)
+        
+        Args:
+            scaler (MinMaxScaler): Fitted scaler
+        """
+        self.scaler = scaler
+        self.is_fitted = True
     
     def inverse_transform(self, scaled_data):
         """Inverse transform scaled data back to original scale"""
@@ -147,39 +309,30 @@ class DataProcessor:
             'mape': mape
         }
     
-    def add_features(self, df):
+    def add_features(self, df, metrics=('page_visits',), specs=None):
         """
         Add engineered features to the dataset
         
+        Sub-daily series get windows and lags of one day and one week of
+        buckets plus intraday calendar features.
+        
         Args:
             df (DataFrame): Input dataframe
+            metrics (iterable): Metric columns to derive rolling means and lags from
+            specs (list): Explicit FeatureSpec list (overrides metrics)
             
         Returns:
             DataFrame: DataFrame with additional features
         """
-        df = df.copy()
-        
-        # Day of week (0=Monday, 6=Sunday)
-        df['day_of_week'] = pd.to_datetime(df['date']).dt.dayofweek
-        
-        # Day of month
-        df['day_of_month'] = pd.to_datetime(df['date']).dt.day
-        
-        # Month
-        df['month'] = pd.to_datetime(df['date']).dt.month
-        
-        # Weekend flag
-        df['is_weekend'] = df['day_of_week'].isin([5, 6]).astype(int)
-        
-        # Rolling averages
-        df['page_visits_ma7'] = df['page_visits'].rolling(window=7, min_periods=1).mean()
-        df['page_visits_ma30'] = df['page_visits'].rolling(window=30, min_periods=1).mean()
-        
-        # Lag features
-        df['page_visits_lag1'] = df['page_visits'].shift(1)
-        df['page_visits_lag7'] = df['page_visits'].shift(7)
-        
-        # Fill NaN values
-        df = df.fillna(0)
-        
-        return df 
\ No newline at end of file
+        if specs is None and self.granularity == DAILY:
+            specs = default_feature_specs(metrics)
+        elif specs is None:
+            per_day = buckets_per_day(self.granularity)
+            specs = default_feature_specs(
+                metrics,
+                windows=(per_day, 7 * per_day),
+                lags=(1, per_day, 7 * per_day),
+                calendar=CALENDAR_FEATURES + INTRADAY_FEATURES
+            )
+        
+        return FeatureEngine(specs).transform(df)
@@ -0,0 +1,317 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Metric columns available in daily_metrics
+DAILY_METRICS = ('page_visits', 'page_views', 'avg_time_on_page', 'bounce_rate', 'unique_visitors')
+
+CALENDAR_FEATURES = ('day_of_week', 'day_of_month', 'month', 'is_weekend')
+
+# Calendar features of sub-daily series (need a 'timestamp' column)
+INTRADAY_FEATURES = ('hour_of_day', 'minute_of_day')
+
+
+def metric_model_version(model_version, metric='page_visits'):
+    """
+    Version string used in model file names for a metric
+
+    page_visits keeps the plain version (lstm_model_v1.0.0.h5) so existing
+    models load unchanged; other metrics are prefixed (lstm_model_page_views_v1.0.0.h5).
+    """
+    if metric == 'page_visits':
+        return model_version
+    return f"{metric}_{model_version}"
+
+
+class FeatureSpec:
+    def __init__(self, kind, column=None, param=None):
+        """
+        Declarative description of one engineered feature
+
+        Args:
+            kind (str): 'calendar', 'rolling_mean' or 'lag'
+            column (str): Metric column (rolling_mean and lag) or calendar feature name
+            param (int): Window size (rolling_mean) or lag in rows (lag)
+        """
+        if kind not in ('calendar', 'rolling_mean', 'lag'):
+            raise ValueError(f"Unknown feature kind: {kind}")
+        if kind == 'calendar' and column not in CALENDAR_FEATURES + INTRADAY_FEATURES:
+            raise ValueError(f"Unknown calendar feature: {column}")
+        if kind != 'calendar' and (param is None or param < 1):
+            raise ValueError(f"{kind} feature needs a positive window/lag")
+
+        self.kind = kind
+        self.column = column
+        self.param = param
+
+    @property
+    def name(self):
+        """Output column name"""
+        if self.kind == 'calendar':
+            return self.column
+        if self.kind == 'rolling_mean':
+            return f"{self.column}_ma{self.param}"
+        return f"{self.column}_lag{self.param}"
+
+    @property
+    def key(self):
+        return (self.kind, self.column, self.param)
+
+    def __repr__(self):
+        return f"FeatureSpec({self.kind!r}, {self.column!r}, {self.param!r})"
+
+    @classmethod
+    def calendar(cls, name):
+        return cls('calendar', name)
+
+    @classmethod
+    def rolling_mean(cls, column, window):
+        return cls('rolling_mean', column, window)
+
+    @classmethod
+    def lag(cls, column, lag):
+        return cls('lag', column, lag)
+
+
+def default_feature_specs(metrics=('page_visits',), windows=(7, 30), lags=(1, 7),
+                          calendar=CALENDAR_FEATURES):
+    """
+    Build the standard feature set for one or more metric columns
+
+    Args:
+        metrics (iterable): Metric columns to derive rolling means and lags from
+        windows (iterable): Rolling-mean window sizes
+        lags (iterable): Lags in rows
+        calendar (iterable): Calendar features to include
+
+    Returns:
+        list: FeatureSpec objects (calendar features first)
+    """
+    specs = [FeatureSpec.calendar(name) for name in calendar]
+    for metric in metrics:
+        specs.extend(FeatureSpec.rolling_mean(metric, window) for window in windows)
+        specs.extend(FeatureSpec.lag(metric, lag) for lag in lags)
+    return specs
+
+
+def rolling_mean(values, window, min_periods=1):
+    """
+    Trailing rolling mean that ignores NaN, computed with cumulative sums
+
+    Matches pandas Series.rolling(window, min_periods).mean().
+
+    Args:
+        values (array): 1-D float values
+        window (int): Window size
+        min_periods (int): Minimum non-NaN values for a result
+
+    Returns:
+        numpy array: Rolling means (NaN where fewer than min_periods values)
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    window_sums = sums[ends] - sums[starts]
+    window_counts = counts[ends] - counts[starts]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = window_sums / window_counts
+    means[window_counts < min_periods] = np.nan
+    return means
+
+
+def lag(values, periods):
+    """Shift values down by periods rows, padding with NaN"""
+    shifted = np.full(len(values), np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+
+class FeatureCache:
+    def __init__(self, max_entries=16):
+        """
+        Small LRU cache of engineered feature frames keyed on input fingerprint
+
+        Args:
+            max_entries (int): Maximum number of cached frames
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key, frame):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = frame
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every FeatureEngine in the process so training and inference reuse frames
+shared_feature_cache = FeatureCache()
+
+
+class FeatureEngine:
+    def __init__(self, specs=None, cache=shared_feature_cache):
+        """
+        Compute a list of feature specs in a single pass
+
+        Args:
+            specs (list): FeatureSpec objects (defaults to default_feature_specs())
+            cache (FeatureCache): Cache for computed frames (None disables caching)
+        """
+        self.specs = list(specs) if specs is not None else default_feature_specs()
+        self.cache = cache
+
+    def fingerprint(self, df, days=None):
+        """
+        Hash the input frame together with the feature specs
+
+        Numeric columns are hashed from their raw buffers, which is much
+        cheaper than hashing Python objects row by row.
+
+        Args:
+            df (DataFrame): Input dataframe
+            days (array): df['date'] already converted to datetime64[D]
+
+        Returns:
+            str: Hex digest identifying (specs, df contents)
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([spec.key for spec in self.specs]).encode())
+        digest.update(repr(list(df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy().tobytes())
+
+        for column in df.columns:
+            if column == 'date' and days is not None:
+                values = days
+            elif isinstance(df[column].dtype, pd.DatetimeTZDtype):
+                digest.update(str(df[column].dtype).encode())
+                values = df[column].array.asi8
+            else:
+                values = df[column].to_numpy()
+            if values.dtype.kind not in 'biufmM':
+                values = pd.util.hash_pandas_object(df[column], index=False).to_numpy()
+            digest.update(np.ascontiguousarray(values).tobytes())
+
+        return digest.hexdigest()
+
+    def transform(self, df):
+        """
+        Add every feature in self.specs to df
+
+        Sub-daily frames carry a 'timestamp' column instead of 'date'; their
+        calendar features follow the local wall clock of its time zone.
+
+        Args:
+            df (DataFrame): Input dataframe with a 'date' (or 'timestamp') column and the metric columns
+
+        Returns:
+            DataFrame: Input columns (NaN filled with 0) plus the feature columns
+        """
+        # Convert dates once for both the fingerprint and the calendar features
+        days = minutes = None
+        if 'date' in df.columns:
+            days = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]')
+        elif 'timestamp' in df.columns:
+            timestamps = pd.DatetimeIndex(df['timestamp'])
+            if timestamps.tz is not None:
+                timestamps = timestamps.tz_localize(None)
+            minutes = timestamps.to_numpy(dtype='datetime64[m]')
+            days = minutes.astype('datetime64[D]')
+
+        key = None
+        if self.cache is not None:
+            key = self.fingerprint(df, days)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.copy(deep=False)
+
+        result = self._compute(df, days, minutes)
+
+        if key is not None:
+            self.cache.put(key, result)
+            return result.copy(deep=False)
+
+        return result
+
+    def _compute(self, df, days, minutes=None):
+        n_rows = len(df)
+        calendar_specs = [spec for spec in self.specs if spec.kind == 'calendar']
+        numeric_specs = [spec for spec in self.specs if spec.kind != 'calendar']
+
+        # Preallocate one block per dtype
+        calendar = np.empty((n_rows, len(calendar_specs)), dtype=np.int64)
+        numeric = np.empty((n_rows, len(numeric_specs)), dtype=np.float64)
+
+        if calendar_specs:
+            if days is None:
+                raise ValueError("DataFrame must contain a 'date' column for calendar features")
+            months = days.astype('datetime64[M]')
+            day_of_week = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+
+            columns = {
+                'day_of_week': day_of_week,
+                'day_of_month': (days - months).astype(np.int64) + 1,
+                'month': months.astype(np.int64) % 12 + 1,
+                'is_weekend': (day_of_week >= 5).astype(np.int64)
+            }
+            if minutes is not None:
+                minute_of_day = (minutes - days).astype(np.int64)
+                columns['hour_of_day'] = minute_of_day // 60
+                columns['minute_of_day'] = minute_of_day
+            elif any(spec.column in INTRADAY_FEATURES for spec in calendar_specs):
+                raise ValueError("DataFrame must contain a 'timestamp' column for intraday features")
+            for i, spec in enumerate(calendar_specs):
+                calendar[:, i] = columns[spec.column]
+
+        metric_values = {}
+        for i, spec in enumerate(numeric_specs):
+            values = metric_values.get(spec.column)
+            if values is None:
+                values = df[spec.column].to_numpy(dtype=np.float64)
+                metric_values[spec.column] = values
+
+            if spec.kind == 'rolling_mean':
+                numeric[:, i] = rolling_mean(values, spec.param)
+            else:
+                numeric[:, i] = lag(values, spec.param)
+
+        np.nan_to_num(numeric, copy=False, nan=0.0)
+
+        features = pd.concat([
+            pd.DataFrame(calendar, columns=[spec.name for spec in calendar_specs], index=df.index),
+            pd.DataFrame(numeric, columns=[spec.name for spec in numeric_specs], index=df.index)
+        ], axis=1)
+
+        overlap = [name for name in features.columns if name in df.columns]
+        base = df.drop(columns=overlap) if overlap else df
+        if base.isna().to_numpy().any():
+            base = base.fillna(0)
+
+        return pd.concat([base, features], axis=1)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+# Daily series come from daily_metrics; finer granularities are bucketed from page_visits
+DAILY = 'D'
+SECONDS_PER_DAY = 86400
+
+
+def parse_granularity(granularity):
+    """
+    Bucket length in seconds for a pandas-style frequency ('D', '1h', '15min')
+
+    Sub-daily buckets must be a whole number of minutes (at least 5) that
+    divides an hour. Bucket boundaries then line up with every hour, so a DST shift
+    (a whole hour) never splits a bucket and the buckets stay evenly spaced
+    in UTC.
+
+    Args:
+        granularity (str): Frequency string
+
+    Returns:
+        int: Seconds per bucket
+    """
+    try:
+        seconds = to_offset(granularity).nanos // 10**9
+    except (ValueError, TypeError):
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
+    if seconds == SECONDS_PER_DAY or (300 <= seconds <= 3600 and seconds % 60 == 0 and 3600 % seconds == 0):
+        return int(seconds)
+    raise ValueError(f"Unsupported granularity: {granularity} (use 'D', '1h' or 5-30 minutes dividing an hour)")
+
+
+def granularity_label(granularity):
+    """Canonical label for a granularity: 'D', '1h' or '{N}min'"""
+    seconds = parse_granularity(granularity)
+    if seconds == SECONDS_PER_DAY:
+        return DAILY
+    if seconds == 3600:
+        return '1h'
+    return f"{seconds // 60}min"
+
+
+def is_daily(granularity):
+    return parse_granularity(granularity) == SECONDS_PER_DAY
+
+
+def buckets_per_day(granularity):
+    return SECONDS_PER_DAY // parse_granularity(granularity)
+
+
+def bucket_model_version(model_version, granularity):
+    """
+    Version string used in file names for a sub-daily visits model
+
+    lstm_model_visits_1h_v1.0.0.h5, lstm_model_visits_15min_v1.0.0.h5, ...
+    """
+    return f"visits_{granularity_label(granularity)}_{model_version}"
+
+
+def floor_to_buckets(utc_ns, seconds, timezone='UTC'):
+    """
+    Start of the local wall-clock bucket containing each instant
+
+    Each instant is shifted by its own UTC offset, floored and shifted back,
+    so buckets follow the local clock across DST changes: the repeated hour
+    when clocks go back becomes two distinct buckets and the skipped hour
+    simply has none.
+
+    Args:
+        utc_ns (array): Instants as int64 nanoseconds since the epoch (UTC)
+        seconds (int): Bucket length in seconds (dividing an hour)
+        timezone (str): Time zone whose wall clock defines the buckets
+
+    Returns:
+        numpy array: Bucket starts as int64 nanoseconds since the epoch (UTC)
+    """
+    utc_ns = np.asarray(utc_ns, dtype=np.int64)
+    local_ns = pd.to_datetime(utc_ns, utc=True).tz_convert(timezone).tz_localize(None).asi8
+    step = np.int64(seconds) * 10**9
+    return local_ns - local_ns % step - (local_ns - utc_ns)
+
+
+def current_bucket_start(granularity, timezone='UTC', now=None):
+    """
+    Start of the bucket that is still filling; earlier buckets are complete
+
+    Args:
+        granularity (str): Bucket length
+        timezone (str): Time zone of the buckets
+        now (Timestamp): Current time (defaults to the clock)
+
+    Returns:
+        Timestamp: tz-aware bucket start in timezone
+    """
+    now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+    start_ns = floor_to_buckets([now.value], parse_granularity(granularity), timezone)[0]
+    return pd.Timestamp(start_ns, tz='UTC').tz_convert(timezone)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+
+def _bit_length(values):
+    """
+    Number of significant bits of each uint64 (0 for 0)
+
+    Binary search over right shifts, in integers only; a float64 log2
+    rounds values just below a power of two up to it.
+
+    Args:
+        values (numpy array): uint64 values
+
+    Returns:
+        numpy array: Bit lengths (int64)
+    """
+    values = values.astype(np.uint64)
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >> np.uint64(shift)
+        above = high > 0
+        length[above] += shift
+        values = np.where(above, high, values)
+    return length + (values > 0)
+
+
+class HyperLogLog:
+    def __init__(self, precision=14):
+        """
+        HyperLogLog sketch for approximate distinct counts
+
+        Memory is 2**precision bytes regardless of how many values are added;
+        the standard error is about 1.04 / sqrt(2**precision) (0.8% at 14).
+        Sketches of the same precision can be merged, so per-day sketches
+        can be combined into weekly or monthly uniques.
+
+        Args:
+            precision (int): Number of index bits (4-16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+
+        self.precision = precision
+        self.n_registers = 1 << precision
+        self.registers = np.zeros(self.n_registers, dtype=np.uint8)
+
+    def add(self, values):
+        """
+        Add values to the sketch (vectorized)
+
+        Args:
+            values (iterable): Hashable values, e.g. visitor IDs
+        """
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        if values.empty:
+            return
+
+        hashes = pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+        value_bits = 64 - self.precision
+        index = (hashes >> np.uint64(value_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << value_bits) - 1)
+
+        # Rank = position of the first 1 bit in the remaining bits
+        rank = (value_bits - _bit_length(remainder) + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Fold another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """
+        Estimate the number of distinct values added
+
+        Returns:
+            int: Estimated distinct count
+        """
+        m = self.n_registers
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+
+        # Small-range correction (linear counting)
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+
+        return int(round(estimate))
+
+    def __len__(self):
+        return self.count()
@@ -0,0 +1,204 @@
+import os
+from datetime import timedelta
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from preprocessing.features import FeatureSpec, default_feature_specs
+
+
+class IncrementalFeatureBuilder:
+    def __init__(self, specs=None):
+        """
+        Stateful feature builder that appends one day at a time
+
+        Keeps a ring buffer per metric that is just large enough for the
+        longest rolling window or lag, so appending a day costs O(window)
+        regardless of how much history came before. Missing days are filled
+        with 0, matching DataProcessor._fill_missing_dates.
+
+        Args:
+            specs (list): FeatureSpec objects (defaults to default_feature_specs())
+        """
+        self.specs = list(specs) if specs is not None else default_feature_specs()
+        self.metrics = sorted({spec.column for spec in self.specs if spec.kind != 'calendar'})
+
+        sizes = [spec.param for spec in self.specs if spec.kind == 'rolling_mean']
+        sizes += [spec.param + 1 for spec in self.specs if spec.kind == 'lag']
+        self.capacity = max(sizes) if sizes else 1
+
+        self.reset()
+
+    def reset(self):
+        """Forget all history"""
+        self.buffers = {metric: np.full(self.capacity, np.nan) for metric in self.metrics}
+        self.position = 0  # Next slot to write
+        self.n_seen = 0
+        self.last_date = None
+
+    def _push(self, values):
+        for metric in self.metrics:
+            self.buffers[metric][self.position] = values.get(metric, np.nan)
+        self.position = (self.position + 1) % self.capacity
+        self.n_seen += 1
+
+    def _recent(self, metric, count):
+        """Last count values for metric, oldest first"""
+        count = min(count, self.n_seen, self.capacity)
+        indices = (self.position - count + np.arange(count)) % self.capacity
+        return self.buffers[metric][indices]
+
+    def _features(self, date):
+        day_of_week = date.weekday()
+        calendar = {
+            'day_of_week': day_of_week,
+            'day_of_month': date.day,
+            'month': date.month,
+            'is_weekend': int(day_of_week >= 5)
+        }
+
+        row = {}
+        for spec in self.specs:
+            if spec.kind == 'calendar':
+                row[spec.name] = calendar[spec.column]
+            elif spec.kind == 'rolling_mean':
+                window = self._recent(spec.column, spec.param)
+                valid = window[~np.isnan(window)]
+                row[spec.name] = float(valid.mean()) if len(valid) else 0.0
+            else:
+                if self.n_seen > spec.param:
+                    value = self._recent(spec.column, spec.param + 1)[0]
+                    row[spec.name] = 0.0 if np.isnan(value) else float(value)
+                else:
+                    row[spec.name] = 0.0
+        return row
+
+    def update(self, date, values):
+        """
+        Append one day of metrics and return its feature row
+
+        Args:
+            date (date): Day of the metrics (must be after the last appended day)
+            values (dict): Metric column -> value
+
+        Returns:
+            dict: Feature name -> value for this day
+        """
+        date = pd.Timestamp(date).date()
+
+        if self.last_date is not None:
+            if date <= self.last_date:
+                raise ValueError(f"Date {date} is not after last appended date {self.last_date}")
+
+            gap = (date - self.last_date).days - 1
+            if gap >= self.capacity:
+                # Every buffered value would be overwritten by zeros anyway
+                for metric in self.metrics:
+                    self.buffers[metric][:] = 0.0
+                self.n_seen += gap
+            else:
+                for _ in range(gap):
+                    self._push({metric: 0.0 for metric in self.metrics})
+
+        self._push(values)
+        self.last_date = date
+
+        return self._features(date)
+
+    def update_from_frame(self, df):
+        """
+        Append every row of df newer than the last appended day
+
+        A fresh builder only replays the last `capacity` days, so its state is
+        exact for the next day but the returned rows for the earliest replayed
+        days see a truncated history.
+
+        Args:
+            df (DataFrame): Daily metrics with a 'date' column
+
+        Returns:
+            DataFrame: Feature rows for the appended days
+        """
+        df = df.sort_values('date')
+        dates = pd.to_datetime(df['date']).dt.date
+
+        if self.last_date is None and len(df):
+            # Only the tail can influence the next feature row
+            first_needed = dates.iloc[-1] - timedelta(days=self.capacity - 1)
+            df, dates = df[dates >= first_needed], dates[dates >= first_needed]
+        elif self.last_date is not None:
+            df, dates = df[dates > self.last_date], dates[dates > self.last_date]
+
+        rows = []
+        columns = [metric for metric in self.metrics if metric in df.columns]
+        for date, values in zip(dates, df[columns].to_dict('records')):
+            rows.append({'date': date, **values, **self.update(date, values)})
+
+        return pd.DataFrame(rows)
+
+    def latest_features(self):
+        """
+        Get the feature row of the last appended day
+
+        Returns:
+            dict: Feature name -> value (empty before the first day)
+        """
+        if self.last_date is None:
+            return {}
+        return self._features(self.last_date)
+
+    def current_sequence(self, metric, length):
+        """
+        Get the most recent values of a metric (e.g. the model input window)
+
+        Args:
+            metric (str): Metric column
+            length (int): Number of values (at most the buffer capacity)
+
+        Returns:
+            numpy array: Values, oldest first, NaN replaced with 0
+        """
+        return np.nan_to_num(self._recent(metric, length), nan=0.0)
+
+    def save(self, path):
+        """
+        Checkpoint the builder state to disk (written atomically)
+
+        Args:
+            path (str): Checkpoint file path
+        """
+        state = {
+            'specs': [spec.key for spec in self.specs],
+            'buffers': self.buffers,
+            'position': self.position,
+            'n_seen': self.n_seen,
+            'last_date': self.last_date
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Restore a builder from a checkpoint written by save()
+
+        Args:
+            path (str): Checkpoint file path
+
+        Returns:
+            IncrementalFeatureBuilder: Builder ready to append the next day
+        """
+        state = joblib.load(path)
+        builder = cls([FeatureSpec(*key) for key in state['specs']])
+        builder.buffers = state['buffers']
+        builder.position = state['position']
+        builder.n_seen = state['n_seen']
+        builder.last_date = state['last_date']
+        return builder
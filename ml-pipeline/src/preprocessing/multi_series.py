@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from preprocessing.features import metric_model_version
+
+
+def site_model_version(model_version, metric='page_visits'):
+    """
+    Version string used in file names for a global (all-sites) model
+
+    lstm_model_sites_v1.0.0.h5 for page_visits, lstm_model_sites_page_views_v1.0.0.h5
+    for other metrics.
+    """
+    return f"sites_{metric_model_version(model_version, metric)}"
+
+
+def pivot_series(df, target_column='page_visits', end_date=None):
+    """
+    Turn long (site_id, date, value) rows into one gap-free row per site
+
+    Missing days are 0, as in DataProcessor._fill_missing_dates. Every row
+    spans the same dates, from the earliest date in df to end_date.
+
+    Args:
+        df (DataFrame): Rows with site_id, date and target_column
+        target_column (str): Column to pivot
+        end_date (date): Last day of the panel (default: latest date in df)
+
+    Returns:
+        tuple: (site_ids array, DatetimeIndex of days, values (n_sites, n_days),
+            first observed day index per site)
+    """
+    if df.empty:
+        return np.array([], dtype=object), pd.DatetimeIndex([]), np.zeros((0, 0)), np.zeros(0, dtype=np.int64)
+
+    days = pd.to_datetime(df['date']).to_numpy().astype('datetime64[D]')
+    first_day = days.min()
+    last_day = np.datetime64(pd.Timestamp(end_date).date(), 'D') if end_date is not None else days.max()
+
+    sites = pd.Categorical(df['site_id'].astype(str))
+    offsets = (days - first_day).astype(np.int64)
+    keep = offsets <= (last_day - first_day).astype(np.int64)
+
+    n_days = int((last_day - first_day).astype(np.int64)) + 1
+    values = np.zeros((len(sites.categories), n_days), dtype=np.float64)
+    rows = sites.codes[keep]
+    values[rows, offsets[keep]] = np.nan_to_num(df[target_column].to_numpy(dtype=np.float64)[keep], nan=0.0)
+
+    # First day each site reported anything; earlier zeros are not real traffic
+    first_observed = np.full(len(sites.categories), n_days, dtype=np.int64)
+    np.minimum.at(first_observed, rows, offsets[keep])
+
+    dates = pd.date_range(start=pd.Timestamp(first_day), periods=n_days, freq='D')
+    return np.asarray(sites.categories, dtype=object), dates, values, first_observed
+
+
+class SeriesScaler:
+    def __init__(self):
+        """
+        Min-max scaling to [0, 1] with separate parameters per series
+
+        A global model sees every site on the same scale, so a site with ten
+        visits a day and one with a million share one set of weights. The
+        per-site parameters are stored with the model; sites first seen at
+        serving time are scaled on their own recent history.
+        """
+        self.site_ids = np.array([], dtype=object)
+        self.data_min_ = np.zeros(0)
+        self.data_range_ = np.ones(0)
+        self._index = {}
+
+    def fit(self, site_ids, values):
+        """
+        Fit per-site parameters
+
+        Args:
+            site_ids (array): Site ID per row of values
+            values (array): (n_sites, n_days) series in original scale (NaN days are ignored)
+
+        Returns:
+            SeriesScaler: self
+        """
+        self.site_ids = np.asarray(site_ids, dtype=object)
+        self.data_min_, self.data_range_ = self._min_range(values)
+        self._index = {site_id: row for row, site_id in enumerate(self.site_ids)}
+        return self
+
+    @staticmethod
+    def _min_range(values):
+        if not values.shape[1]:
+            return np.zeros(len(values)), np.ones(len(values))
+        data_min = np.nanmin(values, axis=1)
+        data_range = np.nanmax(values, axis=1) - data_min
+        # Constant series map to 0 instead of dividing by zero
+        data_range[data_range == 0] = 1.0
+        return data_min, data_range
+
+    def params(self, site_ids, values=None):
+        """
+        Scaling parameters for sites, fitting unknown sites on their own values
+
+        Args:
+            site_ids (array): Site IDs
+            values (array): (n_sites, n_days) recent history, for unknown sites
+
+        Returns:
+            tuple: (data_min, data_range), each of shape (n_sites,)
+        """
+        rows = np.array([self._index.get(site_id, -1) for site_id in site_ids], dtype=np.int64)
+        known = rows >= 0
+
+        data_min = np.zeros(len(rows))
+        data_range = np.ones(len(rows))
+        data_min[known] = self.data_min_[rows[known]]
+        data_range[known] = self.data_range_[rows[known]]
+
+        if values is not None and not known.all():
+            data_min[~known], data_range[~known] = self._min_range(values[~known])
+
+        return data_min, data_range
+
+    def transform(self, values, data_min, data_range):
+        """Scale (n_sites, ...) values with per-site parameters"""
+        shape = (-1,) + (1,) * (values.ndim - 1)
+        return (values - data_min.reshape(shape)) / data_range.reshape(shape)
+
+    def inverse_transform(self, scaled, data_min, data_range):
+        """Undo transform for (n_sites, ...) scaled values"""
+        shape = (-1,) + (1,) * (scaled.ndim - 1)
+        return scaled * data_range.reshape(shape) + data_min.reshape(shape)
+
+    def __len__(self):
+        return len(self.site_ids)
+
+
+class MultiSeriesProcessor:
+    def __init__(self, sequence_length=7, prediction_horizon=7):
+        """
+        Data preparation for one global model over many site series
+
+        Args:
+            sequence_length (int): Number of days to use as input sequence
+            prediction_horizon (int): Number of days to predict ahead
+        """
+        self.sequence_length = sequence_length
+        self.prediction_horizon = prediction_horizon
+        self.scaler = SeriesScaler()
+        self.is_fitted = False
+
+    def prepare_data(self, df, target_column='page_visits', train_fraction=0.8):
+        """
+        Build training windows from every site at once
+
+        Each site is scaled with its own parameters and windowed with strided
+        views over the (n_sites, n_days) panel. Windows that start before a
+        site's first reported day are dropped. The train/test split is
+        chronological within each site, so no site's test days leak into
+        training.
+
+        Args:
+            df (DataFrame): Rows with site_id, date and target_column
+            target_column (str): Column to predict
+            train_fraction (float): Share of each site's windows used for training
+
+        Returns:
+            tuple: (X_train, y_train, X_test, y_test, scaler, test_rows) where
+                test_rows is the site row of each test window
+        """
+        if 'site_id' not in df.columns or 'date' not in df.columns or target_column not in df.columns:
+            raise ValueError(f"DataFrame must contain 'site_id', 'date' and '{target_column}' columns")
+
+        site_ids, _, values, first_observed = pivot_series(df, target_column)
+
+        # Fit each site on the days since it started reporting
+        reported = np.arange(values.shape[1])[np.newaxis, :] >= first_observed[:, np.newaxis]
+        self.scaler = SeriesScaler().fit(site_ids, np.where(reported, values, np.nan))
+        self.is_fitted = True
+
+        scaled = self.scaler.transform(values, self.scaler.data_min_, self.scaler.data_range_)
+
+        window = self.sequence_length + self.prediction_horizon
+        n_windows = scaled.shape[1] - window + 1
+        if n_windows <= 0:
+            raise ValueError("Not enough days of data for the sequence length and horizon")
+
+        # (n_sites, n_windows, window) view; nothing is copied until the masks below
+        windows = sliding_window_view(scaled, window, axis=1)
+
+        valid = reported[:, :n_windows]
+
+        # Rank of each window within its site, for the per-site chronological split
+        rank = np.cumsum(valid, axis=1) - 1
+        n_valid = valid.sum(axis=1, keepdims=True)
+        train = valid & (rank < np.floor(n_valid * train_fraction))
+        test = valid & ~train
+
+        def split(mask):
+            selected = windows[mask]
+            return (
+                selected[:, :self.sequence_length, np.newaxis],
+                selected[:, self.sequence_length:, np.newaxis]
+            )
+
+        X_train, y_train = split(train)
+        X_test, y_test = split(test)
+        test_rows = np.nonzero(test)[0]
+
+        return X_train, y_train, X_test, y_test, self.scaler, test_rows
+
+    @staticmethod
+    def panel_history(df, site_ids, days, target_column='page_visits', end_date=None):
+        """
+        Last days of each requested site's series, in original scale
+
+        Args:
+            df (DataFrame): Recent rows with site_id, date and target_column
+            site_ids (list): Sites to return (sites without rows are reported as missing)
+            days (int): Days of history per site (short histories are zero-padded in front)
+            target_column (str): Column to return
+            end_date (date): Last day of history (default: latest date in df)
+
+        Returns:
+            tuple: (found site IDs, history (n_found, days), missing site IDs)
+        """
+        panel_sites, _, values, _ = pivot_series(df, target_column, end_date=end_date)
+        index = {site_id: row for row, site_id in enumerate(panel_sites)}
+
+        found = [site_id for site_id in site_ids if site_id in index]
+        missing = [site_id for site_id in site_ids if site_id not in index]
+
+        values = values[[index[site_id] for site_id in found]]
+        if values.shape[1] < days:
+            values = np.pad(values, ((0, 0), (days - values.shape[1], 0)))
+
+        return found, values[:, -days:], missing
+
+    def create_prediction_batch(self, df, site_ids, target_column='page_visits', end_date=None):
+        """
+        Input windows for many sites, scaled per site
+
+        Args:
+            df (DataFrame): Recent rows with site_id, date and target_column
+            site_ids (list): Sites to forecast (sites without rows are reported as missing)
+            target_column (str): Column to predict
+            end_date (date): Last day of input (default: latest date in df)
+
+        Returns:
+            tuple: (found site IDs, X (n_sites, sequence_length, 1), data_min, data_range, missing site IDs)
+        """
+        found, history, missing = self.panel_history(
+            df, site_ids, self.sequence_length, target_column, end_date=end_date
+        )
+
+        data_min, data_range = self.scaler.params(found, history)
+        X = self.scaler.transform(history, data_min, data_range)[:, :, np.newaxis]
+
+        return found, X, data_min, data_range, missing
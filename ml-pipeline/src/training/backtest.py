@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import time
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from preprocessing.data_processor import DataProcessor
+
+
+def forecast_errors(actual, predicted):
+    """
+    MAE, RMSE and MAPE per horizon step and overall
+
+    MAPE divides by max(actual, 1), like DataProcessor.evaluate_predictions,
+    so days with zero traffic do not blow up the metric.
+
+    Args:
+        actual (array): (n_origins, horizon) actual values
+        predicted (array): (n_origins, horizon) forecasts
+
+    Returns:
+        dict: {'per_horizon': [...], 'overall': {...}}
+    """
+    errors = predicted - actual
+    abs_errors = np.abs(errors)
+    pct_errors = abs_errors / np.maximum(actual, 1) * 100
+
+    mae = abs_errors.mean(axis=0)
+    rmse = np.sqrt((errors ** 2).mean(axis=0))
+    mape = pct_errors.mean(axis=0)
+
+    return {
+        'per_horizon': [
+            {'horizon': step + 1, 'mae': float(mae[step]), 'rmse': float(rmse[step]), 'mape': float(mape[step])}
+            for step in range(actual.shape[1])
+        ],
+        'overall': {
+            'mae': float(abs_errors.mean()),
+            'rmse': float(np.sqrt((errors ** 2).mean())),
+            'mape': float(pct_errors.mean())
+        }
+    }
+
+
+class Backtester:
+    def __init__(self, sequence_length=7, prediction_horizon=7, batch_size=4096):
+        """
+        Rolling-origin (walk-forward) evaluation of a fixed forecaster
+
+        Every cutoff date ("origin") forecasts the next prediction_horizon
+        days from the sequence_length days before it. All origins share one
+        set of strided sliding windows, and their forecasts run as batched
+        calls to the model instead of one call per origin.
+
+        Args:
+            sequence_length (int): Days of input per forecast
+            prediction_horizon (int): Days forecast per origin
+            batch_size (int): Maximum origins per model call (bounds memory)
+        """
+        self.sequence_length = sequence_length
+        self.prediction_horizon = prediction_horizon
+        self.batch_size = batch_size
+        self.processor = DataProcessor(sequence_length, prediction_horizon)
+
+    def origin_indices(self, n_days, start=None, step=1, max_origins=None):
+        """
+        Positions of the first forecast day for each origin
+
+        Args:
+            n_days (int): Length of the series
+            start (int): First allowed origin position (e.g. the end of the training period)
+            step (int): Days between origins
+            max_origins (int): Keep only the most recent origins
+
+        Returns:
+            numpy array: Origin positions in the series
+        """
+        first = max(self.sequence_length, start or 0)
+        last = n_days - self.prediction_horizon
+        origins = np.arange(first, last + 1, step)
+        if max_origins:
+            origins = origins[-max_origins:]
+        return origins
+
+    def run(self, values, predict_fn, scaler=None, dates=None, start=None, step=1,
+            max_origins=None, return_forecasts=False):
+        """
+        Backtest a forecaster over many origins
+
+        Args:
+            values (array): Daily series in original scale, gap-free and date-ordered
+            predict_fn (callable): Maps (batch, sequence_length, 1) inputs to (batch, horizon) outputs
+            scaler: Fitted scaler applied to inputs and inverted on outputs (None for raw-scale models)
+            dates (array): Dates of values, for labelling origins
+            start (int): First allowed origin position
+            step (int): Days between origins
+            max_origins (int): Keep only the most recent origins
+            return_forecasts (bool): Include the forecast and actual matrices
+
+        Returns:
+            dict: Per-horizon and overall MAE/RMSE/MAPE plus run details
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        origins = self.origin_indices(len(values), start=start, step=step, max_origins=max_origins)
+        if len(origins) == 0:
+            raise ValueError("Series too short for any backtest origin")
+
+        model_input = values.reshape(-1, 1)
+        if scaler is not None:
+            model_input = scaler.transform(model_input)
+
+        # One set of windows; window i forecasts from position i + sequence_length
+        X, _ = self.processor._create_sequences(model_input)
+        _, actual = self.processor._create_sequences(values)
+        sample_index = origins - self.sequence_length
+
+        started = time.perf_counter()
+        forecasts = np.empty((len(origins), self.prediction_horizon))
+        for offset in range(0, len(origins), self.batch_size):
+            batch = sample_index[offset:offset + self.batch_size]
+            output = np.asarray(predict_fn(X[batch])).reshape(len(batch), -1)[:, :self.prediction_horizon]
+            forecasts[offset:offset + len(batch)] = output
+        inference_seconds = time.perf_counter() - started
+
+        if scaler is not None:
+            forecasts = scaler.inverse_transform(forecasts.reshape(-1, 1)).reshape(forecasts.shape)
+
+        actual = actual[sample_index, :, 0]
+        result = forecast_errors(actual, forecasts)
+        result.update({
+            'n_origins': int(len(origins)),
+            'step': step,
+            'sequence_length': self.sequence_length,
+            'prediction_horizon': self.prediction_horizon,
+            'inference_seconds': inference_seconds
+        })
+
+        if dates is not None:
+            dates = pd.to_datetime(pd.Series(dates)).dt.strftime('%Y-%m-%d').to_numpy()
+            result['first_origin'] = dates[origins[0]]
+            result['last_origin'] = dates[origins[-1]]
+
+        if return_forecasts:
+            result['forecasts'] = forecasts
+            result['actual'] = actual
+
+        return result
+
+
+def first_origin_after(dates, cutoff):
+    """
+    Position of the first day after cutoff in a date-ordered series
+
+    Args:
+        dates (array): Dates of the series, ascending
+        cutoff: Last day of the model's training data
+
+    Returns:
+        int: Origin position (len(dates) when no day is after cutoff)
+    """
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize().to_numpy()
+    return int(np.searchsorted(dates, np.datetime64(pd.Timestamp(cutoff).normalize()), side='right'))
+
+
+def training_end_date(model_dir, model_version, metadata):
+    """
+    Last day of a model's training data
+
+    Models saved before the cutoff was recorded fall back to the model
+    file's modification time, like PredictionService.
+    """
+    if metadata.get('training_end_date'):
+        return pd.Timestamp(metadata['training_end_date']).normalize()
+    model_path = os.path.join(model_dir, f'lstm_model_{model_version}.h5')
+    return pd.Timestamp(os.path.getmtime(model_path), unit='s').normalize()
+
+
+def holdout_scores(models, df, target_column, holdout_days):
+    """
+    Backtest several models over the same most recent days
+
+    Every model forecasts from the origins whose horizon falls within the
+    last holdout_days days of df, so the errors are comparable however
+    much data, and which test split, each model was trained with.
+
+    Args:
+        models (dict): name -> (model, metadata) as returned by load_model
+        df (DataFrame): Daily metrics ending at the last day to score
+        target_column (str): Metric to score
+        holdout_days (int): Days at the end of df that are forecast
+
+    Returns:
+        dict: name -> overall MAE/RMSE/MAPE plus n_origins
+    """
+    processor = DataProcessor()
+    df = processor._fill_missing_dates(df.sort_values('date').reset_index(drop=True), target_column)
+    values = df[target_column].to_numpy(dtype=np.float64)
+    start = len(values) - holdout_days
+
+    scores = {}
+    for name, (model, metadata) in models.items():
+        # Legacy models without a stored scaler were scaled on the data they saw
+        scaler = metadata.get('scaler')
+        if scaler is None:
+            scaler = DataProcessor().scaler.fit(values.reshape(-1, 1))
+        result = Backtester(model.sequence_length, model.prediction_horizon).run(
+            values, model.predict, scaler=scaler, start=start
+        )
+        scores[name] = dict(result['overall'], n_origins=result['n_origins'])
+
+    return scores
+
+
+def load_model(model_dir, model_version):
+    """
+    Load a trained model for backtesting (NumPy runtime when exported)
+
+    Returns:
+        tuple: (model, metadata)
+    """
+    import joblib
+    from models.numpy_lstm import NumpyLSTMModel, weights_path
+
+    model_path = os.path.join(model_dir, f'lstm_model_{model_version}.h5')
+    metadata_path = os.path.join(model_dir, f'metadata_{model_version}.pkl')
+    metadata = joblib.load(metadata_path)
+    sequence_length = metadata['sequence_length']
+    prediction_horizon = metadata['prediction_horizon']
+
+    numpy_path = weights_path(model_dir, model_version)
+    if os.path.exists(numpy_path):
+        return NumpyLSTMModel.load(numpy_path, sequence_length, prediction_horizon, model_version), metadata
+
+    from models.lstm_model import LSTMModel
+    model = LSTMModel(sequence_length, prediction_horizon, model_version)
+    model.load_model(model_path, metadata_path)
+    return model, metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest of a trained model')
+    parser.add_argument('--model-dir', type=str, default='models',
+                       help='Directory containing trained models')
+    parser.add_argument('--model-version', type=str, default='v1.0.0',
+                       help='Model version to backtest')
+    parser.add_argument('--days-back', type=int, default=365,
+                       help='Days of history to backtest over')
+    parser.add_argument('--step', type=int, default=1,
+                       help='Days between forecast origins')
+    parser.add_argument('--max-origins', type=int, default=None,
+                       help='Only evaluate the most recent N origins')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Write the results as JSON to this path')
+    parser.add_argument('--include-training-period', action='store_true',
+                       help='Also forecast from origins inside the training data (in-sample scores)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from config.database import DataLoader
+
+    model, metadata = load_model(args.model_dir, args.model_version)
+    target_column = metadata.get('target_column', 'page_visits')
+
+    end_date = datetime.now().date()
+    df = DataLoader().load_daily_metrics(start_date=end_date - timedelta(days=args.days_back), end_date=end_date)
+    if df.empty:
+        raise SystemExit("No data found for the specified date range")
+
+    processor = DataProcessor(model.sequence_length, model.prediction_horizon)
+    df = processor._fill_missing_dates(df.sort_values('date').reset_index(drop=True), target_column)
+
+    values = df[target_column].to_numpy()
+    
+    # Legacy models without a stored scaler were scaled on the data they saw
+    scaler = metadata.get('scaler')
+    if scaler is None:
+        scaler = processor.scaler.fit(values.reshape(-1, 1))
+    
+    # Only score days the model was not fitted to
+    start = None
+    if not args.include_training_period:
+        cutoff = training_end_date(args.model_dir, args.model_version, metadata)
+        start = first_origin_after(df['date'], cutoff)
+        if start > len(values) - model.prediction_horizon:
+            raise SystemExit(
+                f"No origins after the training cutoff ({cutoff.date()}); wait for more data "
+                "or pass --include-training-period"
+            )
+        print(f"Scoring origins after the training cutoff ({cutoff.date()})")
+
+    backtester = Backtester(model.sequence_length, model.prediction_horizon)
+    result = backtester.run(
+        values,
+        model.predict,
+        scaler=scaler,
+        dates=df['date'],
+        start=start,
+        step=args.step,
+        max_origins=args.max_origins
+    )
+
+    print(f"\nBacktest of {args.model_version} ({target_column}): {result['n_origins']} origins "
+          f"from {result['first_origin']} to {result['last_origin']}, "
+          f"inference {result['inference_seconds']:.3f}s")
+    print(f"{'horizon':>8} {'MAE':>10} {'RMSE':>10} {'MAPE %':>8}")
+    for row in result['per_horizon']:
+        print(f"{row['horizon']:>8} {row['mae']:>10.2f} {row['rmse']:>10.2f} {row['mape']:>8.2f}")
+    overall = result['overall']
+    print(f"{'overall':>8} {overall['mae']:>10.2f} {overall['rmse']:>10.2f} {overall['mape']:>8.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from preprocessing.data_processor import DataProcessor
+
+# Hyperparameters a configuration may set
+SEARCH_PARAMETERS = ('sequence_length', 'prediction_horizon', 'epochs', 'batch_size')
+
+DEFAULT_SEARCH_SPACE = {
+    'sequence_length': [7, 14, 30],
+    'prediction_horizon': [7],
+    'epochs': [100],
+    'batch_size': [16, 32]
+}
+
+# Set in each worker by _init_worker
+_worker_state = {}
+
+
+def expand_grid(space):
+    """
+    Every combination of the values in a search space
+
+    Args:
+        space (dict): Parameter -> list of values
+
+    Returns:
+        list: Configuration dicts
+    """
+    unknown = set(space) - set(SEARCH_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown search parameters: {sorted(unknown)}")
+
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def sample_configurations(space, n_trials, seed=None):
+    """
+    Random sample of distinct configurations from a search space
+
+    Args:
+        space (dict): Parameter -> list of values
+        n_trials (int): Number of configurations
+        seed (int): Random seed
+
+    Returns:
+        list: Configuration dicts
+    """
+    grid = expand_grid(space)
+    return random.Random(seed).sample(grid, min(n_trials, len(grid)))
+
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(shm_name, shape, dtype, scaler, threads):
+    """
+    Pool initializer: cap TensorFlow threads and attach to the shared series
+
+    Runs before the worker's first TensorFlow op, so the thread limits apply
+    to every trial it trains.
+    """
+    for variable in ('TF_NUM_INTRAOP_THREADS', 'OMP_NUM_THREADS'):
+        os.environ[variable] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+
+    # Spawned workers re-import the parent's __main__, which may already have imported TensorFlow
+    if 'tensorflow' in sys.modules:
+        tf = sys.modules['tensorflow']
+        tf.config.threading.set_intra_op_parallelism_threads(threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    series = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    series.flags.writeable = False
+
+    # Keep the segment mapped for the life of the worker
+    _worker_state.update(shm=shm, series=series, scaler=scaler)
+
+
+def train_configuration(config, model_version, target_column, trial_dir):
+    """
+    Train and evaluate one configuration on the shared series (runs in a worker)
+
+    Args:
+        config (dict): Hyperparameters
+        model_version (str): Version the model is saved under
+        target_column (str): daily_metrics column the model forecasts
+        trial_dir (str): Directory the trial's model is saved to
+
+    Returns:
+        dict: Configuration, evaluation metrics and timing
+    """
+    from training.train_model import ModelTrainer
+
+    started = time.perf_counter()
+    trainer = ModelTrainer(
+        sequence_length=config.get('sequence_length', 7),
+        prediction_horizon=config.get('prediction_horizon', 7),
+        model_version=model_version,
+        target_column=target_column
+    )
+    trainer.data_processor.set_scaler(_worker_state['scaler'])
+
+    # Windows are strided views of the shared, read-only series
+    X_train, y_train, X_test, y_test = trainer.data_processor.split_sequences(_worker_state['series'])
+    if len(X_train) == 0 or len(X_test) == 0:
+        raise ValueError("Not enough data for this sequence length and horizon")
+
+    evaluation_metrics = trainer.train_model(
+        X_train, y_train, X_test, y_test, trainer.data_processor.scaler,
+        epochs=config.get('epochs', 100),
+        batch_size=config.get('batch_size', 32)
+    )
+    trainer.save_results(trial_dir)
+
+    return {
+        'evaluation_metrics': {key: float(value) for key, value in evaluation_metrics.items()},
+        'train_seconds': time.perf_counter() - started
+    }
+
+
+class HyperparameterSearch:
+    def __init__(self, configurations, model_version='v1.0.0', target_column='page_visits',
+                 workers=None, threads_per_worker=1, rank_by='rmse', model_dir='models',
+                 train_fn=train_configuration):
+        """
+        Train configurations in parallel and keep the best model
+
+        The scaled training series is loaded and fitted once, then placed in
+        shared memory; workers build their sliding windows as views over it,
+        so memory does not grow with the number of workers.
+
+        Args:
+            configurations (list): Hyperparameter dicts (see expand_grid)
+            model_version (str): Version the best model is saved as
+            target_column (str): daily_metrics column to forecast
+            workers (int): Worker processes (default: CPUs // threads_per_worker)
+            threads_per_worker (int): TensorFlow intra-op threads per worker
+            rank_by (str): Evaluation metric to minimise
+            model_dir (str): Directory for the best model and the leaderboard
+            train_fn (callable): Trial function (config, model_version, target_column, trial_dir)
+        """
+        self.configurations = list(configurations)
+        self.model_version = model_version
+        self.target_column = target_column
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers or max(1, available_cpus() // self.threads_per_worker)
+        self.rank_by = rank_by
+        self.model_dir = model_dir
+        self.train_fn = train_fn
+
+    def load_series(self, data_loader, days_back=60):
+        """
+        Load and scale the target series once for every trial
+
+        Args:
+            data_loader (DataLoader): Source of daily_metrics
+            days_back (int): Days of history
+
+        Returns:
+            tuple: (scaled series of shape (n_days, 1), fitted scaler)
+        """
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days_back)
+
+        df = data_loader.load_daily_metrics(start_date=start_date, end_date=end_date)
+        if df.empty:
+            raise ValueError("No data found for the specified date range")
+
+        processor = DataProcessor()
+        series = processor.prepare_series(df, target_column=self.target_column)
+        return series, processor.scaler
+
+    def run(self, series, scaler):
+        """
+        Evaluate every configuration across the process pool
+
+        Args:
+            series (array): Scaled target series (n_days, 1)
+            scaler: Scaler fitted on the series
+
+        Returns:
+            list: Leaderboard entries, best first
+        """
+        series = np.ascontiguousarray(series, dtype=np.float64)
+        search_dir = os.path.join(self.model_dir, f'search_{self.model_version}')
+        workers = min(self.workers, len(self.configurations)) or 1
+
+        logging.info(
+            f"Searching {len(self.configurations)} configurations on {workers} workers "
+            f"({self.threads_per_worker} TF thread(s) each)"
+        )
+
+        shm = shared_memory.SharedMemory(create=True, size=max(series.nbytes, 1))
+        leaderboard = []
+        started = time.perf_counter()
+
+        try:
+            np.ndarray(series.shape, dtype=series.dtype, buffer=shm.buf)[:] = series
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(shm.name, series.shape, series.dtype.str, scaler, self.threads_per_worker)
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self.train_fn, config, self.model_version, self.target_column,
+                        os.path.join(search_dir, f'trial_{trial}')
+                    ): (trial, config)
+                    for trial, config in enumerate(self.configurations)
+                }
+
+                for future in as_completed(futures):
+                    trial, config = futures[future]
+                    entry = {'trial': trial, 'config': config}
+                    try:
+                        entry.update(future.result())
+                        logging.info(f"Trial {trial} {config}: {entry['evaluation_metrics']}")
+                    except Exception as e:
+                        entry['error'] = str(e)
+                        logging.error(f"Trial {trial} {config} failed: {str(e)}")
+                    leaderboard.append(entry)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        leaderboard.sort(key=self._score)
+        self.elapsed_seconds = time.perf_counter() - started
+
+        self._keep_best(leaderboard, search_dir)
+        self.write_leaderboard(leaderboard)
+
+        return leaderboard
+
+    def _score(self, entry):
+        if 'error' in entry:
+            return float('inf')
+        return entry['evaluation_metrics'].get(self.rank_by, float('inf'))
+
+    def _keep_best(self, leaderboard, search_dir):
+        """Move the best trial's model files into model_dir and drop the rest"""
+        if leaderboard and 'error' not in leaderboard[0]:
+            best_dir = os.path.join(search_dir, f"trial_{leaderboard[0]['trial']}")
+            os.makedirs(self.model_dir, exist_ok=True)
+            for filename in sorted(os.listdir(best_dir), key=lambda name: name.startswith('metadata_')):
+                os.replace(os.path.join(best_dir, filename), os.path.join(self.model_dir, filename))
+            leaderboard[0]['saved_as'] = self.model_version
+
+        shutil.rmtree(search_dir, ignore_errors=True)
+
+    def write_leaderboard(self, leaderboard):
+        """
+        Write the leaderboard as JSON next to the models
+
+        Returns:
+            str: Leaderboard path
+        """
+        path = os.path.join(self.model_dir, f'leaderboard_{self.model_version}.json')
+        os.makedirs(self.model_dir, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'model_version': self.model_version,
+                'target_column': self.target_column,
+                'rank_by': self.rank_by,
+                'workers': min(self.workers, len(self.configurations)),
+                'threads_per_worker': self.threads_per_worker,
+                'elapsed_seconds': self.elapsed_seconds,
+                'trials': leaderboard
+            }, f, indent=2)
+
+        logging.info(f"Leaderboard saved to {path}")
+        return path
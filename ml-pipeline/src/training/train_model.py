@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import argparse
+import inspect
 import logging
 
 # Add src to path
@@ -13,7 +14,14 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from config.database import DataLoader
 from preprocessing.data_processor import DataProcessor
+from preprocessing.features import DAILY_METRICS, metric_model_version
+from preprocessing.multi_series import MultiSeriesProcessor, site_model_version
+from preprocessing.granularity import DAILY, bucket_model_version, current_bucket_start, granularity_label
 from models.lstm_model import LSTMModel
+from models.numpy_lstm import NumpyLSTMModel, export_keras_weights, max_abs_difference, weights_path
+
+# Largest Keras/NumPy prediction difference (scaled units) accepted for an export
+NUMPY_PARITY_TOLERANCE = 1e-4
 
 # Set up logging
 logging.basicConfig(
@@ -26,7 +34,11 @@ logging.basicConfig(
 )
 
 class ModelTrainer:
-    def __init__(self, sequence_length=7, prediction_horizon=7, model_version='v1.0.0'):
+    # Columns a trainer can forecast
+    TARGET_COLUMNS = DAILY_METRICS
+    
+    def __init__(self, sequence_length=7, prediction_horizon=7, model_version='v1.0.0',
+                 target_column='page_visits', progress_callback=None):
         """
         Initialize the model trainer
         
@@ -34,19 +46,79 @@ class ModelTrainer:
             sequence_length (int): Number of days to use as input sequence
             prediction_horizon (int): Number of days to predict ahead
             model_version (str): Version identifier for the model
+            target_column (str): daily_metrics column the model forecasts
+            progress_callback (callable): Called with keyword arguments (stage, epoch,
+                epochs, loss, val_loss) as the pipeline advances
         """
+        if target_column not in self.TARGET_COLUMNS:
+            raise ValueError(f"Unsupported target column: {target_column}")
+        
         self.sequence_length = sequence_length
         self.prediction_horizon = prediction_horizon
-        self.model_version = model_version
+        self.target_column = target_column
+        self.model_version = self.file_version(model_version)
         
         # Initialize components
         self.data_loader = DataLoader()
-        self.data_processor = DataProcessor(sequence_length, prediction_horizon)
-        self.model = LSTMModel(sequence_length, prediction_horizon, model_version)
+        self.data_processor = self.create_processor()
+        self.model = LSTMModel(sequence_length, prediction_horizon, self.model_version)
         
         # Training results
         self.training_results = {}
         
+        # Last day of the training data; later days are out of sample for backtests
+        self.training_end_date = None
+        
+        # Held-out inputs used to check the NumPy export against Keras
+        self.parity_sample = None
+        
+        self.progress_callback = progress_callback
+    
+    def file_version(self, model_version):
+        """Version used in file names (non-page_visits models are saved as lstm_model_{metric}_{version}.h5)"""
+        return metric_model_version(model_version, self.target_column)
+    
+    def create_processor(self):
+        """Data processor that prepares the training windows"""
+        return DataProcessor(self.sequence_length, self.prediction_horizon)
+    
+    def report_progress(self, stage, **info):
+        """Forward a progress update to progress_callback, if one is set"""
+        if self.progress_callback is not None:
+            self.progress_callback(stage=stage, **info)
+    
+    def _epoch_progress_callbacks(self, epochs):
+        """
+        Keras callbacks that report per-epoch loss through report_progress
+        
+        Returns an empty list when LSTMModel.train does not accept callbacks,
+        in which case progress is reported per pipeline stage only.
+        """
+        if self.progress_callback is None:
+            return []
+        
+        parameters = inspect.signature(self.model.train).parameters
+        if 'callbacks' not in parameters and not any(
+            p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+        ):
+            return []
+        
+        from tensorflow import keras
+        trainer = self
+        
+        class EpochProgress(keras.callbacks.Callback):
+            def on_epoch_end(self, epoch, logs=None):
+                logs = logs or {}
+                trainer.report_progress(
+                    'training',
+                    epoch=epoch + 1,
+                    epochs=epochs,
+                    loss=float(logs['loss']) if 'loss' in logs else None,
+                    val_loss=float(logs['val_loss']) if 'val_loss' in logs else None
+                )
+        
+        return [EpochProgress()]
+        
     def check_data_requirements(self):
         """Check if we have enough data for training"""
         days_count = self.data_loader.get_minimum_data_requirement()
@@ -60,12 +132,14 @@ class ModelTrainer:
         logging.info("Data requirements met for training")
         return True
     
-    def load_and_prepare_data(self, days_back=60):
+    def load_and_prepare_data(self, days_back=60, chunk_size=None):
         """
         Load and prepare data for training
         
         Args:
             days_back (int): Number of days to look back for training data
+            chunk_size (int): Stream rows through a server-side cursor in batches of
+                this size instead of loading the whole range into a DataFrame
             
         Returns:
             tuple: (X_train, y_train, X_test, y_test, scaler)
@@ -73,9 +147,20 @@ class ModelTrainer:
         # Calculate date range
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days_back)
+        self.training_end_date = end_date
         
         logging.info(f"Loading data from {start_date} to {end_date}")
         
+        if chunk_size:
+            X_train, y_train, X_test, y_test, scaler = self.data_processor.prepare_data_batches(
+                lambda: self.data_loader.iter_daily_metrics(start_date, end_date, fetch_size=chunk_size),
+                target_column=self.target_column
+            )
+            logging.info(f"Streamed data in batches of {chunk_size} rows")
+            logging.info(f"- Training samples: {len(X_train)}")
+            logging.info(f"- Test samples: {len(X_test)}")
+            return X_train, y_train, X_test, y_test, scaler
+        
         # Load daily metrics
         df = self.data_loader.load_daily_metrics(
             start_date=start_date,
@@ -88,11 +173,11 @@ class ModelTrainer:
         logging.info(f"Loaded {len(df)} days of data")
         
         # Add engineered features
-        df = self.data_processor.add_features(df)
+        df = self.data_processor.add_features(df, metrics=[self.target_column])
         
         # Prepare data for LSTM
         X_train, y_train, X_test, y_test, scaler = self.data_processor.prepare_data(
-            df, target_column='page_visits'
+            df, target_column=self.target_column
         )
         
         logging.info(f"Data prepared:")
@@ -117,16 +202,22 @@ class ModelTrainer:
         """
         logging.info("Starting model training...")
         
+        self.report_progress('training', epoch=0, epochs=epochs)
+        
         # Train the model
+        callbacks = self._epoch_progress_callbacks(epochs)
         history = self.model.train(
             X_train, y_train,
             X_val=X_test, y_val=y_test,
             epochs=epochs,
-            batch_size=batch_size
+            batch_size=batch_size,
+            **({'callbacks': callbacks} if callbacks else {})
         )
         
         # Evaluate the model
-        evaluation_metrics = self.model.evaluate(X_test, y_test, scaler)
+        self.report_progress('evaluating')
+        evaluation_metrics = self.evaluate(X_test, y_test, scaler)
+        self.parity_sample = X_test[:64]
         
         logging.info("Training completed!")
         logging.info(f"Evaluation metrics: {evaluation_metrics}")
@@ -142,21 +233,74 @@ class ModelTrainer:
         
         return evaluation_metrics
     
+    def evaluate(self, X_test, y_test, scaler):
+        """Evaluation metrics in original scale on the test windows"""
+        return self.model.evaluate(X_test, y_test, scaler)
+    
     def save_results(self, model_dir='models'):
         """Save the trained model and results"""
+        import joblib
+        
         # Save model
         model_path, metadata_path = self.model.save_model(model_dir)
         
+        # Store the fitted scaler with the model so inference never refits it
+        metadata = joblib.load(metadata_path)
+        metadata['scaler'] = self.data_processor.scaler
+        metadata['target_column'] = self.target_column
+        metadata['numpy_export'] = self.export_numpy_weights(model_dir)
+        metadata['training_end_date'] = self.training_end_date.isoformat() if self.training_end_date else None
+        joblib.dump(metadata, metadata_path)
+        
         # Save training results
         results_path = os.path.join(model_dir, f'training_results_{self.model_version}.pkl')
-        import joblib
         joblib.dump(self.training_results, results_path)
         
         logging.info(f"Training results saved to {results_path}")
         
         return model_path, metadata_path, results_path
     
-    def run_training_pipeline(self, days_back=60, epochs=100, batch_size=32):
+    def export_numpy_weights(self, model_dir='models'):
+        """
+        Export the trained weights for TensorFlow-free serving and check parity
+        
+        The export is removed again if its predictions drift from Keras by more
+        than NUMPY_PARITY_TOLERANCE, so the API falls back to Keras.
+        
+        Args:
+            model_dir (str): Directory the model was saved to
+            
+        Returns:
+            Dict: Export path and parity error, or None if the export failed
+        """
+        path = weights_path(model_dir, self.model_version)
+        
+        try:
+            export_keras_weights(self.model.model, path)
+            numpy_model = NumpyLSTMModel.load(
+                path, self.sequence_length, self.prediction_horizon, self.model_version
+            )
+            
+            max_error = None
+            if self.parity_sample is not None and len(self.parity_sample):
+                max_error = max_abs_difference(self.model.model, numpy_model, self.parity_sample)
+                if max_error > NUMPY_PARITY_TOLERANCE:
+                    os.remove(path)
+                    logging.warning(
+                        f"NumPy export differs from Keras by {max_error:.2e}; "
+                        "the API will serve this model with Keras"
+                    )
+                    return None
+            
+            logging.info(f"NumPy weights exported to {path} (max parity error: {max_error})")
+            return {'path': os.path.basename(path), 'max_abs_error': max_error}
+            
+        except ValueError as e:
+            logging.warning(f"Skipping NumPy weight export: {str(e)}")
+            return None
+    
+    def run_training_pipeline(self, days_back=60, epochs=100, batch_size=32, chunk_size=None,
+                              model_dir='models'):
         """
         Run the complete training pipeline
         
@@ -164,6 +308,8 @@ class ModelTrainer:
             days_back (int): Number of days to look back for training data
             epochs (int): Number of training epochs
             batch_size (int): Batch size for training
+            chunk_size (int): Stream training data in batches of this many rows
+            model_dir (str): Directory to save the model and results to
         """
         try:
             logging.info("=" * 50)
@@ -171,11 +317,14 @@ class ModelTrainer:
             logging.info("=" * 50)
             
             # Step 1: Check data requirements
+            self.report_progress('loading_data')
             if not self.check_data_requirements():
                 raise ValueError("Insufficient data for training")
             
             # Step 2: Load and prepare data
-            X_train, y_train, X_test, y_test, scaler = self.load_and_prepare_data(days_back)
+            X_train, y_train, X_test, y_test, scaler = self.load_and_prepare_data(
+                days_back, chunk_size=chunk_size
+            )
             
             # Step 3: Train model
             evaluation_metrics = self.train_model(
@@ -184,7 +333,8 @@ class ModelTrainer:
             )
             
             # Step 4: Save results
-            model_path, metadata_path, results_path = self.save_results()
+            self.report_progress('saving')
+            model_path, metadata_path, results_path = self.save_results(model_dir)
             
             # Step 5: Print summary
             self.print_training_summary(evaluation_metrics)
@@ -210,6 +360,7 @@ class ModelTrainer:
         print("TRAINING SUMMARY")
         print("=" * 50)
         print(f"Model Version: {self.model_version}")
+        print(f"Target Metric: {self.target_column}")
         print(f"Training Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Sequence Length: {self.sequence_length} days")
         print(f"Prediction Horizon: {self.prediction_horizon} days")
@@ -221,6 +372,238 @@ class ModelTrainer:
         print(f"  R²: {evaluation_metrics['r2']:.4f}")
         print("=" * 50)
 
+class GlobalModelTrainer(ModelTrainer):
+    def __init__(self, sequence_length=7, prediction_horizon=7, model_version='v1.0.0',
+                 target_column='page_visits', site_ids=None, progress_callback=None):
+        """
+        Train one model over the series of every site in site_daily_metrics
+        
+        Each site is scaled separately (see SeriesScaler) and its windows are
+        pooled into one training set. The model is saved as
+        lstm_model_sites_{version}.h5 next to the single-site model of the
+        same version and serves POST /predict/sites.
+        
+        Args:
+            sequence_length (int): Number of days to use as input sequence
+            prediction_horizon (int): Number of days to predict ahead
+            model_version (str): Version identifier for the model
+            target_column (str): Metric the model forecasts
+            site_ids (list): Sites to train on (None for every site)
+            progress_callback (callable): See ModelTrainer
+        """
+        super().__init__(sequence_length, prediction_horizon, model_version, target_column, progress_callback)
+        self.site_ids = site_ids
+        
+        # Site row of each test window, for per-site inverse scaling
+        self.test_rows = None
+    
+    def file_version(self, model_version):
+        return site_model_version(model_version, self.target_column)
+    
+    def create_processor(self):
+        return MultiSeriesProcessor(self.sequence_length, self.prediction_horizon)
+    
+    def check_data_requirements(self):
+        """History is checked per site when the data is loaded"""
+        return True
+    
+    def load_and_prepare_data(self, days_back=60, chunk_size=None):
+        """
+        Load every site's series and pool their training windows
+        
+        Args:
+            days_back (int): Number of days to look back for training data
+            chunk_size (int): Not supported for multi-site training
+            
+        Returns:
+            tuple: (X_train, y_train, X_test, y_test, scaler)
+        """
+        if chunk_size:
+            raise ValueError("Streaming (chunk_size) is not supported for multi-site training")
+        
+        end_date = datetime.now().date()
+        start_date = end_date - timedelta(days=days_back)
+        
+        logging.info(f"Loading site data from {start_date} to {end_date}")
+        
+        df = self.data_loader.load_site_metrics(
+            start_date=start_date,
+            end_date=end_date,
+            site_ids=self.site_ids,
+            metrics=[self.target_column]
+        )
+        
+        if df.empty:
+            raise ValueError("No site data found for the specified date range")
+        
+        X_train, y_train, X_test, y_test, scaler, self.test_rows = self.data_processor.prepare_data(
+            df, target_column=self.target_column
+        )
+        
+        if len(X_train) == 0 or len(X_test) == 0:
+            raise ValueError("Not enough data for training")
+        
+        logging.info(f"Data prepared from {len(scaler)} sites:")
+        logging.info(f"- Training samples: {len(X_train)}")
+        logging.info(f"- Test samples: {len(X_test)}")
+        
+        return X_train, y_train, X_test, y_test, scaler
+    
+    def evaluate(self, X_test, y_test, scaler):
+        """Evaluation metrics over all sites, each inverse-scaled with its own parameters"""
+        from sklearn.metrics import r2_score
+        
+        predictions = np.asarray(self.model.predict(X_test)).reshape(len(X_test), -1)
+        data_min = scaler.data_min_[self.test_rows]
+        data_range = scaler.data_range_[self.test_rows]
+        
+        actual = scaler.inverse_transform(y_test.reshape(len(y_test), -1), data_min, data_range)
+        predicted = scaler.inverse_transform(predictions, data_min, data_range)
+        
+        evaluation_metrics = DataProcessor().evaluate_predictions(actual, predicted)
+        evaluation_metrics['r2'] = r2_score(actual.flatten(), predicted.flatten())
+        return evaluation_metrics
+    
+    def save_results(self, model_dir='models'):
+        """Save the model; the metadata carries the per-site scaler"""
+        import joblib
+        
+        model_path, metadata_path, results_path = super().save_results(model_dir)
+        
+        metadata = joblib.load(metadata_path)
+        metadata['per_series_scaling'] = True
+        metadata['n_sites'] = len(self.data_processor.scaler)
+        joblib.dump(metadata, metadata_path)
+        
+        return model_path, metadata_path, results_path
+
+class BucketModelTrainer(ModelTrainer):
+    TARGET_COLUMNS = ('visits',)
+    
+    def __init__(self, sequence_length=168, prediction_horizon=24, model_version='v1.0.0',
+                 granularity='1h', timezone=None, progress_callback=None):
+        """
+        Train a sub-daily visits model on hourly or N-minute buckets of page_visits
+        
+        The model is saved as lstm_model_visits_{granularity}_{version}.h5 next
+        to the daily model of the same version and serves GET /predict/visits.
+        
+        Args:
+            sequence_length (int): Number of buckets to use as input sequence (168 = one week of hours)
+            prediction_horizon (int): Number of buckets to predict ahead
+            model_version (str): Version identifier for the model
+            granularity (str): Bucket length, e.g. '1h' or '15min'
+            timezone (str): Time zone of the buckets (defaults to FORECAST_TIMEZONE)
+            progress_callback (callable): See ModelTrainer
+        """
+        self.granularity = granularity_label(granularity)
+        if self.granularity == DAILY:
+            raise ValueError("Use ModelTrainer for daily models")
+        
+        super().__init__(sequence_length, prediction_horizon, model_version, 'visits', progress_callback)
+        self.timezone = timezone or self.data_loader.forecast_timezone
+    
+    def file_version(self, model_version):
+        return bucket_model_version(model_version, self.granularity)
+    
+    def create_processor(self):
+        return DataProcessor(self.sequence_length, self.prediction_horizon, granularity=self.granularity)
+    
+    def check_data_requirements(self):
+        """History is checked once the buckets are loaded"""
+        return True
+    
+    def load_and_prepare_data(self, days_back=60, chunk_size=None):
+        """
+        Load visit buckets for the last days_back days and window them
+        
+        Args:
+            days_back (int): Number of days to look back for training data
+            chunk_size (int): Slots per fetched batch (the buckets are always aggregated in Postgres)
+            
+        Returns:
+            tuple: (X_train, y_train, X_test, y_test, scaler)
+        """
+        # Only complete buckets: stop at the start of the current one
+        end_time = current_bucket_start(self.granularity, self.timezone)
+        start_time = (end_time - pd.Timedelta(days=days_back)).normalize()
+        
+        logging.info(f"Loading {self.granularity} visit buckets from {start_time} to {end_time}")
+        
+        df = self.data_loader.load_visit_buckets(
+            start_time, end_time, granularity=self.granularity, timezone=self.timezone,
+            **({'fetch_size': chunk_size} if chunk_size else {})
+        )
+        
+        if df.empty or not df['visits'].any():
+            raise ValueError("No page visits found for the specified date range")
+        
+        df = self.data_processor.add_features(df, metrics=['visits'])
+        X_train, y_train, X_test, y_test, scaler = self.data_processor.prepare_data(df, target_column='visits')
+        
+        if len(X_train) == 0 or len(X_test) == 0:
+            raise ValueError(
+                f"Not enough buckets for training: {len(df)} buckets for a "
+                f"{self.sequence_length + self.prediction_horizon}-bucket window"
+            )
+        
+        logging.info(f"Data prepared from {len(df)} buckets:")
+        logging.info(f"- Training samples: {len(X_train)}")
+        logging.info(f"- Test samples: {len(X_test)}")
+        logging.info(f"- Input shape: {X_train.shape}")
+        
+        return X_train, y_train, X_test, y_test, scaler
+    
+    def save_results(self, model_dir='models'):
+        """Save the model; the metadata records the bucket length and time zone"""
+        import joblib
+        
+        model_path, metadata_path, results_path = super().save_results(model_dir)
+        
+        metadata = joblib.load(metadata_path)
+        metadata['granularity'] = self.granularity
+        metadata['timezone'] = self.timezone
+        joblib.dump(metadata, metadata_path)
+        
+        return model_path, metadata_path, results_path
+
+def run_search(args):
+    """Run a hyperparameter search from parsed CLI arguments"""
+    import json
+    from training.hyperparameter_search import (
+        DEFAULT_SEARCH_SPACE, HyperparameterSearch, expand_grid, sample_configurations
+    )
+    
+    space = json.loads(args.search_space) if args.search_space else DEFAULT_SEARCH_SPACE
+    if args.search == 'grid':
+        configurations = expand_grid(space)
+    else:
+        configurations = sample_configurations(space, args.n_trials, seed=args.seed)
+    
+    search = HyperparameterSearch(
+        configurations,
+        model_version=args.model_version,
+        target_column=args.target_column,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker
+    )
+    
+    # Load and scale the data once; every worker shares it read-only
+    series, scaler = search.load_series(DataLoader(), days_back=args.days_back)
+    leaderboard = search.run(series, scaler)
+    
+    print("\n" + "=" * 50)
+    print("HYPERPARAMETER SEARCH LEADERBOARD")
+    print("=" * 50)
+    for rank, entry in enumerate(leaderboard, 1):
+        if 'error' in entry:
+            print(f"{rank:>3}. {entry['config']} failed: {entry['error']}")
+        else:
+            print(f"{rank:>3}. {entry['config']} RMSE: {entry['evaluation_metrics']['rmse']:.4f} "
+                  f"({entry['train_seconds']:.1f}s)")
+    print(f"Elapsed: {search.elapsed_seconds:.1f}s on {search.workers} worker(s)")
+    print("=" * 50)
+
 def main():
     parser = argparse.ArgumentParser(description='Train LSTM model for website analytics')
     parser.add_argument('--sequence-length', type=int, default=7,
@@ -229,27 +612,77 @@ def main():
                        help='Number of days to predict ahead')
     parser.add_argument('--model-version', type=str, default='v1.0.0',
                        help='Model version identifier')
+    parser.add_argument('--target-column', type=str, default='page_visits',
+                       choices=DAILY_METRICS,
+                       help='daily_metrics column to forecast')
     parser.add_argument('--days-back', type=int, default=60,
                        help='Number of days to look back for training data')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                       help='Stream training data through a server-side cursor in batches of this many rows')
     parser.add_argument('--epochs', type=int, default=100,
                        help='Number of training epochs')
     parser.add_argument('--batch-size', type=int, default=32,
                        help='Batch size for training')
+    parser.add_argument('--multi-site', action='store_true',
+                       help='Train one global model over every site in site_daily_metrics')
+    parser.add_argument('--site-ids', type=str, default=None,
+                       help='Comma-separated sites for --multi-site (default: all)')
+    parser.add_argument('--granularity', type=str, default=DAILY,
+                       help="Step length: 'D' (daily_metrics) or hourly/N-minute visit buckets "
+                            "('1h', '15min'); sequence length and horizon count buckets")
+    parser.add_argument('--timezone', type=str, default=None,
+                       help='Time zone of sub-daily buckets (default: FORECAST_TIMEZONE)')
+    parser.add_argument('--search', choices=['grid', 'random'], default=None,
+                       help='Run a parallel hyperparameter search instead of a single training run')
+    parser.add_argument('--search-space', type=str, default=None,
+                       help='JSON object of parameter -> list of values '
+                            '(sequence_length, prediction_horizon, epochs, batch_size)')
+    parser.add_argument('--n-trials', type=int, default=10,
+                       help='Configurations sampled by --search random')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Search worker processes (default: CPUs / threads per worker)')
+    parser.add_argument('--threads-per-worker', type=int, default=1,
+                       help='TensorFlow intra-op threads per search worker')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Random seed for --search random')
     
     args = parser.parse_args()
     
+    if args.search:
+        run_search(args)
+        return
+    
     # Create trainer
-    trainer = ModelTrainer(
-        sequence_length=args.sequence_length,
-        prediction_horizon=args.prediction_horizon,
-        model_version=args.model_version
-    )
+    if granularity_label(args.granularity) != DAILY:
+        trainer = BucketModelTrainer(
+            sequence_length=args.sequence_length,
+            prediction_horizon=args.prediction_horizon,
+            model_version=args.model_version,
+            granularity=args.granularity,
+            timezone=args.timezone
+        )
+    elif args.multi_site:
+        trainer = GlobalModelTrainer(
+            sequence_length=args.sequence_length,
+            prediction_horizon=args.prediction_horizon,
+            model_version=args.model_version,
+            target_column=args.target_column,
+            site_ids=args.site_ids.split(',') if args.site_ids else None
+        )
+    else:
+        trainer = ModelTrainer(
+            sequence_length=args.sequence_length,
+            prediction_horizon=args.prediction_horizon,
+            model_version=args.model_version,
+            target_column=args.target_column
+        )
     
     # Run training pipeline
     results = trainer.run_training_pipeline(
         days_back=args.days_back,
         epochs=args.epochs,
-        batch_size=args.batch_size
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size
     )
     
     print(f"\nModel saved to: {results['model_path']}")
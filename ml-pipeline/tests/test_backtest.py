@@ -0,0 +1,89 @@
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from training.backtest import Backtester, first_origin_after, holdout_scores
+
+def repeat_last(X):
+    """Naive forecaster: repeat the last input value for 7 days"""
+    return np.repeat(X[:, -1, :], 7, axis=1)
+
+class TestBacktester(unittest.TestCase):
+    def test_batched_run_matches_per_origin_loop(self):
+        """Test that one batched pass gives the same errors as forecasting each origin separately"""
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 500, size=400).astype(float)
+        scaler = MinMaxScaler().fit(values.reshape(-1, 1))
+
+        backtester = Backtester(sequence_length=14, prediction_horizon=7, batch_size=50)
+        result = backtester.run(values, repeat_last, scaler=scaler, start=100, step=3, return_forecasts=True)
+
+        origins = backtester.origin_indices(len(values), start=100, step=3)
+        self.assertEqual(result['n_origins'], len(origins))
+
+        errors = []
+        for origin in origins:
+            forecast = np.full(7, values[origin - 1])
+            errors.append(np.abs(forecast - values[origin:origin + 7]))
+        errors = np.array(errors)
+
+        np.testing.assert_allclose(result['forecasts'][:, 0], values[origins - 1])
+        np.testing.assert_allclose([row['mae'] for row in result['per_horizon']], errors.mean(axis=0))
+        self.assertAlmostEqual(result['overall']['mae'], errors.mean())
+        self.assertEqual(len(result['per_horizon']), 7)
+
+    def test_holdout_scores_share_recent_days(self):
+        """Test that every model is scored on the same origins at the end of the data"""
+        class Model:
+            def __init__(self, sequence_length, forecast):
+                self.sequence_length = sequence_length
+                self.prediction_horizon = 7
+                self.forecast = forecast
+
+            def predict(self, X):
+                return self.forecast(X)
+
+        values = np.arange(60.0)
+        df = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=60, freq='D'), 'page_visits': values})
+        scaler = MinMaxScaler().fit(values.reshape(-1, 1))
+        models = {
+            'naive': (Model(7, repeat_last), {'scaler': scaler}),
+            'long': (Model(28, repeat_last), {'scaler': scaler}),
+            'mean': (Model(7, lambda X: np.repeat(X.mean(axis=1), 7, axis=1)), {'scaler': scaler})
+        }
+
+        scores = holdout_scores(models, df.iloc[::-1], 'page_visits', holdout_days=14)
+
+        # Origins 46..53 forecast days 46..59 whatever the input length
+        self.assertEqual({score['n_origins'] for score in scores.values()}, {8})
+        self.assertAlmostEqual(scores['naive']['rmse'], scores['long']['rmse'])
+        self.assertLess(scores['naive']['rmse'], scores['mean']['rmse'])
+
+    def test_origins_start_after_training_cutoff(self):
+        """Test that the first scored origin is the day after the training data"""
+        dates = pd.date_range('2024-01-01', periods=60, freq='D')
+        start = first_origin_after(dates, '2024-01-31')
+        self.assertEqual(start, 31)
+
+        result = Backtester(7, 7).run(np.arange(60.0), repeat_last, dates=dates, start=start)
+        self.assertEqual(result['first_origin'], '2024-02-01')
+        self.assertEqual(result['n_origins'], 60 - 7 - 31 + 1)
+
+        # Cutoffs before and after the data, and timestamps within the cutoff day
+        self.assertEqual(first_origin_after(dates, '2023-12-01'), 0)
+        self.assertEqual(first_origin_after(dates, '2024-03-01'), 60)
+        self.assertEqual(first_origin_after(dates, pd.Timestamp('2024-01-31 18:00')), 31)
+
+    def test_too_short_series(self):
+        """Test that a series shorter than one window is rejected"""
+        with self.assertRaises(ValueError):
+            Backtester(7, 7).run(np.arange(10.0), repeat_last)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.baselines import SeasonalNaiveForecaster, MovingAverageForecaster, HoltWintersForecaster
+
+class TestBaselineForecasters(unittest.TestCase):
+    def test_seasonal_naive_and_moving_average(self):
+        """Test that seasonal naive repeats last week and moving average is flat"""
+        history = np.arange(14.0).reshape(1, 14, 1)
+
+        naive = SeasonalNaiveForecaster(season=7, prediction_horizon=10).predict(history)
+        np.testing.assert_array_equal(naive[0], [7, 8, 9, 10, 11, 12, 13, 7, 8, 9])
+
+        average = MovingAverageForecaster(window=7, prediction_horizon=3).predict(history)
+        np.testing.assert_array_equal(average[0], [10, 10, 10])
+
+    def test_holt_winters_matrix_matches_recursion(self):
+        """Test that the precomputed forecast matrix equals running the recursion per batch"""
+        forecaster = HoltWintersForecaster(prediction_horizon=14)
+        history = np.random.default_rng(0).random((5, forecaster.sequence_length)) * 100
+
+        np.testing.assert_allclose(forecaster.predict(history), forecaster.smooth(history), atol=1e-9)
+
+    def test_holt_winters_follows_weekly_pattern(self):
+        """Test that a clean weekly pattern with a trend is extrapolated closely"""
+        days = np.arange(56 + 7)
+        series = 500 + 2 * days + 100 * np.sin(2 * np.pi * days / 7)
+
+        forecaster = HoltWintersForecaster(damping=1.0, prediction_horizon=7)
+        forecast = forecaster.predict(series[np.newaxis, :56])[0]
+
+        naive = SeasonalNaiveForecaster(prediction_horizon=7).predict(series[np.newaxis, :56])[0]
+        self.assertLess(np.abs(forecast - series[56:]).mean(), np.abs(naive - series[56:]).mean())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import threading
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.batcher import InferenceBatcher
+
+class TestInferenceBatcher(unittest.TestCase):
+    def test_concurrent_requests_are_batched(self):
+        """Test that concurrent callers share forward passes and get their own rows"""
+        batch_sizes = []
+
+        def predict_fn(batch):
+            batch_sizes.append(len(batch))
+            return batch[:, -1, :] * 2
+
+        batcher = InferenceBatcher(predict_fn, max_batch_size=8, max_wait_ms=20)
+        results = {}
+
+        def request(i):
+            results[i] = batcher.predict(np.full((1, 7, 1), i, dtype=float))
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        for i in range(16):
+            self.assertEqual(results[i].shape, (1, 1))
+            self.assertEqual(results[i][0, 0], 2 * i)
+        self.assertLess(len(batch_sizes), 16)
+        self.assertTrue(all(size <= 8 for size in batch_sizes))
+        self.assertEqual(batcher.stats()['batch_size']['sum'], 16)
+
+    def test_errors_propagate_to_callers(self):
+        """Test that a failing forward pass raises in the caller"""
+        def predict_fn(batch):
+            raise ValueError("boom")
+
+        batcher = InferenceBatcher(predict_fn, max_wait_ms=0)
+        with self.assertRaises(ValueError):
+            batcher.predict(np.zeros((1, 7, 1)))
+        batcher.close()
+
+    def test_cancelled_request_does_not_stop_batcher(self):
+        """Test that a request cancelled while queued is skipped and later requests still run"""
+        running, release = threading.Event(), threading.Event()
+        batch_sizes = []
+
+        def predict_fn(batch):
+            running.set()
+            release.wait(5)
+            batch_sizes.append(len(batch))
+            return batch[:, -1, :]
+
+        batcher = InferenceBatcher(predict_fn, max_wait_ms=0)
+        first = batcher.submit(np.ones((1, 7, 1)))
+        running.wait(5)
+
+        cancelled = batcher.submit(np.ones((1, 7, 1)))
+        self.assertTrue(cancelled.cancel())
+        release.set()
+
+        self.assertEqual(first.result(5)[0, 0], 1)
+        self.assertEqual(batcher.predict(np.full((1, 7, 1), 3.0), timeout=5)[0, 0], 3)
+        self.assertEqual(batch_sizes, [1, 1])
+        batcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import os
+import asyncio
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.concurrency import BoundedExecutor, ServiceSaturatedError
+
+class TestBoundedExecutor(unittest.TestCase):
+    def test_cancelled_request_keeps_slot_until_work_finishes(self):
+        """Test that cancelling a waiting request does not free its worker early"""
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+            return 'done'
+
+        async def scenario():
+            task = asyncio.create_task(executor.run(blocking))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+            # The worker is still busy, so the slot is still taken
+            self.assertEqual(executor.in_flight, 1)
+            with self.assertRaises(ServiceSaturatedError):
+                await executor.run(lambda: None)
+
+            release.set()
+            while executor.in_flight:
+                await asyncio.sleep(0.001)
+
+            self.assertEqual(await executor.run(lambda: 'next'), 'next')
+
+        asyncio.run(scenario())
+        self.assertEqual(executor.stats()['completed'], 2)
+        self.assertEqual(executor.stats()['rejected'], 1)
+        executor.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
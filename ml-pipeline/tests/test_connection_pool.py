@@ -0,0 +1,88 @@
+import sys
+import os
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.connection_pool import ConnectionPool, PoolTimeoutError
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query):
+        pass
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+
+    def cursor(self):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+    def get_transaction_status(self):
+        return 0
+
+class TestConnectionPool(unittest.TestCase):
+    def test_connections_are_reused(self):
+        """Test that sequential checkouts reuse one connection"""
+        pool = ConnectionPool(FakeConnection, max_size=2)
+
+        for _ in range(5):
+            with pool.connection():
+                pass
+
+        self.assertEqual(pool.stats()['created'], 1)
+
+    def test_pool_is_bounded(self):
+        """Test that checkouts beyond max_size time out"""
+        pool = ConnectionPool(FakeConnection, max_size=2, timeout=0.05)
+        pool.getconn()
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeoutError):
+            pool.getconn()
+
+    def test_recycle_after_max_uses(self):
+        """Test that connections are replaced after max_uses checkouts"""
+        pool = ConnectionPool(FakeConnection, max_size=1, max_uses=2)
+
+        for _ in range(4):
+            with pool.connection():
+                pass
+
+        self.assertEqual(pool.stats()['created'], 2)
+
+    def test_concurrent_checkouts(self):
+        """Test that concurrent threads never exceed max_size"""
+        pool = ConnectionPool(FakeConnection, max_size=3, timeout=5)
+
+        def work():
+            for _ in range(50):
+                with pool.connection():
+                    self.assertLessEqual(pool.stats()['in_use'], 3)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(pool.stats()['size'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+import os
+import unittest
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.schema import DAILY_METRICS_DTYPE
+from preprocessing.data_processor import DataProcessor
+
+class TestPrepareDataBatches(unittest.TestCase):
+    def test_batched_matches_unbatched(self):
+        """Test that streamed batches give the same arrays as prepare_data"""
+        rng = np.random.default_rng(0)
+        dates = pd.date_range('2024-01-01', periods=200, freq='D')
+        df = pd.DataFrame({name: rng.uniform(10, 100, len(dates)) for name in DAILY_METRICS_DTYPE.names[1:]})
+        df.insert(0, 'date', dates)
+
+        # Gaps inside a batch and at a batch boundary, plus a NULL value
+        df = df.drop(index=[5, 6, 49, 50, 51, 120]).reset_index(drop=True)
+        df.loc[80, 'page_visits'] = np.nan
+
+        records = np.empty(len(df), dtype=DAILY_METRICS_DTYPE)
+        for name in DAILY_METRICS_DTYPE.names:
+            records[name] = df[name].to_numpy()
+        batches = lambda: (records[start:start + 47] for start in range(0, len(records), 47))
+
+        expected = DataProcessor(14, 7).prepare_data(df)
+        actual = DataProcessor(14, 7).prepare_data_batches(batches)
+
+        for expected_array, actual_array in zip(expected[:4], actual[:4]):
+            np.testing.assert_allclose(actual_array, expected_array)
+        np.testing.assert_allclose(actual[4].data_max_, expected[4].data_max_)
+        np.testing.assert_allclose(actual[4].data_min_, expected[4].data_min_)
+
+if __name__ == '__main__':
+    unittest.main()
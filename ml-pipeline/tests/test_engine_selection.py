@@ -0,0 +1,84 @@
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.prediction_service import PredictionService
+
+class GatedDataLoader:
+    """daily_metrics served from memory once the gate is opened"""
+
+    def __init__(self, df):
+        self.df = df
+        self.gate = threading.Event()
+        self.calls = 0
+
+    def load_daily_metrics(self, start_date=None, end_date=None, limit=None):
+        self.calls += 1
+        self.gate.wait(5)
+        return self.df
+
+class TestEngineSelection(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=120, freq='D')
+        visits = 100 + 30 * np.sin(2 * np.pi * np.arange(120) / 7)
+        self.df = pd.DataFrame({'date': dates, 'page_visits': visits})
+        self.service = PredictionService(model_dir=self.model_dir, engine='auto', engine_selection_days=120)
+        self.service.data_loader = GatedDataLoader(self.df)
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+
+    def test_selection_runs_in_background(self):
+        """Test that requests get the fallback at once while the backtest runs"""
+        loader = self.service.data_loader
+        self.assertEqual(self.service.choose_engine(None, 'page_visits'), 'seasonal_naive')
+        self.assertEqual(self.service.choose_engine(None, 'page_visits'), 'seasonal_naive')
+
+        loader.gate.set()
+        self.service._selection_executor.submit(lambda: None).result(5)
+
+        selection = self.service._engine_selections[('baseline', 'page_visits')]
+        self.assertIsNotNone(selection['scores'])
+        self.assertEqual(self.service.choose_engine(None, 'page_visits'), selection['engine'])
+        # Both requests before the result shared one backtest
+        self.assertEqual(loader.calls, 1)
+
+    def test_lstm_scored_after_training_cutoff(self):
+        """Test that only origins after the LSTM's training data are backtested"""
+        self.service.data_loader.gate.set()
+
+        class Model:
+            sequence_length = 7
+            prediction_horizon = 7
+
+            def predict(self, X):
+                return np.repeat(X[:, -1, :], 7, axis=1)
+
+        class Processor:
+            is_fitted = False
+
+        last_date = self.df['date'].max()
+        entry = {'model': Model(), 'processor': Processor(), 'training_end_date': last_date - pd.Timedelta(days=30)}
+        scores = self.service._backtest_engines(entry, 'page_visits')
+
+        # Origins from the first unseen day until a full horizon remains
+        self.assertEqual(scores['lstm']['n_origins'], 30 - 7 + 1)
+        self.assertEqual(scores['seasonal_naive']['n_origins'], scores['lstm']['n_origins'])
+
+        entry['training_end_date'] = last_date
+        with self.assertRaises(ValueError):
+            self.service._backtest_engines(entry, 'page_visits')
+
+if __name__ == '__main__':
+    unittest.main()
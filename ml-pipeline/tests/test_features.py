@@ -0,0 +1,138 @@
+import sys
+import os
+import tempfile
+import unittest
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.features import FeatureEngine, FeatureCache, default_feature_specs, rolling_mean
+from preprocessing.incremental import IncrementalFeatureBuilder
+from api.prediction_service import PredictionService
+
+class TestFeatureEngine(unittest.TestCase):
+    def setUp(self):
+        dates = pd.date_range('2024-01-01', periods=60, freq='D')
+        self.df = pd.DataFrame({
+            'date': dates,
+            'page_visits': np.random.randint(10, 100, 60).astype(float),
+            'bounce_rate': np.random.rand(60)
+        })
+
+    def test_matches_pandas(self):
+        """Test that vectorized features match the pandas equivalents"""
+        result = FeatureEngine(cache=None).transform(self.df)
+        dates = pd.to_datetime(self.df['date'])
+
+        np.testing.assert_array_equal(result['day_of_week'], dates.dt.dayofweek)
+        np.testing.assert_array_equal(result['day_of_month'], dates.dt.day)
+        np.testing.assert_array_equal(result['month'], dates.dt.month)
+        np.testing.assert_allclose(
+            result['page_visits_ma7'],
+            self.df['page_visits'].rolling(window=7, min_periods=1).mean()
+        )
+        np.testing.assert_allclose(
+            result['page_visits_lag7'],
+            self.df['page_visits'].shift(7).fillna(0)
+        )
+
+    def test_rolling_mean_ignores_nan(self):
+        """Test that NaN values are skipped like pandas rolling"""
+        values = np.array([1.0, np.nan, 3.0, 5.0, np.nan])
+        expected = pd.Series(values).rolling(window=3, min_periods=1).mean()
+        np.testing.assert_allclose(rolling_mean(values, 3), expected)
+
+    def test_multiple_metrics(self):
+        """Test that features are generated for every requested metric"""
+        specs = default_feature_specs(['page_visits', 'bounce_rate'])
+        result = FeatureEngine(specs, cache=None).transform(self.df)
+
+        for column in ['bounce_rate_ma7', 'bounce_rate_ma30', 'bounce_rate_lag1', 'bounce_rate_lag7']:
+            self.assertIn(column, result.columns)
+
+    def test_cache_reuses_identical_input(self):
+        """Test that identical frames are served from the cache"""
+        cache = FeatureCache()
+        engine = FeatureEngine(cache=cache)
+
+        first = engine.transform(self.df)
+        second = engine.transform(self.df.copy())
+
+        self.assertEqual(cache.hits, 1)
+        pd.testing.assert_frame_equal(first, second)
+
+        changed = self.df.copy()
+        changed.loc[0, 'page_visits'] += 1
+        engine.transform(changed)
+        self.assertEqual(cache.misses, 2)
+
+class TestIncrementalFeatureBuilder(unittest.TestCase):
+    def test_matches_batch_features_across_checkpoint(self):
+        """Test that appended days match a full recompute, including after a restart"""
+        dates = pd.date_range('2024-01-01', periods=90, freq='D')
+        df = pd.DataFrame({
+            'date': dates,
+            'page_visits': np.random.randint(10, 100, 90).astype(float)
+        })
+        expected = FeatureEngine(cache=None).transform(df).set_index('date')
+
+        builder = IncrementalFeatureBuilder()
+        builder.update_from_frame(df.iloc[:60])
+
+        path = os.path.join(tempfile.mkdtemp(), 'feature_state.pkl')
+        builder.save(path)
+        builder = IncrementalFeatureBuilder.load(path)
+
+        rows = builder.update_from_frame(df)
+        self.assertEqual(len(rows), 30)
+
+        for _, row in rows.iterrows():
+            for spec in builder.specs:
+                self.assertAlmostEqual(row[spec.name], expected.loc[pd.Timestamp(row['date']), spec.name])
+
+class RecordingDataLoader:
+    """daily_metrics served from memory, remembering every queried range"""
+
+    def __init__(self, df):
+        self.df = df
+        self.queries = []
+
+    def load_daily_metrics(self, start_date=None, end_date=None, limit=None):
+        self.queries.append((start_date, end_date))
+        dates = self.df['date'].dt.date
+        return self.df[(dates >= start_date) & (dates <= end_date)].reset_index(drop=True)
+
+class TestServiceFeatureState(unittest.TestCase):
+    def test_service_resumes_from_checkpoint(self):
+        """Test that a restarted service only queries the days after its checkpoint"""
+        yesterday = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+        df = pd.DataFrame({
+            'date': pd.date_range(end=yesterday, periods=90, freq='D'),
+            'page_visits': np.random.randint(10, 100, 90).astype(float)
+        })
+        expected = FeatureEngine(cache=None).transform(df).iloc[-1]
+
+        model_dir = tempfile.mkdtemp()
+        path = os.path.join(model_dir, 'feature_state.pkl')
+
+        service = PredictionService(model_dir=model_dir, engine='seasonal_naive', feature_checkpoint=path)
+        service.data_loader = RecordingDataLoader(df.iloc[:-5])
+        self.assertEqual(service.sync_features(), 25)
+        service.close()
+
+        # Restart: state comes from the checkpoint, only the 5 new days are read
+        service = PredictionService(model_dir=model_dir, engine='seasonal_naive', feature_checkpoint=path)
+        service.data_loader = RecordingDataLoader(df)
+        self.assertEqual(service.sync_features(), 5)
+        self.assertEqual(service.data_loader.queries, [((yesterday - pd.Timedelta(days=4)).date(), yesterday.date())])
+        self.assertEqual(service.sync_features(), 0)
+
+        features = service.get_feature_stats()['features']
+        for name in ('page_visits_ma7', 'page_visits_ma30', 'page_visits_lag1', 'page_visits_lag7'):
+            self.assertAlmostEqual(features[name], expected[name])
+        service.close()
+
+if __name__ == '__main__':
+    unittest.main()
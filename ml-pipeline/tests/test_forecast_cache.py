@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.forecast_cache import ForecastCache
+
+class TestForecastCache(unittest.TestCase):
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted"""
+        cache = ForecastCache(max_entries=4, ttl_seconds=60)
+
+        self.assertIsNone(cache.get(('v1', 'page_visits')))
+        cache.put(('v1', 'page_visits'), [1, 2, 3])
+        self.assertEqual(cache.get(('v1', 'page_visits')), [1, 2, 3])
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ForecastCache(max_entries=2, ttl_seconds=60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not served"""
+        cache = ForecastCache(max_entries=2, ttl_seconds=0.01)
+        cache.put('a', 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['expirations'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.database import DataLoader
+from config.schema import VISIT_SLOTS_DTYPE
+from preprocessing.data_processor import DataProcessor
+from preprocessing.granularity import floor_to_buckets, granularity_label
+
+class TestSubDailyBuckets(unittest.TestCase):
+    def test_buckets_follow_local_clock_across_dst(self):
+        """Test that the repeated hour when clocks go back becomes two buckets"""
+        # 2024-11-03 in New York: 01:00-02:00 happens twice (EDT, then EST)
+        instants = pd.date_range('2024-11-03 05:10', periods=3, freq='h', tz='UTC')
+        starts = pd.to_datetime(floor_to_buckets(instants.asi8, 3600, 'America/New_York'), utc=True)
+
+        local = starts.tz_convert('America/New_York')
+        self.assertEqual([ts.hour for ts in local], [1, 1, 2])
+        self.assertEqual(len(set(starts)), 3)
+        self.assertEqual(granularity_label('60min'), '1h')
+
+    def test_visit_buckets_are_regrouped_and_gap_filled(self):
+        """Test that 15-minute slots become gap-free local hourly buckets"""
+        loader = DataLoader()
+        loader.visits_timezone = 'UTC'
+
+        # Slots of one visit at 04:00, 04:15 and 06:45 UTC; India is UTC+05:30
+        first = pd.Timestamp('2024-03-01 04:00', tz='UTC').value // 10**9 // 900
+        slots = np.array([(first, 1.0), (first + 1, 1.0), (first + 11, 1.0)], dtype=VISIT_SLOTS_DTYPE)
+        queries = []
+
+        def iter_query(query, params, dtype, fetch_size, cursor_name):
+            queries.append(params)
+            yield slots
+
+        loader.iter_query = iter_query
+        df = loader.load_visit_buckets(
+            pd.Timestamp('2024-03-01 09:00'), pd.Timestamp('2024-03-01 13:00'),
+            granularity='1h', timezone='Asia/Kolkata'
+        )
+
+        self.assertEqual(queries[0][0], 900)
+        self.assertEqual(list(df['visits']), [2.0, 0.0, 0.0, 1.0])
+        self.assertEqual(df['timestamp'].iloc[0], pd.Timestamp('2024-03-01 09:00', tz='Asia/Kolkata'))
+
+    def test_hourly_processor_windows_long_sequences(self):
+        """Test hourly gap filling, intraday features and week-long input windows"""
+        timestamps = pd.date_range('2024-01-01', periods=24 * 30, freq='h', tz='Europe/Berlin')
+        df = pd.DataFrame({'timestamp': timestamps, 'visits': np.arange(24 * 30, dtype=float)})
+        df = df.drop(index=[10, 11])
+
+        processor = DataProcessor(sequence_length=168, prediction_horizon=24, granularity='1h')
+        features = processor.add_features(df, metrics=['visits'])
+        X_train, y_train, X_test, y_test, _ = processor.prepare_data(features, target_column='visits')
+
+        self.assertEqual(list(features['hour_of_day'][:3]), [0, 1, 2])
+        self.assertIn('visits_lag168', features.columns)
+        self.assertEqual(len(X_train) + len(X_test), 24 * 30 - 168 - 24 + 1)
+        self.assertEqual(X_train.shape[1:], (168, 1))
+        self.assertFalse(X_train.flags.owndata)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import os
+import unittest
+from datetime import date, datetime, timedelta
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.database import DataLoader
+from preprocessing.hyperloglog import HyperLogLog, _bit_length
+
+class FakeVisitsLoader(DataLoader):
+    """DataLoader streaming (date, visitor_id) rows from memory instead of Postgres"""
+
+    def __init__(self, events):
+        super().__init__(pool=object())
+        self.events = events
+        self.queries = []
+
+    def iter_query(self, query, params, dtype, fetch_size=10000, cursor_name='stream'):
+        start, end = params
+        self.queries.append((start.date(), end.date() - timedelta(days=1)))
+        days = self.events['date'].to_numpy()
+        selected = self.events[(days >= np.datetime64(start)) & (days < np.datetime64(end))]
+        for offset in range(0, len(selected), fetch_size):
+            chunk = selected.iloc[offset:offset + fetch_size]
+            batch = np.empty(len(chunk), dtype=dtype)
+            batch['date'] = chunk['date'].to_numpy()
+            batch['visitor_id'] = chunk['visitor_id'].to_numpy()
+            yield batch
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_bit_length_is_exact(self):
+        """Test the integer bit length at and around every power of two"""
+        values = [0, 1]
+        for bits in range(1, 64):
+            values += [(1 << bits) - 1, 1 << bits, (1 << bits) + 1]
+        values.append((1 << 64) - 1)
+
+        lengths = _bit_length(np.array(values, dtype=np.uint64))
+        self.assertEqual(lengths.tolist(), [value.bit_length() for value in values])
+
+    def test_accuracy_across_precisions(self):
+        """Test that estimates stay within four standard errors at low and high precision"""
+        values = [f'visitor-{i}' for i in range(50000)]
+        for precision in (4, 6, 8, 10, 12, 14):
+            sketch = HyperLogLog(precision)
+            sketch.add(values)
+            error = abs(sketch.count() - len(values)) / len(values)
+            self.assertLess(error, 4 * 1.04 / np.sqrt(1 << precision), f"precision {precision}")
+
+    def test_merge_matches_union(self):
+        """Test that merged sketches equal one sketch over the union"""
+        first, second, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+        first.add([f'visitor-{i}' for i in range(0, 6000)])
+        second.add([f'visitor-{i}' for i in range(4000, 10000)])
+        union.add([f'visitor-{i}' for i in range(10000)])
+
+        first.merge(second)
+        np.testing.assert_array_equal(first.registers, union.registers)
+        self.assertLess(abs(first.count() - 10000) / 10000, 4 * 1.04 / np.sqrt(1 << 10))
+
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(12))
+
+    def test_approximate_page_visits(self):
+        """Test that approximate daily uniques track COUNT(DISTINCT visitor_id)"""
+        rng = np.random.default_rng(0)
+        days = pd.date_range('2024-03-01', periods=5, freq='D')
+        events = pd.DataFrame({
+            'date': np.repeat(days, 4000),
+            'visitor_id': [f'visitor-{v}' for v in rng.integers(0, 3000, 5 * 4000)]
+        })
+        exact = events.groupby('date')['visitor_id'].nunique().to_numpy()
+
+        loader = FakeVisitsLoader(events)
+        df = loader.load_page_visits(date(2024, 3, 1), date(2024, 3, 5), approximate_distinct=True, fetch_size=3000)
+
+        self.assertEqual(df['date'].tolist(), [day.date() for day in days])
+        self.assertEqual(df['visits'].tolist(), [4000] * 5)
+        np.testing.assert_allclose(df['unique_visitors'].to_numpy(), exact, rtol=0.05)
+
+    def test_cached_days_are_not_queried_again(self):
+        """Test that cached days (including days without visits) are skipped and the cache is bounded"""
+        days = pd.to_datetime(['2024-03-01', '2024-03-03', '2024-03-04', '2024-03-05', '2024-03-07'])
+        events = pd.DataFrame({
+            'date': np.repeat(days, 10),
+            'visitor_id': [f'visitor-{v}' for v in range(50)]
+        })
+        loader = FakeVisitsLoader(events)
+
+        loader.load_page_visits(date(2024, 3, 1), date(2024, 3, 2), approximate_distinct=True)
+        loader.load_page_visits(date(2024, 3, 4), date(2024, 3, 4), approximate_distinct=True)
+        df = loader.load_page_visits(date(2024, 3, 1), date(2024, 3, 7), approximate_distinct=True)
+
+        # 2024-03-02 had no visits but is cached all the same
+        self.assertEqual(loader.queries, [
+            (date(2024, 3, 1), date(2024, 3, 2)),
+            (date(2024, 3, 4), date(2024, 3, 4)),
+            (date(2024, 3, 3), date(2024, 3, 3)),
+            (date(2024, 3, 5), date(2024, 3, 7))
+        ])
+        self.assertEqual(df['date'].tolist(), [day.date() for day in days])
+        self.assertEqual(df['visits'].tolist(), [10] * 5)
+
+        loader.sketch_cache_days = 3
+        loader.load_page_visits(date(2024, 3, 6), date(2024, 3, 7), approximate_distinct=True)
+        self.assertEqual(list(loader._daily_sketches), [date(2024, 3, 5), date(2024, 3, 6), date(2024, 3, 7)])
+
+if __name__ == '__main__':
+    unittest.main()
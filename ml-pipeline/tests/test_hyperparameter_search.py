@@ -0,0 +1,67 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from training.hyperparameter_search import HyperparameterSearch, _worker_state, expand_grid, sample_configurations
+
+# Stand-in trial: scores a configuration from the shared series without TensorFlow
+def fake_trial(config, model_version, target_column, trial_dir):
+    series = _worker_state['series']
+    if series.flags.writeable:
+        raise AssertionError("Shared series must be read-only")
+
+    os.makedirs(trial_dir)
+    for name in (f'lstm_model_{model_version}.h5', f'metadata_{model_version}.pkl'):
+        with open(os.path.join(trial_dir, name), 'w') as f:
+            f.write(str(config))
+
+    rmse = abs(config['sequence_length'] - 14) + float(series.sum())
+    return {'evaluation_metrics': {'rmse': rmse}, 'train_seconds': 0.0}
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def test_configurations(self):
+        """Test grid expansion and distinct random sampling"""
+        space = {'sequence_length': [7, 14], 'batch_size': [16, 32, 64]}
+        self.assertEqual(len(expand_grid(space)), 6)
+
+        sample = sample_configurations(space, 4, seed=1)
+        self.assertEqual(len(sample), 4)
+        self.assertEqual(len({tuple(sorted(config.items())) for config in sample}), 4)
+
+        with self.assertRaises(ValueError):
+            expand_grid({'learning_rate': [0.1]})
+
+    def test_search_ranks_trials_and_keeps_best_model(self):
+        """Test that workers share the series and the best trial's files are kept"""
+        series = np.zeros((100, 1))
+        scaler = MinMaxScaler().fit(series)
+        configurations = expand_grid({'sequence_length': [7, 14, 30]})
+
+        search = HyperparameterSearch(
+            configurations, model_version='v2', workers=2,
+            model_dir=self.model_dir, train_fn=fake_trial
+        )
+        leaderboard = search.run(series, scaler)
+
+        self.assertEqual([entry['config']['sequence_length'] for entry in leaderboard], [14, 7, 30])
+        self.assertEqual(leaderboard[0]['saved_as'], 'v2')
+        with open(os.path.join(self.model_dir, 'lstm_model_v2.h5')) as f:
+            self.assertIn("'sequence_length': 14", f.read())
+        self.assertTrue(os.path.exists(os.path.join(self.model_dir, 'leaderboard_v2.json')))
+        self.assertFalse(os.path.exists(os.path.join(self.model_dir, 'search_v2')))
+
+if __name__ == '__main__':
+    unittest.main()
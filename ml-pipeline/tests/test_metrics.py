@@ -0,0 +1,62 @@
+import sys
+import os
+import asyncio
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.metrics import Counter, Histogram, PrometheusExposition, RequestMetricsMiddleware
+
+class Route:
+    path = '/model/retrain/{job_id}'
+
+class TestPrometheusMetrics(unittest.TestCase):
+    def test_exposition_format(self):
+        """Test histogram, counter and gauge lines in Prometheus text format"""
+        histogram = Histogram((0.01, 0.1))
+        for value in (0.005, 0.05, 0.5):
+            histogram.observe(value)
+
+        exposition = PrometheusExposition()
+        exposition.histogram('stage_seconds', 'Stage time', {(('stage', 'db_load'),): histogram})
+        exposition.counter('requests_total', 'Requests', {(('status', '200'),): 3})
+        exposition.gauge('in_flight', 'In flight', 0)
+        lines = exposition.render().splitlines()
+
+        self.assertIn('# TYPE stage_seconds histogram', lines)
+        self.assertIn('stage_seconds_bucket{stage="db_load",le="0.1"} 2', lines)
+        self.assertIn('stage_seconds_bucket{stage="db_load",le="+Inf"} 3', lines)
+        self.assertIn('stage_seconds_count{stage="db_load"} 3', lines)
+        self.assertIn('requests_total{status="200"} 3', lines)
+        self.assertEqual(lines[-1], 'in_flight 0')
+
+    def test_middleware_counts_route_templates_and_status(self):
+        """Test that requests are counted per route template and in-flight returns to zero"""
+        requests = Counter()
+        in_flight = {'value': 0}
+        seen_in_flight = []
+
+        async def app(scope, receive, send):
+            seen_in_flight.append(in_flight['value'])
+            if scope['path'] != '/nope':
+                scope['route'] = Route()
+            await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        async def send(message):
+            pass
+
+        middleware = RequestMetricsMiddleware(app, requests=requests, in_flight=in_flight)
+        for path in ('/model/retrain/a', '/model/retrain/b', '/nope'):
+            asyncio.run(middleware({'type': 'http', 'method': 'GET', 'path': path}, None, send))
+
+        self.assertEqual(requests.snapshot(), {
+            ('GET', '/model/retrain/{job_id}', '404'): 2,
+            ('GET', 'unmatched', '404'): 1
+        })
+        self.assertEqual(seen_in_flight, [1, 1, 1])
+        self.assertEqual(in_flight['value'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import sys
+import os
+import shutil
+import time
+import tempfile
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.model_registry import ModelRegistry, ModelVersion, ModelVersionLoadingError, ModelVersionNotFoundError
+
+class FakeBatcher:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+def wait_until_loaded(registry, version, timeout=5):
+    deadline = time.monotonic() + timeout
+    while version not in registry._versions or version in registry._loading:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"{version} was not loaded")
+        time.sleep(0.01)
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.loaded = []
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def write_version(self, version, mtime):
+        for filename in (f'lstm_model_{version}.h5', f'metadata_{version}.pkl'):
+            path = os.path.join(self.model_dir, filename)
+            open(path, 'w').close()
+            os.utime(path, (mtime, mtime))
+
+    def load_fn(self, version):
+        mtime = os.path.getmtime(os.path.join(self.model_dir, f'lstm_model_{version}.h5'))
+        loaded = ModelVersion(version, {'page_visits': {'batcher': FakeBatcher()}}, size_bytes=100, mtime=mtime)
+        self.loaded.append(loaded)
+        return loaded
+
+    def batcher(self, loaded):
+        return loaded.metric_models['page_visits']['batcher']
+
+    def test_discovers_versions_and_skips_metric_models(self):
+        """Test that per-metric model files are not treated as versions"""
+        self.write_version('v1', 1000)
+        self.write_version('page_views_v1', 1000)
+        open(os.path.join(self.model_dir, 'lstm_model_v2.h5'), 'w').close()  # No metadata yet
+
+        registry = ModelRegistry(self.model_dir, self.load_fn, ignore_prefixes=['page_views_'])
+        self.assertEqual(list(registry.available_versions()), ['v1'])
+
+    def test_poll_swaps_in_newer_version_after_in_flight_requests(self):
+        """Test that a new version becomes active while the old one finishes its requests"""
+        self.write_version('v1', 1000)
+        registry = ModelRegistry(self.model_dir, self.load_fn, memory_budget_bytes=100)
+        registry.activate('v1')
+        self.assertIsNone(registry.poll())
+
+        with registry.acquire() as old:
+            self.write_version('v2', 2000)
+            self.assertEqual(registry.poll(), 'v2')
+            self.assertEqual(registry.active.version, 'v2')
+
+            # v1 was evicted by the budget but is still in use
+            self.assertFalse(self.batcher(old).closed)
+
+        self.assertTrue(self.batcher(old).closed)
+        self.assertEqual(registry.stats()['evictions'], 1)
+
+    def test_poll_keeps_configured_older_version(self):
+        """Test that a rollback to an older version is not undone by the watcher"""
+        self.write_version('v1', 1000)
+        self.write_version('v2', 2000)
+        registry = ModelRegistry(self.model_dir, self.load_fn)
+        registry.activate('v1')
+
+        self.assertIsNone(registry.poll())
+        self.assertEqual(registry.active.version, 'v1')
+
+        # A version deployed after the rollback is still picked up
+        self.write_version('v3', 3000)
+        self.assertEqual(registry.poll(), 'v3')
+
+    def test_pinned_version_is_loaded_on_demand(self):
+        """Test that pinning loads a version without changing the active one"""
+        self.write_version('v1', 1000)
+        self.write_version('v2', 2000)
+        registry = ModelRegistry(self.model_dir, self.load_fn)
+        registry.activate('v2')
+
+        with self.assertRaises(ModelVersionLoadingError):
+            with registry.acquire('v1'):
+                pass
+        wait_until_loaded(registry, 'v1')
+
+        with registry.acquire('v1') as loaded:
+            self.assertEqual(loaded.version, 'v1')
+        self.assertEqual(registry.active.version, 'v2')
+
+        with self.assertRaises(ModelVersionNotFoundError):
+            with registry.acquire('v9'):
+                pass
+
+    def test_pinned_version_over_budget_is_served(self):
+        """Test that a pinned version is not evicted by its own load when over budget"""
+        self.write_version('v1', 1000)
+        self.write_version('v2', 2000)
+        registry = ModelRegistry(self.model_dir, self.load_fn, memory_budget_bytes=150)
+        registry.activate('v1')
+
+        with self.assertRaises(ModelVersionLoadingError):
+            with registry.acquire('v2'):
+                pass
+        wait_until_loaded(registry, 'v2')
+        registry.evict()
+
+        with registry.acquire('v2') as loaded:
+            self.assertEqual(loaded.version, 'v2')
+            self.assertFalse(self.batcher(loaded).closed)
+            self.assertEqual(registry.stats()['evictions'], 0)
+
+        # Evicted once the request is done, after a single load
+        self.assertTrue(self.batcher(loaded).closed)
+        self.assertEqual([version.version for version in self.loaded], ['v1', 'v2'])
+        self.assertEqual(registry.stats()['evictions'], 1)
+
+    def test_pinned_load_does_not_block_requests(self):
+        """Test that requests for a loading version are refused at once and share one load"""
+        self.write_version('v1', 1000)
+        self.write_version('v2', 2000)
+        gate = threading.Event()
+
+        def load_fn(version):
+            if version == 'v2':
+                gate.wait(5)
+            return self.load_fn(version)
+
+        registry = ModelRegistry(self.model_dir, load_fn)
+        registry.activate('v1')
+
+        for _ in range(3):
+            started = time.monotonic()
+            with self.assertRaises(ModelVersionLoadingError):
+                with registry.acquire('v2'):
+                    pass
+            self.assertLess(time.monotonic() - started, 1)
+
+        # The active version keeps serving meanwhile
+        with registry.acquire() as loaded:
+            self.assertEqual(loaded.version, 'v1')
+
+        gate.set()
+        wait_until_loaded(registry, 'v2')
+        with registry.acquire('v2') as loaded:
+            self.assertEqual(loaded.version, 'v2')
+        self.assertEqual([version.version for version in self.loaded], ['v1', 'v2'])
+
+    def test_failed_version_is_not_retried(self):
+        """Test that a version that fails to load is skipped until its files change"""
+        self.write_version('v1', 1000)
+        attempts = []
+
+        def load_fn(version):
+            attempts.append(version)
+            raise IOError("corrupt model")
+
+        registry = ModelRegistry(self.model_dir, load_fn)
+        self.assertIsNone(registry.poll())
+        self.assertIsNone(registry.poll())
+        with self.assertRaises(RuntimeError):
+            with registry.acquire('v1'):
+                pass
+        self.assertEqual(attempts, ['v1'])
+
+if __name__ == '__main__':
+    unittest.main()
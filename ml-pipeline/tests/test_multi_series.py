@@ -0,0 +1,68 @@
+import sys
+import os
+import unittest
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from preprocessing.multi_series import MultiSeriesProcessor, pivot_series
+
+def site_frame(site_id, start, values):
+    dates = pd.date_range(start=start, periods=len(values), freq='D')
+    return pd.DataFrame({'site_id': site_id, 'date': dates.date, 'page_visits': values})
+
+class TestMultiSeriesProcessor(unittest.TestCase):
+    def setUp(self):
+        # 'big' reports for 40 days; 'late' starts 20 days in and skips one day
+        late = site_frame('late', '2024-01-21', np.arange(20.0) + 5)
+        self.df = pd.concat([
+            site_frame('big', '2024-01-01', np.arange(40.0) * 1000),
+            late[late['date'] != pd.Timestamp('2024-01-25').date()]
+        ], ignore_index=True)
+
+    def test_pivot_fills_gaps(self):
+        """Test that the panel is gap-free and records each site's first day"""
+        site_ids, dates, values, first_observed = pivot_series(self.df)
+
+        self.assertEqual(list(site_ids), ['big', 'late'])
+        self.assertEqual(values.shape, (2, 40))
+        self.assertEqual(list(first_observed), [0, 20])
+        self.assertEqual(values[1, 24], 0)
+        self.assertEqual(values[1, 39], 24)
+
+    def test_windows_are_scaled_per_site_and_split_per_site(self):
+        """Test per-site [0, 1] scaling, dropped pre-start windows and the chronological split"""
+        processor = MultiSeriesProcessor(sequence_length=7, prediction_horizon=7)
+        X_train, y_train, X_test, y_test, scaler, test_rows = processor.prepare_data(self.df)
+
+        # big: 27 windows, late: 7 (windows starting before day 20 are dropped)
+        self.assertEqual(len(X_train) + len(X_test), 27 + 7)
+        self.assertEqual(np.bincount(test_rows).tolist(), [27 - 21, 7 - 5])
+        self.assertGreaterEqual(X_train.min(), 0.0)
+        self.assertLessEqual(X_train.max(), 1.0)
+
+        # Inverse scaling with each window's site parameters restores original values
+        restored = scaler.inverse_transform(
+            y_test[:, :, 0], scaler.data_min_[test_rows], scaler.data_range_[test_rows]
+        )
+        self.assertEqual(restored[test_rows == 0][-1, -1], 39000)
+
+    def test_prediction_batch_reports_missing_sites(self):
+        """Test that unknown sites are scaled on their own history and absent sites are listed"""
+        processor = MultiSeriesProcessor(sequence_length=7, prediction_horizon=7)
+        processor.prepare_data(self.df[self.df['site_id'] == 'big'])
+
+        found, X, data_min, data_range, missing = processor.create_prediction_batch(
+            self.df, ['late', 'big', 'absent']
+        )
+
+        self.assertEqual(found, ['late', 'big'])
+        self.assertEqual(missing, ['absent'])
+        self.assertEqual(X.shape, (2, 7, 1))
+        self.assertEqual(data_range[1], 39000)
+        self.assertAlmostEqual(X[0, -1, 0], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from models.numpy_lstm import NumpyLSTMModel, export_keras_weights
+
+# Minimal stand-ins for Keras layers: export only uses the class name, config and weights
+class FakeLayer:
+    def __init__(self, config, weights=()):
+        self.config = config
+        self.weights = list(weights)
+
+    def get_config(self):
+        return self.config
+
+    def get_weights(self):
+        return self.weights
+
+class LSTM(FakeLayer):
+    pass
+
+class Dense(FakeLayer):
+    pass
+
+class Dropout(FakeLayer):
+    pass
+
+class FakeModel:
+    def __init__(self, layers):
+        self.layers = layers
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def reference_lstm(sequence, kernel, recurrent_kernel, bias, return_sequences):
+    """Textbook LSTM cell for one sequence, one timestep at a time"""
+    units = recurrent_kernel.shape[0]
+    h = np.zeros(units)
+    c = np.zeros(units)
+    outputs = []
+    for x in sequence:
+        z = x @ kernel + h @ recurrent_kernel + bias
+        i, f, g, o = (z[k * units:(k + 1) * units] for k in range(4))
+        c = sigmoid(f) * c + sigmoid(i) * np.tanh(g)
+        h = sigmoid(o) * np.tanh(c)
+        outputs.append(h)
+    return np.array(outputs) if return_sequences else h
+
+class TestNumpyLSTM(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_matches_reference_forward_pass(self):
+        """Test the exported two-layer LSTM against a per-timestep reference"""
+        rng = np.random.default_rng(0)
+        w1 = [rng.normal(size=(1, 32)), rng.normal(size=(8, 32)), rng.normal(size=32)]
+        w2 = [rng.normal(size=(8, 16)), rng.normal(size=(4, 16)), rng.normal(size=16)]
+        dense = [rng.normal(size=(4, 7)), rng.normal(size=7)]
+
+        model = FakeModel([
+            LSTM({'units': 8, 'return_sequences': True}, w1),
+            Dropout({'rate': 0.2}),
+            LSTM({'units': 4, 'return_sequences': False}, w2),
+            Dense({'activation': 'linear'}, dense)
+        ])
+
+        path = export_keras_weights(model, os.path.join(self.tmp_dir, 'lstm_weights_v1.npz'))
+        numpy_model = NumpyLSTMModel.load(path, 7, 7, 'v1')
+
+        X = rng.random((5, 7, 1))
+        predictions = numpy_model.predict(X)
+
+        for i in range(len(X)):
+            hidden = reference_lstm(X[i], *w1, return_sequences=True)
+            hidden = reference_lstm(hidden, *w2, return_sequences=False)
+            expected = hidden @ dense[0] + dense[1]
+            np.testing.assert_allclose(predictions[i], expected, rtol=1e-4, atol=1e-5)
+
+        self.assertEqual(predictions.shape, (5, 7))
+        self.assertEqual(numpy_model.count_params(), sum(w.size for w in w1 + w2 + dense))
+
+    def test_unsupported_layer_is_rejected(self):
+        """Test that layers without a NumPy implementation fail the export"""
+        class Bidirectional(FakeLayer):
+            pass
+
+        with self.assertRaises(ValueError):
+            export_keras_weights(FakeModel([Bidirectional({})]), os.path.join(self.tmp_dir, 'w.npz'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import os
+import asyncio
+import unittest
+from unittest import mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.concurrency import BoundedExecutor
+from api.profiling import ProfilingMiddleware, RequestProfiler, SlowRequestLog, record_stage
+
+class TestRequestProfiling(unittest.TestCase):
+    def test_slow_log_keeps_slowest_recent_requests(self):
+        """Test that only the slowest requests are kept and old ones expire"""
+        log = SlowRequestLog(size=2, window_seconds=60)
+        with mock.patch('api.profiling.time.monotonic', return_value=0.0):
+            for duration in (0.3, 0.1, 0.5, 0.2):
+                log.add(duration, {'duration': duration})
+            self.assertEqual([entry['duration'] for entry in log.entries()], [0.5, 0.3])
+
+        with mock.patch('api.profiling.time.monotonic', return_value=120.0):
+            log.add(0.05, {'duration': 0.05})
+            self.assertEqual([entry['duration'] for entry in log.entries()], [0.05])
+
+    def test_token_and_rate_limit(self):
+        """Test that a wrong token is rejected and profiles are rate limited"""
+        profiler = RequestProfiler(token='secret', max_per_minute=1)
+        self.assertFalse(RequestProfiler().authorized('secret'))
+        self.assertFalse(profiler.authorized('wrong'))
+        self.assertTrue(profiler.authorized('secret'))
+        self.assertTrue(profiler.admit())
+        self.assertFalse(profiler.admit())
+        self.assertEqual(profiler.rate_limited, 1)
+
+    def test_profiled_request_through_executor(self):
+        """Test that a profiled request stores a report and logs its stages"""
+        profiler = RequestProfiler(token='secret')
+        executor = BoundedExecutor(max_workers=1, max_queue=1, wrapper=profiler.run)
+
+        def work():
+            record_stage('inference', 0.25)
+            return sum(range(1000))
+
+        async def app(scope, receive, send):
+            await executor.run(work)
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = ProfilingMiddleware(app, profiler)
+        for token in (b'secret', b'wrong'):
+            scope = {'type': 'http', 'method': 'GET', 'path': '/predict/page_visits',
+                     'headers': [(b'x-profile-token', token)]}
+            asyncio.run(middleware(scope, None, send))
+
+        headers = dict(sent[0]['headers'])
+        profile = profiler.get_profile(headers[b'x-profile-id'].decode())
+        self.assertIn('work', profile['report'])
+        self.assertEqual(sent[2]['status'], 403)
+
+        entry = profiler.slow_requests.entries()[0]
+        self.assertEqual(entry['stages_ms'], {'inference': 250.0})
+        self.assertEqual(entry['profile_id'], profile['id'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import date, datetime
+import pandas as pd
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config.database import DataLoader
+from config.snapshot import SnapshotStore
+from api.prediction_service import PredictionService
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            'date': pd.date_range('2024-01-01', periods=90, freq='D'),
+            'page_visits': np.arange(90, dtype=float),
+            'page_views': np.arange(90, dtype=float) * 2,
+            'avg_time_on_page': np.ones(90),
+            'bounce_rate': np.full(90, 0.5),
+            'unique_visitors': np.arange(90, dtype=float)
+        })
+
+    def test_range_reads_across_partitions(self):
+        """Test that range loads span month partitions"""
+        store = SnapshotStore(self.snapshot_dir)
+        store.write(self.df, max_updated_at=datetime(2024, 3, 31))
+
+        result = store.load(date(2024, 1, 30), date(2024, 2, 2))
+        self.assertEqual(result['page_visits'].tolist(), [29.0, 30.0, 31.0, 32.0])
+        self.assertEqual(store.watermark, (date(2024, 3, 30), datetime(2024, 3, 31), 90))
+
+    def test_upsert_replaces_existing_dates(self):
+        """Test that rewritten dates replace the stored values"""
+        store = SnapshotStore(self.snapshot_dir)
+        store.write(self.df)
+
+        update = self.df.iloc[[10]].copy()
+        update['page_visits'] = 1000.0
+        store.write(update)
+
+        reopened = SnapshotStore(self.snapshot_dir)
+        self.assertEqual(reopened.manifest['row_count'], 90)
+        self.assertEqual(reopened.load(date(2024, 1, 11), date(2024, 1, 11))['page_visits'].tolist(), [1000.0])
+
+    def test_concurrent_reads_during_writes(self):
+        """Test that readers never fail or mix columns while a month is rewritten"""
+        store = SnapshotStore(self.snapshot_dir)
+        dates = pd.date_range('2024-01-01', periods=31, freq='D')
+        columns = list(self.df.columns[1:])
+
+        def version(value):
+            return pd.DataFrame({'date': dates, **{column: np.full(31, float(value)) for column in columns}})
+
+        store.write(version(0))
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                try:
+                    df = store.load()
+                    values = df[columns].to_numpy()
+                    if len(df) != 31 or not (values == values[0, 0]).all():
+                        errors.append(f"mixed versions: {np.unique(values)}")
+                except Exception as e:
+                    errors.append(repr(e))
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for value in range(1, 150):
+            store.write(version(value))
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(errors[:3], [])
+        self.assertEqual(len(os.listdir(self.snapshot_dir)), 3)
+
+    def test_offline_data_loader(self):
+        """Test that DataLoader serves daily metrics without a database"""
+        SnapshotStore(self.snapshot_dir).write(self.df)
+        loader = DataLoader(snapshot_dir=self.snapshot_dir, offline=True)
+
+        df = loader.load_daily_metrics(start_date=date(2024, 2, 1))
+        self.assertEqual(len(df), 59)
+        self.assertEqual(loader.get_data_watermark()[0], date(2024, 3, 30))
+        self.assertEqual(sum(len(batch) for batch in loader.iter_daily_metrics()), 90)
+
+    def test_failed_sync_backs_off(self):
+        """Test that reads keep serving the snapshot and retries wait after a failed sync"""
+        SnapshotStore(self.snapshot_dir).write(self.df)
+        loader = DataLoader(pool=object(), snapshot_dir=self.snapshot_dir, offline=False)
+        loader.snapshot_retry_interval = 30
+        loader.snapshot_sync_interval = 300
+
+        failing = mock.patch.object(loader, 'iter_query', side_effect=ConnectionError('database down'))
+        clock = mock.patch('config.database.time_module.monotonic')
+        with failing as iter_query, clock as monotonic:
+            for now in (0, 10, 29):
+                monotonic.return_value = now
+                self.assertEqual(len(loader.load_daily_metrics(start_date=date(2024, 3, 1))), 30)
+            self.assertEqual(iter_query.call_count, 1)
+
+            # 30s after the first failure, then 60s after the second
+            for now, calls in ((30, 2), (80, 2), (90, 3)):
+                monotonic.return_value = now
+                loader.load_daily_metrics()
+                self.assertEqual(iter_query.call_count, calls)
+
+            # A forced sync ignores the backoff
+            loader.sync_snapshot(force=True)
+            self.assertEqual(iter_query.call_count, 4)
+
+class TestSnapshotWatermark(unittest.TestCase):
+    def test_forecast_cache_follows_snapshot(self):
+        """Test that new database rows force a sync before forecasts are cached under them"""
+        snapshot_dir, model_dir = tempfile.mkdtemp(), tempfile.mkdtemp()
+        today = pd.Timestamp.now().normalize()
+        df = pd.DataFrame({
+            'date': pd.date_range(end=today - pd.Timedelta(days=1), periods=60, freq='D'),
+            'page_visits': np.full(60, 100.0)
+        })
+        SnapshotStore(snapshot_dir).write(df, max_updated_at=datetime(2024, 1, 1))
+
+        loader = DataLoader(pool=object(), snapshot_dir=snapshot_dir, offline=False)
+        loader.snapshot_sync_interval = 3600
+        db_watermark = [((today - pd.Timedelta(days=1)).date(), datetime(2024, 1, 1), 60)]
+        new_rows = []
+
+        def iter_query(query, params, dtype, fetch_size=10000, cursor_name='stream'):
+            if new_rows:
+                batch = np.zeros(len(new_rows), dtype=dtype)
+                batch['date'] = [row[0] for row in new_rows]
+                batch['page_visits'] = [row[1] for row in new_rows]
+                batch['updated_at'] = np.datetime64('2024-01-02')
+                yield batch
+
+        service = PredictionService(model_dir=model_dir, engine='seasonal_naive', cache_size=16, watermark_ttl=0)
+        service.data_loader = loader
+        with mock.patch.object(loader, '_query_data_watermark', side_effect=lambda: db_watermark[0]), \
+                mock.patch.object(loader, 'iter_query', side_effect=iter_query) as sync_query:
+            before = service.get_forecast('page_visits')
+            self.assertEqual(sync_query.call_count, 1)
+
+            # Today's row lands in the database; the periodic sync is not due yet
+            new_rows.append((np.datetime64(today.date()), 500.0))
+            db_watermark[0] = (today.date(), datetime(2024, 1, 2), 61)
+            after = service.get_forecast('page_visits')
+
+        self.assertEqual(sync_query.call_count, 2)
+        self.assertEqual(loader.snapshot.watermark[2], 61)
+        self.assertFalse(np.array_equal(before, after))
+        self.assertEqual(service.get_cache_stats()['hits'], 0)
+        service.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.training_jobs import TrainingJobManager, TrainingJobLimitError
+
+# Stand-ins for run_training_job; module-level so spawned processes can import them
+def fake_training(params, staging_dir, events):
+    for epoch in range(1, 4):
+        events.put({'type': 'progress', 'stage': 'training', 'epoch': epoch,
+                    'epochs': params['epochs'], 'loss': 1.0 / epoch})
+    version = params['model_version']
+    for name in (f'lstm_model_{version}.h5', f'metadata_{version}.pkl'):
+        open(os.path.join(staging_dir, name), 'w').close()
+    events.put({'type': 'done', 'evaluation_metrics': {'rmse': 5.0}, 'holdout_metrics': holdout(params, 4.0, 6.0)})
+
+def overfit_training(params, staging_dir, events):
+    # Low RMSE on its own test split, worse than the active model on recent days
+    events.put({'type': 'done', 'evaluation_metrics': {'rmse': 1.0}, 'holdout_metrics': holdout(params, 8.0, 6.0)})
+
+def holdout(params, candidate, current):
+    return {'version': params['compare_version'], 'holdout_days': params['holdout_days'],
+            'scores': {'candidate': {'rmse': candidate}, 'current': {'rmse': current}}}
+
+def failing_training(params, staging_dir, events):
+    open(os.path.join(staging_dir, f"lstm_model_{params['model_version']}.h5"), 'w').close()
+    raise RuntimeError("No data found for the specified date range")
+
+def slow_training(params, staging_dir, events):
+    events.put({'type': 'progress', 'stage': 'training', 'epoch': 0, 'epochs': params['epochs']})
+    time.sleep(60)
+
+def wait_for(manager, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = manager.status(job_id)
+        if status['status'] in ('succeeded', 'failed', 'cancelled'):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("Training job did not finish")
+
+class TestTrainingJobManager(unittest.TestCase):
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        self.promoted = []
+
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+
+    def test_job_promotes_model_that_beats_current(self):
+        """Test progress reporting and promotion into model_dir"""
+        manager = TrainingJobManager(
+            self.model_dir, on_promote=self.promoted.append,
+            active_version=lambda: 'v1', target=fake_training
+        )
+
+        job = manager.submit(model_version='v2', epochs=3, promote=True)
+        status = wait_for(manager, job['job_id'])
+
+        self.assertEqual(status['status'], 'succeeded')
+        self.assertTrue(status['promoted'])
+        self.assertEqual(self.promoted, ['v2'])
+        self.assertTrue(os.path.exists(os.path.join(self.model_dir, 'lstm_model_v2.h5')))
+        self.assertTrue(os.path.exists(os.path.join(self.model_dir, 'metadata_v2.pkl')))
+
+        with self.assertRaises(ValueError):
+            manager.submit(model_version='v2')
+
+    def test_job_compared_on_same_holdout(self):
+        """Test that promotion follows the shared holdout, not each model's own test split"""
+        manager = TrainingJobManager(
+            self.model_dir, on_promote=self.promoted.append,
+            active_version=lambda: 'v1', target=overfit_training
+        )
+
+        with self.assertRaises(ValueError):
+            manager.submit(model_version='v2', days_back=60, holdout_days=30, promote=True)
+
+        job = manager.submit(model_version='v2', days_back=60, holdout_days=10, promote=True)
+        status = wait_for(manager, job['job_id'])
+
+        self.assertEqual(status['status'], 'succeeded')
+        self.assertFalse(status['promoted'])
+        self.assertEqual(status['holdout_metrics']['version'], 'v1')
+        self.assertEqual(status['holdout_metrics']['holdout_days'], 10)
+        self.assertIn('does not beat v1', status['promotion_reason'])
+        self.assertEqual(self.promoted, [])
+
+    def test_promote_kept_model_later(self):
+        """Test manual promotion of an unpromoted model and cleanup of forgotten jobs"""
+        manager = TrainingJobManager(
+            self.model_dir, history_size=0, on_promote=self.promoted.append, target=fake_training
+        )
+        kept = manager.submit(model_version='v2', epochs=3)
+        wait_for(manager, kept['job_id'])
+        self.assertTrue(os.path.isdir(manager.staging_dir(kept['job_id'])))
+
+        status = manager.promote(kept['job_id'])
+        self.assertTrue(status['promoted'])
+        self.assertEqual(self.promoted, ['v2'])
+        self.assertTrue(os.path.exists(os.path.join(self.model_dir, 'lstm_model_v2.h5')))
+        with self.assertRaises(ValueError):
+            manager.promote(kept['job_id'])
+
+        dropped = manager.submit(model_version='v3', epochs=3)
+        wait_for(manager, dropped['job_id'])
+        wait_for(manager, manager.submit(model_version='v4', epochs=3)['job_id'])
+
+        # v3 was never promoted; its files go with the job
+        with self.assertRaises(KeyError):
+            manager.promote(dropped['job_id'])
+        self.assertFalse(os.path.exists(manager.staging_dir(dropped['job_id'])))
+
+    def test_failed_job_cleans_up(self):
+        """Test that a failed job reports the error and leaves no staging directory"""
+        manager = TrainingJobManager(self.model_dir, target=failing_training)
+        job = manager.submit(model_version='v2', epochs=3)
+        status = wait_for(manager, job['job_id'])
+
+        self.assertEqual(status['status'], 'failed')
+        self.assertFalse(os.path.exists(manager.staging_dir(job['job_id'])))
+        with self.assertRaises(ValueError):
+            manager.promote(job['job_id'])
+
+    def test_cancel_running_job(self):
+        """Test that cancelling terminates the job and enforces the job limit until then"""
+        manager = TrainingJobManager(self.model_dir, target=slow_training)
+        job = manager.submit(model_version='v3', epochs=10)
+
+        with self.assertRaises(TrainingJobLimitError):
+            manager.submit(model_version='v4')
+
+        manager.cancel(job['job_id'])
+        status = wait_for(manager, job['job_id'])
+        self.assertEqual(status['status'], 'cancelled')
+        self.assertFalse(os.path.exists(manager.staging_dir(job['job_id'])))
+
+if __name__ == '__main__':
+    unittest.main()